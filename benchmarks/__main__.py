@@ -0,0 +1,178 @@
+"""
+Benchmarks of parse and stringify, compared with the json module.
+
+Run the benchmarks and store the results as a baseline:
+
+    python -m benchmarks run --output baseline.json
+
+Run the benchmarks again after a change, and compare with the baseline:
+
+    python -m benchmarks run --output current.json
+    python -m benchmarks compare baseline.json current.json
+
+The command compare exits with status 1 when a benchmark became slower than the
+threshold allows.
+
+Measure the peak memory per MB of input, and check it against the budgets in
+benchmarks/memory_budgets.json, which are set for the default scale:
+
+    python -m benchmarks memory --output memory.json
+
+The command memory exits with status 1 when a result exceeds its budget.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.cases import create_cases
+from benchmarks.harness import (
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    compare_reports,
+    format_header,
+    format_result,
+    run_benchmarks,
+)
+from benchmarks.memory import (
+    DEFAULT_BUDGETS,
+    MB,
+    check_budgets,
+    format_memory_header,
+    format_memory_result,
+    load_budgets,
+    run_memory_benchmarks,
+)
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="the file to store the results in")
+    run_parser.add_argument(
+        "--filter", help="run only the cases of which the name contains this text"
+    )
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiply the size of the generated data, like 0.1 for a quick run",
+    )
+
+    compare_parser = commands.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="the allowed slowdown as a fraction, 0.1 by default",
+    )
+    compare_parser.add_argument(
+        "--metric",
+        choices=["ratio", "seconds"],
+        default="ratio",
+        help="compare the time relative to the json module, or the absolute time",
+    )
+
+    memory_parser = commands.add_parser(
+        "memory", help="measure the peak memory and check it against budgets"
+    )
+    memory_parser.add_argument("--output", help="the file to store the results in")
+    memory_parser.add_argument(
+        "--filter", help="run only the cases of which the name contains this text"
+    )
+    memory_parser.add_argument("--scale", type=float, default=1.0)
+    memory_parser.add_argument(
+        "--budgets",
+        default=DEFAULT_BUDGETS,
+        help="a JSON file with the budgets, or an empty string to not check budgets",
+    )
+
+    options = parser.parse_args(args)
+
+    if options.command == "run":
+        return run(options)
+
+    if options.command == "memory":
+        return memory(options)
+
+    return compare(options)
+
+
+def run(options: argparse.Namespace) -> int:
+    cases = create_cases(options.scale)
+    if options.filter:
+        cases = list(filter(lambda case: options.filter in case["name"], cases))
+
+    print(format_header())
+    report = run_benchmarks(
+        cases, options.repeat, lambda result: print(format_result(result))
+    )
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2)
+
+    return 0
+
+
+def memory(options: argparse.Namespace) -> int:
+    cases = create_cases(options.scale)
+    if options.filter:
+        cases = list(filter(lambda case: options.filter in case["name"], cases))
+
+    print(format_memory_header())
+    report = run_memory_benchmarks(
+        cases, lambda result: print(format_memory_result(result))
+    )
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2)
+
+    if not options.budgets:
+        return 0
+
+    violations = check_budgets(report, load_budgets(options.budgets))
+
+    for violation in violations:
+        print(
+            f"OVER BUDGET {violation['key']} {violation['metric']}: "
+            f"{violation['value'] / MB:.1f} MB > {violation['budget'] / MB:.1f} MB"
+        )
+
+    if len(violations) == 0:
+        print("All results within budget")
+        return 0
+
+    return 1
+
+
+def compare(options: argparse.Namespace) -> int:
+    with open(options.baseline, "r", encoding="utf-8") as fp:
+        baseline = json.load(fp)
+    with open(options.current, "r", encoding="utf-8") as fp:
+        current = json.load(fp)
+
+    regressions = compare_reports(baseline, current, options.threshold, options.metric)
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['key']}: "
+            f"{regression['baseline']:.6g} -> {regression['current']:.6g} "
+            f"(+{regression['change'] * 100:.1f}%)"
+        )
+
+    if len(regressions) == 0:
+        print(f"No regressions beyond {options.threshold * 100:.0f}%")
+        return 0
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
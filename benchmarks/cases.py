@@ -0,0 +1,175 @@
+import json
+from os import path
+from random import Random
+from typing import Any, Callable, TypedDict
+
+from tabularjson import stringify
+
+TEST_SUITE_DIR = path.join(path.dirname(path.dirname(__file__)), "tests", "test-suite")
+
+
+class Case(TypedDict):
+    name: str
+    # the documents of the case, every operation is run for all documents
+    data: list[Any]
+    # the documents stringified into Tabular-JSON and into JSON, to be parsed
+    text: list[str]
+    json_text: list[str]
+
+
+def create_cases(scale: float = 1.0) -> list[Case]:
+    """
+    Create the benchmark cases. The scale multiplies the size of the generated
+    data, a scale smaller than 1 gives a quick run with smaller documents.
+    """
+
+    def size(count: int) -> int:
+        return max(1, round(count * scale))
+
+    generators: list[tuple[str, Callable[[], list[Any]]]] = [
+        ("deep_nesting", lambda: [generate_deep_nesting(size(200), size(50))]),
+        ("long_strings", lambda: [generate_long_strings(size(50), 10_000)]),
+        ("unicode", lambda: [generate_unicode(size(5_000))]),
+        ("wide_table", lambda: [generate_wide_table(size(500), 200)]),
+        ("tall_table", lambda: [generate_tall_table(size(50_000))]),
+        ("sparse_table", lambda: [generate_sparse_table(size(10_000), 50)]),
+        ("nested_table", lambda: [generate_nested_table(size(5_000))]),
+        ("test_suite_stringify", load_stringify_suite),
+    ]
+
+    cases = list(map(lambda entry: create_case(entry[0], entry[1]()), generators))
+
+    # the parse test-suite is parsed from its own inputs
+    texts, outputs = load_parse_suite()
+    cases.append(create_case("test_suite_parse", outputs, texts))
+
+    return cases
+
+
+def create_case(name: str, data: list[Any], text: list[str] | None = None) -> Case:
+    return {
+        "name": name,
+        "data": data,
+        "text": text if text is not None else list(map(stringify, data)),
+        "json_text": list(map(json.dumps, data)),
+    }
+
+
+def generate_deep_nesting(depth: int, count: int) -> list[Any]:
+    """Objects and arrays nested depth levels deep"""
+    documents = []
+
+    for index in range(count):
+        value: Any = {"id": index, "leaf": True}
+        for level in range(depth):
+            value = (
+                {"level": level, "child": value} if level % 2 == 0 else [value, level]
+            )
+        documents.append(value)
+
+    return documents
+
+
+def generate_long_strings(count: int, length: int) -> dict[str, Any]:
+    """Long strings with quotes, backslashes, newlines and control characters"""
+    random = Random(1)
+    alphabet = 'abcdefghij "quoted" \\path\\ \n\t\r\b\f\x01'
+
+    return {
+        f"text{index}": "".join(random.choice(alphabet) for _ in range(length))
+        for index in range(count)
+    }
+
+
+def generate_unicode(count: int) -> list[dict[str, Any]]:
+    """Strings with accented characters, CJK characters and emoji"""
+    words = ["café", "naïve", "Zürich", "東京", "서울", "Москва", "😀🎉", "á"]
+
+    return [
+        {"id": index, "city": words[index % len(words)], "note": " ".join(words)}
+        for index in range(count)
+    ]
+
+
+def generate_wide_table(rows: int, columns: int) -> list[dict[str, Any]]:
+    """A table with many columns of numbers, strings and booleans"""
+    return [
+        {
+            f"column{column}": (
+                row * column
+                if column % 3 == 0
+                else f"value {row}"
+                if column % 3 == 1
+                else row % 2 == 0
+            )
+            for column in range(columns)
+        }
+        for row in range(rows)
+    ]
+
+
+def generate_tall_table(rows: int) -> list[dict[str, Any]]:
+    """A table with a few columns and many rows"""
+    return [
+        {
+            "id": row,
+            "name": f"item {row}",
+            "price": row * 0.25,
+            "in_stock": row % 3 != 0,
+            "category": None if row % 7 == 0 else "tools",
+        }
+        for row in range(rows)
+    ]
+
+
+def generate_sparse_table(rows: int, columns: int) -> list[dict[str, Any]]:
+    """A table where every row has only a few of many possible columns"""
+    random = Random(2)
+
+    return [
+        {f"column{column}": row for column in sorted(random.sample(range(columns), 5))}
+        for row in range(rows)
+    ]
+
+
+def generate_nested_table(rows: int) -> list[dict[str, Any]]:
+    """A table with nested objects and a nested table in every row"""
+    return [
+        {
+            "id": row,
+            "address": {"city": "Rotterdam", "zip": f"{row:05d}"},
+            "geo": {"lat": 51.9 + row / 1e6, "lon": 4.5},
+            "orders": [{"id": order, "amount": order * 1.5} for order in range(3)],
+        }
+        for row in range(rows)
+    ]
+
+
+def load_stringify_suite() -> list[Any]:
+    """The inputs of the stringify test-suite as micro cases"""
+    suite = load_suite("stringify.test.json")
+
+    return [
+        test["input"]
+        for group in suite["groups"]
+        for test in group["tests"]
+        if "input" in test
+    ]
+
+
+def load_parse_suite() -> tuple[list[str], list[Any]]:
+    """The valid inputs of the parse test-suite and their outputs as micro cases"""
+    suite = load_suite("parse.test.json")
+    tests = [
+        test for group in suite["groups"] for test in group["tests"] if "output" in test
+    ]
+
+    return (
+        list(map(lambda test: test["input"], tests)),
+        list(map(lambda test: test["output"], tests)),
+    )
+
+
+def load_suite(filename: str) -> dict[str, Any]:
+    with open(path.join(TEST_SUITE_DIR, filename), "r", encoding="utf-8") as fp:
+        return json.load(fp)
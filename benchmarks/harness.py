@@ -0,0 +1,156 @@
+import json
+import platform
+import statistics
+import time
+from timeit import Timer
+from typing import Any, Callable, TypedDict
+
+from tabularjson import parse, stringify
+
+from benchmarks.cases import Case
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+
+
+class Result(TypedDict):
+    case: str
+    operation: str
+    # the fastest and median time of one run over all documents, in seconds
+    seconds: float
+    median: float
+    # the fastest time of the equivalent operation of the json module
+    json_seconds: float
+    # seconds divided by json_seconds, which is comparable between machines
+    ratio: float
+
+
+class Regression(TypedDict):
+    key: str
+    baseline: float
+    current: float
+    change: float
+
+
+# Every operation is a tuple (name, function, equivalent function of the json
+# module), where the functions process all documents of a case
+OPERATIONS: list[tuple[str, Callable[[Case], Any], Callable[[Case], Any]]] = [
+    (
+        "stringify",
+        lambda case: list(map(stringify, case["data"])),
+        lambda case: list(map(json.dumps, case["data"])),
+    ),
+    (
+        "stringify_indented",
+        lambda case: [stringify(data, {"indentation": 2}) for data in case["data"]],
+        lambda case: [json.dumps(data, indent=2) for data in case["data"]],
+    ),
+    (
+        "parse",
+        lambda case: list(map(parse, case["text"])),
+        lambda case: list(map(json.loads, case["json_text"])),
+    ),
+]
+
+
+def run_benchmarks(
+    cases: list[Case],
+    repeat: int = DEFAULT_REPEAT,
+    on_result: Callable[[Result], Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Run every operation for every case and for the json module, and return
+    a report with the results and a description of the environment, which can
+    be stored as a baseline.
+    """
+    results: list[Result] = []
+
+    for case in cases:
+        for operation, run, run_json in OPERATIONS:
+            times = measure(lambda: run(case), repeat)
+            json_times = measure(lambda: run_json(case), repeat)
+
+            result: Result = {
+                "case": case["name"],
+                "operation": operation,
+                "seconds": min(times),
+                "median": statistics.median(times),
+                "json_seconds": min(json_times),
+                "ratio": min(times) / min(json_times),
+            }
+            results.append(result)
+
+            if on_result is not None:
+                on_result(result)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def measure(function: Callable[[], Any], repeat: int) -> list[float]:
+    """
+    Measure the time of one call of the function. Fast functions are called
+    multiple times per measurement, like timeit does, for at least 0.2 seconds.
+    """
+    timer = Timer(function)
+    number, _ = timer.autorange()
+
+    return list(map(lambda seconds: seconds / number, timer.repeat(repeat, number)))
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "ratio",
+) -> list[Regression]:
+    """
+    Compare the results of two reports, and return the results that became
+    slower by more than the threshold, a fraction like 0.1 for 10%. The metric
+    "ratio" compares the time relative to the json module, which compensates for
+    differences between machines, and "seconds" compares the absolute times.
+    """
+    baseline_results = get_results_by_key(baseline)
+    regressions: list[Regression] = []
+
+    for key, result in get_results_by_key(current).items():
+        baseline_result = baseline_results.get(key)
+        if baseline_result is None:
+            continue
+
+        change = result[metric] / baseline_result[metric] - 1
+        if change > threshold:
+            regressions.append(
+                {
+                    "key": key,
+                    "baseline": baseline_result[metric],
+                    "current": result[metric],
+                    "change": change,
+                }
+            )
+
+    return regressions
+
+
+def get_results_by_key(report: dict[str, Any]) -> dict[str, Result]:
+    return {
+        result["case"] + "." + result["operation"]: result
+        for result in report["results"]
+    }
+
+
+def format_result(result: Result) -> str:
+    return (
+        f"{result['case'] + '.' + result['operation']:<40}"
+        f"{result['seconds'] * 1000:>12.3f} ms"
+        f"{result['json_seconds'] * 1000:>12.3f} ms"
+        f"{result['ratio']:>10.1f}x"
+    )
+
+
+def format_header() -> str:
+    return f"{'benchmark':<40}{'tabularjson':>15}{'json':>15}{'ratio':>11}"
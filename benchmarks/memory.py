@@ -0,0 +1,345 @@
+import gc
+import json
+import multiprocessing
+import platform
+import time
+import tracemalloc
+from os import path
+from typing import Any, Callable, TypedDict
+
+from tabularjson import (
+    Columns,
+    TableWriter,
+    collect_fields,
+    collect_stats,
+    count_rows,
+    is_tabular,
+    parse,
+    stringify,
+    stringify_bytes,
+    stringify_to,
+)
+
+from benchmarks.cases import Case
+
+DEFAULT_BUDGETS = path.join(path.dirname(__file__), "memory_budgets.json")
+
+MB = 1024 * 1024
+
+
+class MemoryResult(TypedDict):
+    case: str
+    operation: str
+    # the size of the input in bytes: the Tabular-JSON text for parsing, and
+    # the data stringified into JSON for stringifying
+    input_bytes: int
+    # the peak of the memory allocated by Python while running the operation,
+    # measured with tracemalloc, in bytes and in bytes per MB of input
+    peak_bytes: int
+    peak_per_mb: float
+    # the growth of the peak resident set size of the process while running the
+    # operation, or None when it cannot be measured on this platform
+    rss_bytes: int | None
+    rss_per_mb: float | None
+
+
+class Violation(TypedDict):
+    key: str
+    metric: str
+    value: float
+    budget: float
+
+
+class Sink:
+    """A file which only counts the characters written to it"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, chunk: str):
+        self.size += len(chunk)
+
+
+def is_root_table(case: Case) -> bool:
+    return all(map(is_tabular, case["data"]))
+
+
+def is_flat_table(case: Case) -> bool:
+    return is_root_table(case) and all(
+        type(value) not in (dict, list)
+        for data in case["data"]
+        for row in data
+        for value in row.values()
+    )
+
+
+def prepare_columns(case: Case) -> Callable[[], Any]:
+    documents = []
+    for data in case["data"]:
+        keys = list(dict.fromkeys(key for row in data for key in row))
+        documents.append(Columns({key: [row.get(key) for row in data] for key in keys}))
+
+    return lambda: list(map(stringify, documents))
+
+
+def prepare_table_writer(case: Case) -> Callable[[], Any]:
+    fields = list(map(collect_fields, case["data"]))
+
+    def run():
+        for data, data_fields in zip(case["data"], fields):
+            with TableWriter(Sink(), data_fields) as writer:
+                writer.write_rows(iter(data))
+
+    return run
+
+
+# Every operation is a tuple (name, input, applies, prepare): the key of the case
+# holding the input which is measured, whether the operation applies to a case,
+# and a function preparing a case, which returns the function to measure. The
+# memory used while preparing is not measured.
+OPERATIONS: list[
+    tuple[str, str, Callable[[Case], bool], Callable[[Case], Callable[[], Any]]]
+] = [
+    (
+        "parse",
+        "text",
+        lambda case: True,
+        lambda case: lambda: list(map(parse, case["text"])),
+    ),
+    (
+        "stringify",
+        "json_text",
+        lambda case: True,
+        lambda case: lambda: list(map(stringify, case["data"])),
+    ),
+    (
+        "stringify_bytes",
+        "json_text",
+        lambda case: True,
+        lambda case: lambda: list(map(stringify_bytes, case["data"])),
+    ),
+    (
+        "stringify_to",
+        "json_text",
+        lambda case: True,
+        lambda case: lambda: [stringify_to(data, Sink()) for data in case["data"]],
+    ),
+    ("table_writer", "json_text", is_root_table, prepare_table_writer),
+    ("columns", "json_text", is_flat_table, prepare_columns),
+    (
+        "collect_stats",
+        "text",
+        is_root_table,
+        lambda case: lambda: list(map(collect_stats, case["text"])),
+    ),
+    (
+        "count_rows",
+        "text",
+        is_root_table,
+        lambda case: lambda: list(map(count_rows, case["text"])),
+    ),
+]
+
+
+def run_memory_benchmarks(
+    cases: list[Case],
+    on_result: Callable[[MemoryResult], Any] | None = None,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """
+    Measure the peak memory of every operation that applies to a case, and return
+    a report with the results. When isolate is True and the platform supports it,
+    every operation runs in a forked process, so the resident set size is not
+    affected by memory that previous operations left behind.
+    """
+    results: list[MemoryResult] = []
+
+    for case in cases:
+        for operation in OPERATIONS:
+            name, _input, applies, _prepare = operation
+            if not applies(case):
+                continue
+
+            measure = measure_in_process if isolate else measure_memory
+            peak_bytes, rss_bytes = measure(case, operation)
+            input_bytes = get_input_bytes(case, operation)
+
+            result: MemoryResult = {
+                "case": case["name"],
+                "operation": name,
+                "input_bytes": input_bytes,
+                "peak_bytes": peak_bytes,
+                "peak_per_mb": peak_bytes / (input_bytes / MB),
+                "rss_bytes": rss_bytes,
+                "rss_per_mb": (
+                    rss_bytes / (input_bytes / MB) if rss_bytes is not None else None
+                ),
+            }
+            results.append(result)
+
+            if on_result is not None:
+                on_result(result)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def get_input_bytes(case: Case, operation: tuple) -> int:
+    _name, input, _applies, _prepare = operation
+
+    return max(1, sum(len(text.encode("utf-8")) for text in case[input]))
+
+
+def measure_in_process(case: Case, operation: tuple) -> tuple[int, int | None]:
+    """Measure the memory of an operation in a forked process, when possible"""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return measure_memory(case, operation)
+
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+
+    def measure():
+        sender.send(measure_memory(case, operation))
+
+    process = context.Process(target=measure)
+    process.start()
+    sender.close()
+
+    try:
+        measurement = receiver.recv()
+    except EOFError:
+        measurement = None
+    finally:
+        receiver.close()
+        process.join()
+
+    if measurement is None:
+        raise RuntimeError(
+            f"Failed to measure {case['name']}.{operation[0]} "
+            f"(exit code {process.exitcode})"
+        )
+
+    return measurement
+
+
+def measure_memory(case: Case, operation: tuple) -> tuple[int, int | None]:
+    """
+    Measure the memory of an operation: the growth of the peak resident set size
+    while running it once, and the peak of the memory allocated by Python while
+    running it a second time with tracemalloc, which slows down the operation.
+    """
+    _name, _input, _applies, prepare = operation
+    run = prepare(case)
+
+    gc.collect()
+    rss_bytes: int | None = None
+    if reset_peak_rss():
+        start = read_rss()["VmRSS"]
+        output = run()
+        rss_bytes = max(0, read_rss()["VmHWM"] - start)
+        del output
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _peak = tracemalloc.get_traced_memory()
+        output = run()
+        _current, peak = tracemalloc.get_traced_memory()
+        del output
+    finally:
+        tracemalloc.stop()
+
+    return peak - start, rss_bytes
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak resident set size of the process, which works on Linux only"""
+    try:
+        with open("/proc/self/clear_refs", "w") as fp:
+            fp.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def read_rss() -> dict[str, int]:
+    """Read the current and the peak resident set size of the process in bytes"""
+    sizes = {}
+    with open("/proc/self/status", "r") as fp:
+        for line in fp:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                sizes[key] = int(value.split()[0]) * 1024
+
+    return sizes
+
+
+def load_budgets(filename: str) -> dict[str, dict[str, float]]:
+    with open(filename, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def check_budgets(
+    report: dict[str, Any], budgets: dict[str, dict[str, float]]
+) -> list[Violation]:
+    """
+    Return the results exceeding their budget. The budgets are a dict with the
+    maximum value per metric, peak_per_mb or rss_per_mb, where a budget is looked
+    up by "case.operation", then by "case", then by "operation", and then by "*".
+    Results without a budget, with a budget None, or without a measured value
+    are not checked.
+
+    Example:
+
+        budgets = {"peak_per_mb": {"*": 20 * MB, "tall_table.parse": 40 * MB}}
+    """
+    violations: list[Violation] = []
+
+    for result in report["results"]:
+        key = result["case"] + "." + result["operation"]
+
+        for metric, metric_budgets in budgets.items():
+            budget = next(
+                (
+                    metric_budgets[budget_key]
+                    for budget_key in (key, result["case"], result["operation"], "*")
+                    if budget_key in metric_budgets
+                ),
+                None,
+            )
+            value = result[metric]
+
+            if budget is not None and value is not None and value > budget:
+                violations.append(
+                    {"key": key, "metric": metric, "value": value, "budget": budget}
+                )
+
+    return violations
+
+
+def format_memory_result(result: MemoryResult) -> str:
+    rss_bytes = result["rss_bytes"]
+    rss_per_mb = result["rss_per_mb"]
+
+    return (
+        f"{result['case'] + '.' + result['operation']:<40}"
+        f"{result['input_bytes'] / MB:>10.2f} MB"
+        f"{result['peak_bytes'] / MB:>10.2f} MB"
+        f"{result['peak_per_mb'] / MB:>10.1f}x"
+        + (
+            f"{rss_bytes / MB:>10.2f} MB{rss_per_mb / MB:>10.1f}x"
+            if rss_bytes is not None and rss_per_mb is not None
+            else f"{'-':>13}{'-':>11}"
+        )
+    )
+
+
+def format_memory_header() -> str:
+    return (
+        f"{'benchmark':<40}{'input':>13}{'peak':>13}{'per MB':>11}"
+        f"{'rss':>13}{'per MB':>11}"
+    )
@@ -1,24 +1,73 @@
-from tabularjson.stringify import stringify
+from tabularjson.stringify import stringify, stringify_bytes, stringify_to
+from tabularjson.stringifier import Stringifier
+from tabularjson.columns import Columns
+from tabularjson.cache import Frozen, StringifyCache
+from tabularjson.parallel import stringify_parallel, stringify_parallel_to
 from tabularjson.parse import parse
-from tabularjson.types import StringifyOptions
-from tabularjson.tabular import collect_fields, is_tabular
+from tabularjson.incremental import ParseState, parse_incremental, reparse
+from tabularjson.append import TableAppender
+from tabularjson.writer import TableWriter
+from tabularjson.scan import read_header, count_rows
+from tabularjson.stats import TableStats, ColumnStats, collect_stats
+from tabularjson.types import (
+    StringifyOptions,
+    ParseOptions,
+    AppendOptions,
+    TableWriterOptions,
+    TableRowError,
+)
+from tabularjson.tabular import TableProfile, collect_fields, is_tabular, profile_table
 from tabularjson.table_properties import (
     always,
     no_nested_arrays,
     no_nested_tables,
     no_long_strings,
     is_homogeneous,
+    create_no_long_strings,
+    all_of,
+    any_of,
+    none_of,
+    sampled,
 )
 
 __all__ = [
     "stringify",
+    "stringify_to",
+    "stringify_bytes",
+    "Stringifier",
+    "Columns",
+    "Frozen",
+    "StringifyCache",
+    "stringify_parallel",
+    "stringify_parallel_to",
     "parse",
+    "parse_incremental",
+    "reparse",
+    "ParseState",
+    "TableAppender",
+    "TableWriter",
+    "read_header",
+    "count_rows",
+    "TableStats",
+    "ColumnStats",
+    "collect_stats",
     "StringifyOptions",
+    "ParseOptions",
+    "AppendOptions",
+    "TableWriterOptions",
+    "TableRowError",
     "collect_fields",
     "is_tabular",
+    "profile_table",
+    "TableProfile",
     "always",
     "no_nested_arrays",
     "no_nested_tables",
     "no_long_strings",
     "is_homogeneous",
+    "create_no_long_strings",
+    "all_of",
+    "any_of",
+    "none_of",
+    "sampled",
 ]
@@ -0,0 +1,146 @@
+import os
+from typing import Any, BinaryIO
+
+from tabularjson.scan import create_reader, read_table_header
+from tabularjson.stringify import (
+    DEFAULT_BUFFER_SIZE,
+    MISSING,
+    create_field_getters,
+    create_get_values,
+    create_stringify_value,
+    format_row,
+    get_field_paths,
+    resolve_indentation,
+    validate_row,
+)
+from tabularjson.types import AppendOptions, TableFieldGetter, TableHeader
+
+
+class TableAppender:
+    """
+    Append rows to an existing file containing a root table, without parsing or
+    rewriting the existing rows. The new rows are validated against the header of
+    the table, and written to the end of the file.
+
+    Example:
+
+        with TableAppender("friends.tjson") as appender:
+            appender.append({"id": 4, "name": "Alan"})
+            appender.append({"id": 5, "name": "Emma"})
+
+    Rows are buffered and written in a single write when the buffer is full,
+    when calling flush(), or when closing the appender.
+
+    :param file: Path of a file containing a root table
+    :param options: A dict with indentation, buffer_size and fsync. When indentation
+        is set, the cells are padded to the column widths of the existing header.
+        The fsync policy can be "never" (default), "flush" or "close".
+    """
+
+    def __init__(self, file: str | os.PathLike, options: AppendOptions | None = None):
+        self.options: AppendOptions = options or {}
+        self.buffer_size = self.options.get("buffer_size") or DEFAULT_BUFFER_SIZE
+        self.fsync = self.options.get("fsync") or "never"
+        # not "a+b", which would create a missing file
+        self.fp: BinaryIO = open(file, "r+b")
+
+        try:
+            self.fp.seek(0)
+            _, header = read_table_header(create_reader(self.fp))
+            if header is None:
+                raise ValueError("File does not contain a root table")
+
+            self.fields = get_header_fields(header)
+            self.widths = get_header_widths(header)
+            self.needs_newline = not ends_with_newline(self.fp)
+            self.fp.seek(0, os.SEEK_END)
+        except BaseException:
+            self.fp.close()
+            raise
+
+        self.stringify_value = create_stringify_value(self.options)
+        self.do_indent = resolve_indentation(self.options.get("indentation")) != ""
+        self.field_paths, self.field_prefixes = get_field_paths(self.fields)
+        self.get_values = create_get_values(self.fields)
+        self.chunks: list[str] = []
+        self.size = 0
+
+    def append(self, row: dict[str, Any]):
+        """Append a single row to the table"""
+        if type(row) is not dict:
+            raise TypeError("Row must be a dict, got " + str(type(row)))
+
+        validate_row(row, self.field_paths, self.field_prefixes)
+
+        cells = [
+            self.stringify_value(value, "", False) if value is not MISSING else ""
+            for value in self.get_values(row)
+        ]
+        line = (
+            format_row(cells, self.widths) if self.do_indent else ",".join(cells) + "\n"
+        )
+
+        if self.needs_newline:
+            line = "\n" + line
+            self.needs_newline = False
+
+        self.chunks.append(line)
+        self.size += len(line)
+
+        if self.size >= self.buffer_size:
+            self.write()
+
+    def append_rows(self, rows: list[dict[str, Any]]):
+        """Append multiple rows to the table"""
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        """Write all buffered rows to the file"""
+        self.write()
+        self.fp.flush()
+
+        if self.fsync == "flush":
+            os.fsync(self.fp.fileno())
+
+    def close(self):
+        """Write all buffered rows to the file and close it"""
+        if self.fp.closed:
+            return
+
+        try:
+            self.flush()
+
+            if self.fsync == "close":
+                os.fsync(self.fp.fileno())
+        finally:
+            self.fp.close()
+
+    def write(self):
+        if len(self.chunks) > 0:
+            self.fp.write("".join(self.chunks).encode("utf-8"))
+            self.chunks = []
+            self.size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def get_header_fields(header: TableHeader) -> list[TableFieldGetter]:
+    return create_field_getters(
+        list(map(lambda field: list(field["keys"]), header["fields"]))
+    )
+
+
+def get_header_widths(header: TableHeader) -> list[int]:
+    starts = header["starts"]
+
+    return [starts[i + 1] - starts[i] for i in range(len(starts) - 1)] + [0]
+
+
+def ends_with_newline(fp: BinaryIO) -> bool:
+    fp.seek(-1, os.SEEK_END)
+    return fp.read(1) == b"\n"
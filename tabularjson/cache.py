@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+DEFAULT_MAX_SIZE = 16 * 1024 * 1024
+
+
+class Frozen:
+    """
+    Mark a value as immutable, so its output can be reused by a StringifyCache.
+    Without cache, the value is stringified as if it was not wrapped.
+
+    Example:
+
+        cache = StringifyCache()
+        data = {"catalog": Frozen(catalog, version), "user": user}
+
+        text = stringify(data, {"cache": cache})
+
+    :param value: The value, which must not change as long as the version is the same
+    :param version: A hashable version of the value, like a number or timestamp,
+        which must be changed when the value changes
+    """
+
+    __slots__ = ("value", "version")
+
+    def __init__(self, value: Any, version: Hashable = None):
+        self.value = value
+        self.version = version
+
+
+class StringifyCache:
+    """
+    A cache with the output of values wrapped in Frozen, passed to stringify via
+    the option cache. The output of a value is stored per version of the value,
+    the indentation, and the options. The cache holds at most max_size characters,
+    and drops the least recently used output when full. A cache holds a reference
+    to the cached values.
+
+    :param max_size: The maximum number of characters of all cached output
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.entries: OrderedDict[tuple, tuple[Any, str]] = OrderedDict()
+        self.lock = Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> str | None:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[1]
+
+    def set(self, key: tuple, value: Any, text: str):
+        if len(text) > self.max_size:
+            return
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[1])
+
+            # the value is kept, so its id cannot be reused by another value
+            self.entries[key] = (value, text)
+            self.size += len(text)
+
+            while self.size > self.max_size:
+                _, (_, removed) = self.entries.popitem(last=False)
+                self.size -= len(removed)
+                self.evictions += 1
+
+    def clear(self):
+        """Clear the cache and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
@@ -0,0 +1,124 @@
+from dataclasses import fields as dataclass_fields, is_dataclass
+from json.encoder import encode_basestring  # type: ignore
+from typing import Any, Collection
+
+from tabularjson.types import GetValue, TableFieldGetter
+
+# the fields of every class, or None when the class is not supported, by the
+# class and whether its __slots__ are used
+_class_fields: dict[tuple[type, bool], list[TableFieldGetter] | None] = {}
+
+_missing = object()
+
+
+def get_class_fields(cls: type, slots: bool = False) -> list[TableFieldGetter] | None:
+    """
+    Get the fields of a dataclass or namedtuple, or when slots is True, of a class
+    with __slots__. Returns None when the class is not supported. The fields are
+    created once per class.
+    """
+    try:
+        return _class_fields[(cls, slots)]
+    except KeyError:
+        pass
+
+    names = get_field_names(cls, slots)
+    fields = (
+        list(
+            map(
+                lambda entry: create_class_field(cls, entry[0], entry[1]),
+                enumerate(names),
+            )
+        )
+        if names is not None
+        else None
+    )
+    _class_fields[(cls, slots)] = fields
+
+    return fields
+
+
+def get_list_fields(
+    array: list[Any], slotted_classes: Collection[type] = ()
+) -> list[TableFieldGetter] | None:
+    """
+    Get the fields of a list where all items are objects of the same supported
+    class, or None otherwise. The __slots__ are only used for slotted_classes.
+    """
+    if len(array) == 0:
+        return None
+
+    cls = type(array[0])
+    fields = get_class_fields(cls, cls in slotted_classes)
+    if fields is None or not all(type(item) is cls for item in array):
+        return None
+
+    return fields
+
+
+def get_entries(obj: Any, fields: list[TableFieldGetter]) -> list[tuple[str, Any]]:
+    """Get the keys and values of an object, leaving out unset __slots__"""
+    entries = []
+
+    for field in fields:
+        value, exists = field["get_value"](obj)
+        if exists:
+            entries.append((field["path"][0], value))
+
+    return entries
+
+
+def get_object_entries(
+    value: Any, slotted_classes: Collection[type] = ()
+) -> Collection[tuple[Any, Any]] | None:
+    """
+    Get the keys and values of a dict, or of an object of a supported class like
+    a dataclass, or None when the value is no object.
+    """
+    if type(value) is dict:
+        return value.items()
+
+    cls = type(value)
+    fields = get_class_fields(cls, cls in slotted_classes)
+
+    return get_entries(value, fields) if fields is not None else None
+
+
+def get_field_names(cls: type, slots: bool = False) -> list[str] | None:
+    if is_dataclass(cls):
+        return list(map(lambda field: field.name, dataclass_fields(cls)))
+
+    if issubclass(cls, tuple):
+        fields = getattr(cls, "_fields", None)
+        return list(fields) if fields is not None else None
+
+    # the slots of classes like uuid.UUID or pathlib.PurePath are private,
+    # so they are only used for classes passed explicitly
+    if not slots:
+        return None
+
+    names: list[str] = []
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        for name in [slots] if type(slots) is str else slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                names.append(name)
+
+    return names if len(names) > 0 else None
+
+
+def create_class_field(cls: type, index: int, name: str) -> TableFieldGetter:
+    get_value: GetValue
+
+    if issubclass(cls, tuple):
+        get_value = lambda obj: (obj[index], True)
+    elif is_dataclass(cls):
+        get_value = lambda obj: (getattr(obj, name), True)
+    else:
+        # a slot of which the value is not set is left out
+        def get_value(obj: Any) -> tuple[Any, bool]:
+            value = getattr(obj, name, _missing)
+
+            return (None, False) if value is _missing else (value, True)
+
+    return {"name": encode_basestring(name), "path": [name], "get_value": get_value}
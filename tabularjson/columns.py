@@ -0,0 +1,45 @@
+from typing import Any, Sequence
+
+from tabularjson.types import Path
+
+
+class Columns:
+    """
+    Tabular data stored per column, like a dict with lists, array.array's or
+    NumPy arrays. The table is stringified row by row straight from the columns,
+    without creating an object for every row. NumPy arrays are converted into
+    a list with tolist() first, which copies the column.
+
+    Example:
+
+        columns = Columns({"id": array("i", [1, 2]), "name": ["Joe", "Sarah"]})
+
+        text = stringify(columns)
+        # '"id","name"\n1,"Joe"\n2,"Sarah"\n'
+
+    :param columns: A dict with the values of every column, which all must have
+        the same length. A key is the name of a field, or a tuple with the path
+        to a nested value like ("address", "city").
+    """
+
+    def __init__(self, columns: dict[str | tuple, Sequence[Any]]):
+        if len(columns) == 0:
+            raise ValueError("A table must have at least one field")
+
+        lengths = set(map(len, columns.values()))
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+
+        self.columns = columns
+        self.length = lengths.pop()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def get_paths(self) -> list[Path]:
+        return list(
+            map(
+                lambda key: list(key) if type(key) is tuple else [key],
+                self.columns.keys(),
+            )
+        )
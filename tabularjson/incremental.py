@@ -0,0 +1,388 @@
+from bisect import bisect_right
+from typing import Any
+
+from tabularjson.objects import set_in
+from tabularjson.parse import create_parser
+from tabularjson.types import ParseNode, Parser, TableFieldSetter
+
+BLOCK_SIZE = 256
+
+
+class Node:
+    """
+    A parsed object, array, table, or table row. The position of a node is stored
+    relative to the start of its parent, in the NodeList of the parent.
+    """
+
+    __slots__ = ("kind", "key", "value", "length", "children", "fields", "closing")
+
+    def __init__(
+        self,
+        kind: str,
+        key: Any,
+        value: Any,
+        length: int,
+        children: "NodeList",
+        fields: list[TableFieldSetter] | None = None,
+        closing: int = 0,
+    ):
+        self.kind = kind
+        self.key = key
+        self.value = value
+        self.length = length
+        self.children = children
+        self.fields = fields
+        self.closing = closing
+
+
+class NodeList:
+    """
+    The child nodes of a node, together with their start position relative to the
+    parent. The nodes are stored in blocks, and the positions are stored relative
+    to the start of their block. When the length of a node changes, only the
+    positions in the same block and the start positions of the blocks after it
+    have to be shifted, instead of the positions of all nodes after it.
+    """
+
+    def __init__(self, entries: list[tuple[int, Node]]):
+        self.starts, self.offsets, self.nodes = create_blocks(entries)
+
+    def __len__(self) -> int:
+        return sum(map(len, self.nodes))
+
+    def find(self, position: int) -> tuple[int, int] | None:
+        """Find the location of the last node starting at or before position"""
+        b = bisect_right(self.starts, position) - 1
+        if b < 0:
+            return None
+
+        k = bisect_right(self.offsets[b], position - self.starts[b]) - 1
+
+        return b, k
+
+    def get(self, location: tuple[int, int]) -> tuple[int, Node]:
+        b, k = location
+
+        return self.starts[b] + self.offsets[b][k], self.nodes[b][k]
+
+    def set(self, location: tuple[int, int], node: Node):
+        b, k = location
+        self.nodes[b][k] = node
+
+    def next(self, location: tuple[int, int]) -> tuple[int, int] | None:
+        b, k = location
+
+        if k + 1 < len(self.nodes[b]):
+            return b, k + 1
+
+        if b + 1 < len(self.nodes):
+            return b + 1, 0
+
+        return None
+
+    def index(self, location: tuple[int, int]) -> int:
+        b, k = location
+
+        return sum(map(len, self.nodes[:b])) + k
+
+    def shift(self, location: tuple[int, int], delta: int):
+        """Shift the positions of all nodes after the given location"""
+        b, k = location
+
+        offsets = self.offsets[b]
+        for j in range(k + 1, len(offsets)):
+            offsets[j] += delta
+
+        starts = self.starts
+        for j in range(b + 1, len(starts)):
+            starts[j] += delta
+
+    def replace(
+        self,
+        first: tuple[int, int],
+        last: tuple[int, int],
+        entries: list[tuple[int, Node]],
+        delta: int,
+    ):
+        """
+        Replace the nodes from first to last (inclusive) with new entries, and
+        shift the positions of the nodes after last with delta.
+        """
+        b1, k1 = first
+        b2, k2 = last
+
+        before = [
+            (self.starts[b1] + offset, node)
+            for offset, node in zip(self.offsets[b1][:k1], self.nodes[b1][:k1])
+        ]
+        after = [
+            (self.starts[b2] + offset + delta, node)
+            for offset, node in zip(
+                self.offsets[b2][k2 + 1 :], self.nodes[b2][k2 + 1 :]
+            )
+        ]
+        starts, offsets, nodes = create_blocks(before + entries + after)
+
+        self.starts[b1 : b2 + 1] = starts
+        self.offsets[b1 : b2 + 1] = offsets
+        self.nodes[b1 : b2 + 1] = nodes
+
+        for j in range(b1 + len(starts), len(self.starts)):
+            self.starts[j] += delta
+
+
+def create_blocks(
+    entries: list[tuple[int, Node]],
+) -> tuple[list[int], list[list[int]], list[list[Node]]]:
+    starts = []
+    offsets = []
+    nodes = []
+
+    for i in range(0, len(entries), BLOCK_SIZE):
+        block = entries[i : i + BLOCK_SIZE]
+        block_start = block[0][0]
+
+        starts.append(block_start)
+        offsets.append([start - block_start for start, _ in block])
+        nodes.append([node for _, node in block])
+
+    return starts, offsets, nodes
+
+
+class ParseState:
+    """
+    The state of an incremental parse: the text, the parsed value, and the
+    position of all objects, arrays, tables and table rows in the text.
+    """
+
+    def __init__(self, text: str, value: Any, root: Node):
+        self.text = text
+        self.value = value
+        self.root = root
+
+
+def parse_incremental(text: str) -> ParseState:
+    """
+    Parse a string containing Tabular-JSON data, and keep track of the position
+    of all objects, arrays, tables and table rows, so the text can be parsed
+    again efficiently after an edit using reparse.
+
+    Example:
+
+        state = parse_incremental('{"id":1,"scores":[1,2,3]}')
+        reparse(state, 20, 1, "5")
+
+        print(state.value)
+        # {'id': 1, 'scores': [1, 5, 3]}
+
+    :param text: A string containing Tabular-JSON data
+    :return: Returns the parse state, containing the parsed value
+    """
+    value, parse_nodes = create_parser(text, track_nodes=True)["parse_nodes"]()
+    entries = [create_node(parse_node, 0) for parse_node in parse_nodes]
+    root = Node("document", None, value, len(text), NodeList(entries))
+
+    return ParseState(text, value, root)
+
+
+def reparse(
+    state: ParseState, offset: int, removed_length: int, inserted_text: str
+) -> ParseState:
+    """
+    Parse the text again after an edit, reusing the parsed values of everything
+    outside the edit. Only the smallest object, array, or range of table rows
+    enclosing the edit is parsed again, so the time needed does not depend on
+    the size of the document. Falls back to parsing the whole text when needed.
+
+    The state is updated in place. When the edited text is invalid, a SyntaxError
+    is thrown and the state is left unchanged.
+
+    :param state: The parse state, created by parse_incremental
+    :param offset: The position of the edit
+    :param removed_length: The number of characters removed at the offset
+    :param inserted_text: The text inserted at the offset
+    :return: Returns the updated parse state
+    """
+    text = state.text
+    edit_end = offset + removed_length
+    if offset < 0 or removed_length < 0 or edit_end > len(text):
+        raise ValueError("Edit is outside of the text")
+
+    new_text = text[:offset] + inserted_text + text[edit_end:]
+    delta = len(inserted_text) - removed_length
+    parser = create_parser(new_text, track_nodes=True)
+
+    # the path from the root to the smallest node enclosing the edit, with
+    # for every node its absolute start and its location in the parent
+    path: list[tuple[Node, int, tuple[int, int] | None]] = [(state.root, 0, None)]
+
+    while True:
+        node, start, _ = path[-1]
+        location = node.children.find(offset - start)
+        if location is None:
+            break
+
+        child_start, child = node.children.get(location)
+        child_start += start
+        child_end = child_start + child.length
+
+        # a table row or root table encloses the edit when the edit is on it,
+        # the other nodes when the edit is between their opening and closing brackets
+        encloses = (
+            child_start <= offset and edit_end <= child_end
+            if child.kind == "row" or is_root_table(child)
+            else child_start < offset and edit_end < child_end
+        )
+        if not encloses:
+            break
+
+        path.append((child, child_start, location))
+
+    for depth in range(len(path) - 1, 0, -1):
+        node, start, location = path[depth]
+
+        if node.kind == "table" and reparse_table_rows(
+            parser, node, start, offset, edit_end, delta
+        ):
+            update_ancestors(path[:depth], path[depth][2], delta)
+            state.text = new_text
+
+            return state
+
+        if node.kind == "row" or is_root_table(node):
+            # table rows are parsed by the table, and a root table by the document
+            continue
+
+        parsed_node = reparse_element(parser, node, start, delta)
+        if parsed_node is not None:
+            parent, parent_start, _ = path[depth - 1]
+            set_value(state, parent, node.key, parsed_node["value"])
+
+            parsed_node["key"] = node.key
+            _, new_node = create_node(parsed_node, parent_start)
+            parent.children.set(location, new_node)
+
+            update_ancestors(path[:depth], location, delta)
+            state.text = new_text
+
+            return state
+
+    new_state = parse_incremental(new_text)
+    state.text = new_state.text
+    state.value = new_state.value
+    state.root = new_state.root
+
+    return state
+
+
+def reparse_element(
+    parser: Parser, node: Node, start: int, delta: int
+) -> ParseNode | None:
+    try:
+        (parsed, _), parsed_node = parser["parse_element_at"](start)
+    except SyntaxError:
+        return None
+
+    if (
+        not parsed
+        or parsed_node is None
+        or parsed_node["end"] != start + node.length + delta
+    ):
+        return None
+
+    return parsed_node
+
+
+def reparse_table_rows(
+    parser: Parser, table: Node, start: int, offset: int, edit_end: int, delta: int
+) -> bool:
+    """
+    Parse the rows of a table again which are touched by the edit, or are
+    directly around an edit between two rows.
+    Returns False when the rows cannot be parsed on their own.
+    """
+    rows = table.children
+
+    first = rows.find(offset - start)
+    if first is None:
+        # the edit is in the header
+        return False
+
+    last = rows.find(edit_end - start)
+    last_start, last_row = rows.get(last)
+    if edit_end > start + last_start + last_row.length:
+        # the edit ends between two rows, also parse the next row
+        last = rows.next(last) or last
+
+    first_start, _ = rows.get(first)
+    first_start += start
+    next_row = rows.next(last)
+    if next_row is not None:
+        stop = start + rows.get(next_row)[0] + delta
+    else:
+        stop = start + table.length - table.closing + delta
+
+    try:
+        parsed_rows = parser["parse_table_rows_at"](first_start, stop, table.fields)
+    except SyntaxError:
+        return False
+
+    first_index = rows.index(first)
+    last_index = rows.index(last)
+    table.value[first_index : last_index + 1] = list(
+        map(lambda parsed_row: parsed_row["value"], parsed_rows)
+    )
+    rows.replace(
+        first,
+        last,
+        list(map(lambda parsed_row: create_node(parsed_row, start), parsed_rows)),
+        delta,
+    )
+    table.length += delta
+
+    return True
+
+
+def update_ancestors(
+    ancestors: list[tuple[Node, int, tuple[int, int] | None]],
+    location: tuple[int, int] | None,
+    delta: int,
+):
+    """Update the length of all ancestors, and the position of the nodes after them"""
+    for node, _, node_location in reversed(ancestors):
+        node.length += delta
+
+        if location is not None:
+            node.children.shift(location, delta)
+
+        location = node_location
+
+
+def is_root_table(node: Node) -> bool:
+    return node.kind == "table" and node.closing == 0
+
+
+def set_value(state: ParseState, parent: Node, key: Any, value: Any):
+    if parent.kind == "document":
+        state.value = value
+        parent.value = value
+    elif parent.kind == "row":
+        set_in(parent.value, key, value)
+    else:
+        parent.value[key] = value
+
+
+def create_node(parse_node: ParseNode, parent_start: int) -> tuple[int, Node]:
+    start = parse_node["start"]
+    children = NodeList([create_node(child, start) for child in parse_node["children"]])
+    node = Node(
+        parse_node["kind"],
+        parse_node["key"],
+        parse_node["value"],
+        parse_node["end"] - start,
+        children,
+        parse_node.get("fields"),
+        parse_node.get("closing", 0),
+    )
+
+    return start - parent_start, node
@@ -0,0 +1,309 @@
+import os
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import get_start_method
+from typing import IO, Any, Iterator, Literal
+
+from tabularjson.stringify import (
+    DEFAULT_SAMPLE_ROWS,
+    calculate_column_widths,
+    create_field_getters,
+    create_write_chunk,
+    create_writer,
+    format_row,
+    get_fixed_column_widths,
+    limit_column_widths,
+    resolve_indentation,
+    stringify,
+)
+from tabularjson.tabular import begin_table_profile, end_table_profile, is_tabular
+from tabularjson.types import ColumnWidths, Path, StringifyOptions, Write
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# The rows of the table that is being stringified. When fork is the default
+# method to start processes on the platform, the worker processes inherit the
+# rows, so the rows do not have to be sent to the workers.
+_shared_rows: list[Any] | None = None
+
+# A task stringifies the rows from start to end of the table. The rows are passed
+# along with the task, or else taken from the shared rows. A task with mode
+# "widths" returns the widths of the columns, and with mode "text" the text of
+# the rows, padded to the passed widths when the table is indented.
+type Task = tuple[
+    list[Any] | None,
+    int,
+    int,
+    list[Path],
+    StringifyOptions | None,
+    Literal["widths", "text"],
+    list[int] | None,
+]
+
+
+def stringify_parallel(
+    data: list[Any] | Iterable[list[Any]],
+    options: StringifyOptions | None = None,
+    processes: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    """
+    Stringify a large root table into Tabular-JSON using multiple processes.
+    The rows are split into chunks of chunk_size rows which are stringified by
+    a pool of processes. The output is the same as the output of stringify.
+
+    Example:
+
+        text = stringify_parallel(rows, {"indentation": 2}, processes=4)
+
+    :param data: A list with the rows of the table, or an iterable with lists
+        of rows, like a generator reading the rows from a database in chunks
+    :param options: A dict with the same options as stringify. The options are
+        sent to the processes, so callbacks must be functions defined at module level
+    :param processes: The number of processes, by default the number of CPUs
+    :param chunk_size: The number of rows stringified at once by a process
+    :return: Returns a string containing Tabular-JSON.
+    """
+    chunks: list[str] = []
+    write_parallel(chunks.append, data, options, processes, chunk_size)
+
+    return "".join(chunks)
+
+
+def stringify_parallel_to(
+    data: list[Any] | Iterable[list[Any]],
+    fp: IO[str] | IO[bytes],
+    options: StringifyOptions | None = None,
+    processes: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """
+    Stringify a large root table into Tabular-JSON using multiple processes like
+    stringify_parallel, and write the output to a file chunk by chunk in the
+    order of the rows.
+
+    :param data: A list with the rows of the table, or an iterable with lists of rows
+    :param fp: A file opened in text or binary mode, or another object with
+        a write method accepting a string
+    :param options: A dict with the same options as stringify
+    :param processes: The number of processes, by default the number of CPUs
+    :param chunk_size: The number of rows stringified at once by a process
+    """
+    write_parallel(create_write_chunk(fp), data, options, processes, chunk_size)
+
+
+def write_parallel(
+    write: Write,
+    data: list[Any] | Iterable[list[Any]],
+    options: StringifyOptions | None,
+    processes: int | None,
+    chunk_size: int,
+):
+    global _shared_rows
+
+    processes = processes or os.cpu_count() or 1
+    indentation = resolve_indentation(options.get("indentation") if options else None)
+    column_widths: ColumnWidths = (
+        options.get("column_widths") if options else None
+    ) or "exact"
+    fields_option = options.get("fields") if options else None
+
+    if type(data) is dict or type(data) is str or not isinstance(data, Iterable):
+        write(stringify(data, options))
+        return
+
+    if type(data) is not list:
+        if type(fields_option) is list and (
+            indentation == "" or type(column_widths) is list
+        ):
+            # the header and the widths are known in advance,
+            # so the chunks can be stringified while they arrive
+            write_chunks(write, data, options, processes)
+            return
+
+        data = list(chain.from_iterable(data))
+
+    writer = create_writer(lambda _: None, options, data)
+    max_column_width = options.get("max_column_width") if options else None
+    widths: list[int] | None = None
+
+    # share the profile of the table between output_as_table and the fields
+    previous = begin_table_profile(memoize=True)
+    try:
+        if not is_tabular(data) or not writer["is_output_as_table"](data):
+            write(stringify(data, options))
+            return
+
+        fields = writer["resolve_table_fields"](data)
+        paths = list(map(lambda field: field["path"], fields))
+        header = list(map(lambda field: field["name"], fields))
+
+        if indentation != "":
+            if type(column_widths) is list:
+                widths = get_fixed_column_widths(header, column_widths)
+            elif column_widths == "sample":
+                sample_rows = (
+                    options.get("sample_rows") if options else None
+                ) or DEFAULT_SAMPLE_ROWS
+                rows = writer["stringify_table_rows"](data[:sample_rows], fields, 0)
+                widths = limit_column_widths(
+                    calculate_column_widths(header, rows), max_column_width
+                )
+    finally:
+        end_table_profile(previous)
+
+    ranges = [
+        (start, min(start + chunk_size, len(data)))
+        for start in range(0, len(data), chunk_size)
+    ]
+    shared = processes == 1 or get_start_method() == "fork"
+
+    def create_tasks(
+        mode: Literal["widths", "text"], widths: list[int] | None
+    ) -> Iterator[Task]:
+        for start, end in ranges:
+            rows = None if shared else data[start:end]
+            yield rows, start, end, paths, options, mode, widths
+
+    _shared_rows = data if shared else None
+    try:
+        with create_executor(processes) as executor:
+            if indentation != "" and widths is None:
+                # calculate the widths of the columns from all rows first
+                widths = calculate_column_widths(header, [])
+                for chunk_widths in run_tasks(
+                    executor, create_tasks("widths", None), processes
+                ):
+                    widths = list(map(max, widths, chunk_widths))
+                widths = limit_column_widths(widths, max_column_width)
+
+            write(
+                format_row(header, widths)
+                if widths is not None
+                else ",".join(header) + "\n"
+            )
+            for text in run_tasks(executor, create_tasks("text", widths), processes):
+                write(text)
+    finally:
+        _shared_rows = None
+
+
+def write_chunks(
+    write: Write,
+    chunks: Iterable[list[Any]],
+    options: StringifyOptions | None,
+    processes: int,
+):
+    """Stringify a table with known fields and widths from an iterable with chunks"""
+    # the fields passed as a list are the fields of the root table
+    rows: list[Any] = []
+    writer = create_writer(lambda _: None, options, rows)
+    fields = writer["resolve_table_fields"](rows)
+    paths = list(map(lambda field: field["path"], fields))
+    header = list(map(lambda field: field["name"], fields))
+
+    indentation = resolve_indentation(options.get("indentation") if options else None)
+    column_widths = options.get("column_widths") if options else None
+    widths = (
+        get_fixed_column_widths(header, column_widths)
+        if indentation != "" and type(column_widths) is list
+        else None
+    )
+
+    def create_tasks() -> Iterator[Task]:
+        start = 0
+
+        for chunk in chunks:
+            if len(chunk) > 0:
+                yield chunk, start, start + len(chunk), paths, options, "text", widths
+                start += len(chunk)
+
+    count = 0
+    with create_executor(processes) as executor:
+        for text in run_tasks(executor, create_tasks(), processes):
+            if count == 0:
+                write(
+                    format_row(header, widths)
+                    if widths is not None
+                    else ",".join(header) + "\n"
+                )
+            write(text)
+            count += 1
+
+    if count == 0:
+        # a table without rows is an empty array
+        write(stringify([], options))
+
+
+def create_executor(processes: int) -> Executor:
+    if processes == 1:
+        return InlineExecutor()
+
+    # the default start method of the platform, since fork is unsafe on macOS
+    return ProcessPoolExecutor(processes)
+
+
+def run_tasks(
+    executor: Executor, tasks: Iterator[Task], processes: int
+) -> Iterator[Any]:
+    """
+    Run the tasks in the executor, and yield the results in the order of the
+    tasks. At most two tasks per process are submitted ahead, so the tasks
+    are created only when there is room for them.
+    """
+    pending: deque[Future] = deque()
+
+    for task in tasks:
+        pending.append(executor.submit(stringify_chunk, task))
+
+        if len(pending) >= 2 * processes:
+            yield pending.popleft().result()
+
+    while len(pending) > 0:
+        yield pending.popleft().result()
+
+
+def stringify_chunk(task: Task) -> Any:
+    rows, start, end, paths, options, mode, widths = task
+    if rows is None:
+        rows = (_shared_rows or [])[start:end]
+
+    if not all(type(row) is dict for row in rows):
+        raise TypeError("All rows of a table must be objects")
+
+    writer = create_writer(lambda _: None, options, rows)
+    fields = (
+        writer["resolve_table_fields"](rows)
+        if options and type(options.get("fields")) is list
+        else create_field_getters(paths)
+    )
+
+    previous = begin_table_profile(memoize=True)
+    try:
+        cells = writer["stringify_table_rows"](rows, fields, start)
+    finally:
+        end_table_profile(previous)
+
+    if mode == "widths":
+        return calculate_column_widths([""] * len(paths), cells)
+
+    if widths is None:
+        return "".join(map(lambda row: ",".join(row) + "\n", cells))
+
+    return "".join(map(lambda row: format_row(row, widths), cells))
+
+
+class InlineExecutor(Executor):
+    """Run the tasks directly in the current process, used with a single process"""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+
+        return future
@@ -2,10 +2,19 @@ from math import inf
 from typing import Any, Callable
 
 from tabularjson.objects import set_in
-from tabularjson.types import TableFieldSetter, SetValue, ParseResult, Record
-
-
-def parse(text: str) -> Any:
+from tabularjson.types import (
+    TableFieldSetter,
+    SetValue,
+    ParseResult,
+    Record,
+    Parser,
+    ParseNode,
+    ParseOptions,
+    TableHeader,
+)
+
+
+def parse(text: str, options: ParseOptions | None = None) -> Any:
     """
     Parse a string containing Tabular-JSON data into JSON.
 
@@ -35,12 +44,36 @@ def parse(text: str) -> Any:
         # }
 
     :param text: A string containing Tabular-JSON data
+    :param options: A dict with stats, a TableStats object to collect statistics
+        of the columns of a root table while parsing, and on_error and max_errors
+        to skip invalid rows of a root table instead of throwing an error
     :return: Returns the parsed JSON data
     """
 
+    return create_parser(text, options)["parse"]()
+
+
+def create_parser(
+    text: str, options: ParseOptions | None = None, track_nodes: bool = False
+) -> Parser:
+    """
+    Create a parser for a string containing Tabular-JSON data. Next to parsing
+    the full document, the parser can parse only the header of a root table,
+    or parse a single element or a range of table rows at a given position.
+    When track_nodes is True, the parser keeps track of the position of all
+    objects, arrays, tables and table rows.
+    """
+
     i = 0
     table_version1 = False
     table_version2 = False
+    stats = options.get("stats") if options else None
+    on_error = options.get("on_error") if options else None
+    max_errors = options.get("max_errors") if options else None
+    error_count = 0
+    offset_position = 0
+    offset = 0
+    nodes: list[ParseNode] = []
 
     def parse_object() -> ParseResult:
         nonlocal i
@@ -48,6 +81,9 @@ def parse(text: str) -> Any:
         if text_at(i) != "{":
             return False, None
 
+        start_node = i
+        parent_nodes = begin_node() if track_nodes else None
+
         i += 1
         skip_whitespace()
 
@@ -70,8 +106,12 @@ def parse(text: str) -> Any:
 
             skip_whitespace()
             eat_colon()
+            node_count = len(nodes) if track_nodes else 0
             parsed, value = parse_value()
 
+            if track_nodes and len(nodes) > node_count:
+                nodes[-1]["key"] = key
+
             if not parsed:
                 raise_object_value_expected()
 
@@ -84,6 +124,9 @@ def parse(text: str) -> Any:
             raise_object_key_or_end_expected()
         i += 1
 
+        if track_nodes:
+            end_node(parent_nodes, "object", start_node, obj)
+
         return True, obj
 
     def parse_array() -> ParseResult:
@@ -92,6 +135,9 @@ def parse(text: str) -> Any:
         if text_at(i) != "[":
             return False, None
 
+        start_node = i
+        parent_nodes = begin_node() if track_nodes else None
+
         i += 1
         skip_whitespace()
 
@@ -108,16 +154,24 @@ def parse(text: str) -> Any:
             else:
                 initial = False
 
+            node_count = len(nodes) if track_nodes else 0
             value = parse_value_or(raise_array_item_expected)
+
+            if track_nodes and len(nodes) > node_count:
+                nodes[-1]["key"] = len(array)
+
             array.append(value)
 
         if text_at(i) != "]":
             raise_array_item_or_end_expected()
         i += 1
 
+        if track_nodes:
+            end_node(parent_nodes, "array", start_node, array)
+
         return True, array
 
-    def parse_root_table() -> ParseResult:
+    def parse_root_table(keep_rows: bool = True) -> ParseResult:
         nonlocal i
 
         parsed, value = parse_value()
@@ -127,21 +181,117 @@ def parse(text: str) -> Any:
 
             skip_whitespace()
 
+            start_node = i
+            parent_nodes = begin_node() if track_nodes else None
+
             fields = parse_table_fields()
             eat_table_row_separator()
 
+            columns = (
+                stats.start(list(map(lambda field: field["keys"], fields)))
+                if stats is not None
+                else None
+            )
+            cells: list[tuple[bool, Any]] | None = [] if columns is not None else None
             rows: list[Record] = []
+            row_index = 0
 
             while i < len(text):
-                rows.append(parse_table_row(fields))
+                start = i
+
+                try:
+                    row = parse_table_row(fields, cells)
+
+                    if i < len(text):
+                        eat_table_row_separator()
+                except SyntaxError as error:
+                    if on_error is None:
+                        raise
 
-                if i < len(text):
-                    eat_table_row_separator()
+                    skip_invalid_table_row(error, row_index, start)
+                    row = None
+
+                if row is not None and keep_rows:
+                    rows.append(row)
+
+                if cells is not None:
+                    if row is not None:
+                        for column, (parsed, value) in zip(columns, cells):
+                            column.add(value, parsed)
+                    cells.clear()
+
+                row_index += 1
+
+            if track_nodes:
+                node = end_node(parent_nodes, "table", start_node, rows)
+                node["fields"] = fields
+                node["closing"] = 0
 
             return True, rows
 
         return parsed, value
 
+    def skip_invalid_table_row(error: SyntaxError, row: int, start: int):
+        nonlocal i, error_count
+
+        error_count += 1
+        if max_errors is not None and error_count > max_errors:
+            raise SyntaxError(
+                f"Maximum number of errors ({max_errors}) exceeded: {error}"
+            ) from error
+
+        # skip the invalid row until the next row separator
+        end = text.find("\n", i)
+        if end == -1:
+            end = len(text)
+
+        on_error(
+            {
+                "row": row,
+                "position": start,
+                "offset": get_offset(start),
+                "message": str(error),
+                "text": text[start:end],
+            }
+        )
+
+        i = end
+        if i < len(text):
+            eat_table_row_separator()
+
+    def get_offset(position: int) -> int:
+        """Get the offset in bytes of a position when the text is UTF-8 encoded"""
+        nonlocal offset_position, offset
+
+        offset += len(text[offset_position:position].encode("utf-8"))
+        offset_position = position
+
+        return offset
+
+    def parse_root_table_header(complete: bool = True) -> TableHeader | None:
+        nonlocal i
+
+        i = 0
+        skip_whitespace()
+
+        # a root table starts with a string directly followed by a comma
+        parsed, _ = parse_string()
+        skip_whitespace()
+        if parsed and i >= len(text) and not complete:
+            # the text is cut off, we cannot tell whether this is a root table
+            eat_comma()
+
+        if not parsed or text_at(i) != ",":
+            return None
+
+        i = 0
+        skip_whitespace()
+
+        starts: list[int] = []
+        fields = parse_table_fields(starts)
+
+        return {"fields": fields, "starts": starts, "end": i}
+
     def parse_table() -> ParseResult:
         nonlocal i
 
@@ -149,6 +299,9 @@ def parse(text: str) -> Any:
         if table_start is None:
             return False, None
 
+        start_node = i
+        parent_nodes = begin_node() if track_nodes else None
+
         i += len(table_start)
         skip_table_whitespace()
         eat_table_row_separator()
@@ -166,6 +319,11 @@ def parse(text: str) -> Any:
             raise_table_row_or_end_expected()
         i += len(table_end)
 
+        if track_nodes:
+            node = end_node(parent_nodes, "table", start_node, rows)
+            node["fields"] = fields
+            node["closing"] = len(table_end)
+
         return True, rows
 
     def get_table_start():
@@ -204,10 +362,10 @@ def parse(text: str) -> Any:
 
         return None
 
-    def parse_table_fields() -> list[TableFieldSetter]:
+    def parse_table_fields(starts: list[int] | None = None) -> list[TableFieldSetter]:
         nonlocal i
 
-        fields: list[TableFieldSetter] = []
+        paths: list[list[str]] = []
         initial_field = True
 
         while i < len(text) and text_at(i) != "\n":
@@ -217,6 +375,9 @@ def parse(text: str) -> Any:
             else:
                 initial_field = False
 
+            if starts is not None:
+                starts.append(i)
+
             keys: list[str] = [parse_string_or(raise_table_field_expected)]
             skip_table_whitespace()
 
@@ -227,26 +388,70 @@ def parse(text: str) -> Any:
                 keys.append(parse_string_or(raise_table_field_expected))
                 skip_table_whitespace()
 
-            fields.append({"keys": keys, "set_value": create_set_value(keys)})
+            paths.append(keys)
 
-        return fields
+        return [
+            {"keys": keys, "set_value": set_value}
+            for keys, set_value in zip(paths, create_set_values(paths))
+        ]
 
-    def parse_table_row(fields: list[TableFieldSetter]) -> Record:
+    def parse_table_row(
+        fields: list[TableFieldSetter], cells: list[tuple[bool, Any]] | None = None
+    ) -> Record:
         row: Record = {}
+        start_node = i
+        parent_nodes = begin_node() if track_nodes else None
 
         for index, field in enumerate(fields):
+            node_count = len(nodes) if track_nodes else 0
             parsed, value = parse_element()
             skip_table_whitespace()
 
             if parsed:
                 field["set_value"](row, value)
 
+            if track_nodes and len(nodes) > node_count:
+                nodes[-1]["key"] = field["keys"]
+
+            if cells is not None:
+                cells.append((parsed, value))
+
             if index < len(fields) - 1:
                 eat_comma()
                 skip_table_whitespace()
 
+        if track_nodes:
+            end_node(parent_nodes, "row", start_node, row)
+
         return row
 
+    def begin_node() -> list[ParseNode]:
+        """Start collecting the child nodes of a new node"""
+        nonlocal nodes
+
+        parent_nodes = nodes
+        nodes = []
+
+        return parent_nodes
+
+    def end_node(
+        parent_nodes: list[ParseNode], kind: str, start: int, value: Any
+    ) -> ParseNode:
+        nonlocal nodes
+
+        node: ParseNode = {
+            "kind": kind,
+            "start": start,
+            "end": i,
+            "key": None,
+            "value": value,
+            "children": nodes,
+        }
+        nodes = parent_nodes
+        nodes.append(node)
+
+        return node
+
     def parse_value() -> ParseResult:
         skip_whitespace()
 
@@ -575,13 +780,67 @@ def parse(text: str) -> Any:
     def text_at(index: int) -> str | None:
         return text[index] if index < len(text) else None
 
-    root_parsed, root_value = parse_root_table()
-    if not root_parsed:
-        raise_value_expected()
+    def parse_document(keep_rows: bool = True) -> Any:
+        root_parsed, root_value = parse_root_table(keep_rows)
+        if not root_parsed:
+            raise_value_expected()
+
+        expect_end_of_input()
+
+        return root_value
+
+    def scan_document() -> None:
+        parse_document(keep_rows=False)
+
+    def parse_nodes() -> tuple[Any, list[ParseNode]]:
+        value = parse_document()
+
+        return value, nodes
+
+    def parse_element_at(start: int) -> tuple[ParseResult, ParseNode | None]:
+        nonlocal i, nodes
+
+        i = start
+        nodes = []
+        result = parse_element()
+
+        return result, nodes[0] if len(nodes) > 0 else None
+
+    def parse_table_rows_at(
+        start: int, stop: int, fields: list[TableFieldSetter]
+    ) -> list[ParseNode]:
+        """
+        Parse table rows from position start until position stop, which must be
+        the start of the next row, the end of the table, or the end of the text.
+        """
+        nonlocal i, nodes
+
+        i = start
+        nodes = []
+
+        # skip blank lines and comments before the first row, like the whitespace
+        # after the separator of the previous row
+        skip_whitespace()
+
+        while i < stop:
+            parse_table_row(fields)
+
+            if i < len(text):
+                eat_table_row_separator()
 
-    expect_end_of_input()
+        if i != stop:
+            raise SyntaxError(f"Table rows do not end at position {stop} {pos()}")
 
-    return root_value
+        return nodes
+
+    return {
+        "parse": parse_document,
+        "scan": scan_document,
+        "parse_header": parse_root_table_header,
+        "parse_nodes": parse_nodes,
+        "parse_element_at": parse_element_at,
+        "parse_table_rows_at": parse_table_rows_at,
+    }
 
 
 def is_whitespace(char: str | None) -> bool:
@@ -609,6 +868,73 @@ def is_valid_string_character(char: str) -> bool:
     return 0x20 <= code <= 0x10FFFF
 
 
+def create_set_values(paths: list[list[str]]) -> list[SetValue]:
+    """
+    Create a function setting the value of every field of a table in a row.
+    The nested objects are created once per row and shared by all fields with
+    the same prefix, like "address"."city" and "address"."zip", instead of
+    walking the path from the row for every field.
+    """
+    prefixes = set(tuple(keys[:end]) for keys in paths for end in range(1, len(keys)))
+    if any(tuple(keys) in prefixes for keys in paths):
+        # a field containing the nested fields of another field, which may
+        # replace the nested object in the middle of a row
+        return list(map(create_set_value, paths))
+
+    get_objects: dict[tuple[str, ...], Callable[[Record], Record]] = {
+        (): lambda record: record
+    }
+
+    def get_object_getter(prefix: tuple[str, ...]) -> Callable[[Record], Record]:
+        get_object = get_objects.get(prefix)
+        if get_object is None:
+            get_object = create_get_object(get_object_getter(prefix[:-1]), prefix[-1])
+            get_objects[prefix] = get_object
+
+        return get_object
+
+    def create_set_nested_value(keys: list[str]) -> SetValue:
+        get_parent = get_object_getter(tuple(keys[:-1]))
+        last = keys[-1]
+
+        def set_value(record: Record, value: Any) -> None:
+            get_parent(record)[last] = value
+
+        return set_value
+
+    return [
+        create_set_nested_value(keys) if len(keys) > 1 else create_set_value(keys)
+        for keys in paths
+    ]
+
+
+def create_get_object(
+    get_parent: Callable[[Record], Record], key: str
+) -> Callable[[Record], Record]:
+    """
+    Create a function returning the nested object with the key in the parent
+    object of a row, creating it when needed. The object is looked up only once
+    for every row, for the first field that sets a value in it.
+    """
+    current_record: Record | None = None
+    current_object: Record = {}
+
+    def get_object(record: Record) -> Record:
+        nonlocal current_record, current_object
+
+        if record is not current_record:
+            parent = get_parent(record)
+            if key not in parent:
+                parent[key] = {}
+
+            current_record = record
+            current_object = parent[key]
+
+        return current_object
+
+    return get_object
+
+
 def create_set_value(keys: list[str]) -> SetValue:
     if len(keys) == 1:
         first = keys[0]
@@ -0,0 +1,266 @@
+import re
+from codecs import getincrementaldecoder
+from mmap import mmap
+from typing import IO, Callable
+
+from tabularjson.parse import create_parser
+from tabularjson.types import Path, TableHeader
+
+type Source = str | bytes | bytearray | memoryview | mmap | IO[str] | IO[bytes]
+type Read = Callable[[int], bytes]
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+NEWLINE = b"\n"
+
+# a line containing only whitespace, preceded by a newline
+BLANK_LINE = re.compile(rb"\n[ \t\r]*(?=\n)")
+LEADING_BLANK_LINE = re.compile(rb"[ \t\r]*\n")
+
+STRING = re.compile(rb'"[^"\\\n]*(?:\\.[^"\\\n]*)*"')
+
+# tokens that matter to find the end of a table row. Every token is a group:
+# newline, string, line comment, block comment, opening bracket, closing bracket,
+# deprecated table separator, and other content
+TOKEN = re.compile(
+    rb'(\n)|("[^"\\\n]*(?:\\.[^"\\\n]*)*"?)|(//[^\n]*)|(/\*)'
+    rb"|([\[{(])|([\]})])|(---)"
+    rb"|([^ \t\r\n\"\[\]{}()/-]+|[/-])"
+)
+NEWLINE_TOKEN = 1
+STRING_TOKEN = 2
+LINE_COMMENT_TOKEN = 3
+BLOCK_COMMENT_TOKEN = 4
+OPEN_TOKEN = 5
+CLOSE_TOKEN = 6
+DEPRECATED_TABLE_TOKEN = 7
+
+# marks an open array, object or table on the stack of open structures
+BRACKETS = -1
+
+
+def read_header(source: Source) -> list[Path] | None:
+    """
+    Read the header of a root table, without parsing the rows of the table.
+
+    Example:
+
+        with open("friends.tjson", "rb") as fp:
+            print(read_header(fp))
+            # [['id'], ['name'], ['address', 'city']]
+
+    :param source: A string, bytes, mmap, or a file opened in text or binary mode
+    :return: Returns the paths of the fields in the header, or None when the
+        source does not contain a root table
+    """
+    _, header = read_table_header(create_reader(source))
+
+    if header is None:
+        return None
+
+    return list(map(lambda field: list(field["keys"]), header["fields"]))
+
+
+def count_rows(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int | None:
+    """
+    Count the rows of a root table, without parsing the values in the table.
+    The rows are counted by a scan which only keeps track of strings, comments
+    and nested structures, so a row containing a nested array, object or
+    table which is spread over multiple lines is counted once. The contents of
+    the rows are not validated.
+
+    Example:
+
+        with open("friends.tjson", "rb") as fp:
+            print(count_rows(fp))
+            # 3
+
+    :param source: A string, bytes, mmap, or a file opened in text or binary mode
+    :param chunk_size: The number of bytes or characters read at once
+    :return: Returns the number of rows, or None when the source does not contain
+        a root table
+    """
+    read = create_reader(source)
+    prefix, header = read_table_header(read)
+
+    if header is None:
+        return None
+
+    # state: stack of open structures, in_block_comment, has_content, count
+    state = [[], False, False, 0]
+    rest = prefix
+
+    while True:
+        data = read(chunk_size)
+        if len(data) == 0:
+            break
+
+        # process complete lines only, so strings are never cut in half
+        data = rest + data
+        end = data.rfind(NEWLINE) + 1
+        rest = data[end:]
+
+        scan_lines(data[:end], state)
+
+    scan_lines(rest, state)
+
+    stack, _, has_content, count = state
+    if len(stack) == 0 and has_content:
+        count += 1
+
+    # do not count the header
+    return count - 1
+
+
+def scan_lines(data: bytes, state: list):
+    stack, in_block_comment, has_content, count = state
+
+    if (
+        len(stack) == 0
+        and not in_block_comment
+        and (
+            not has_special_chars(data)
+            or not has_special_chars(STRING.sub(b'""', data))
+        )
+    ):
+        # fast path: there are no nested structures or comments,
+        # so every non-blank line is a row
+        count += data.count(NEWLINE) - count_blank_lines(data)
+        tail = data[data.rfind(NEWLINE) + 1 :]
+        state[2] = len(tail.strip()) > 0
+        state[3] = count
+        return
+
+    position = 0
+    size = len(data)
+
+    while position < size:
+        if in_block_comment:
+            end = data.find(b"*/", position)
+            if end == -1:
+                break
+
+            in_block_comment = False
+            position = end + 2
+            continue
+
+        match = TOKEN.search(data, position)
+        if match is None:
+            break
+
+        position = match.end()
+        token = match.lastindex
+
+        if token == NEWLINE_TOKEN:
+            if has_content:
+                if len(stack) == 0:
+                    count += 1
+                elif stack[-1] != BRACKETS:
+                    # count the lines of a table with the deprecated syntax ---
+                    stack[-1] += 1
+
+            has_content = False
+        elif token == BLOCK_COMMENT_TOKEN:
+            in_block_comment = True
+        elif token == OPEN_TOKEN:
+            stack.append(BRACKETS)
+            has_content = True
+        elif token == CLOSE_TOKEN:
+            if len(stack) > 0:
+                stack.pop()
+
+            has_content = True
+        elif token == DEPRECATED_TABLE_TOKEN:
+            # like the parser, a --- is the end of a table when the table
+            # has a header and at least one row, and else the start of a table
+            if len(stack) > 0 and stack[-1] >= 2:
+                stack.pop()
+                has_content = True
+            else:
+                stack.append(0)
+                has_content = False
+        elif token != LINE_COMMENT_TOKEN:
+            has_content = True
+
+    state[:] = [stack, in_block_comment, has_content, count]
+
+
+def count_blank_lines(data: bytes) -> int:
+    leading = 1 if LEADING_BLANK_LINE.match(data) else 0
+
+    return leading + len(BLANK_LINE.findall(data))
+
+
+def has_special_chars(data: bytes) -> bool:
+    return (
+        b"(" in data or b"[" in data or b"{" in data or b"/" in data or b"---" in data
+    )
+
+
+def read_table_header(read: Read) -> tuple[bytes, TableHeader | None]:
+    """
+    Read the header of a root table, reading no more of the source than needed.
+    Returns the data that was read and the parsed header, or None when the
+    source does not contain a root table.
+    """
+    decoder = getincrementaldecoder("utf-8")()
+    data = b""
+    text = ""
+    size = 4096
+
+    while True:
+        chunk = read(size)
+        eof = len(chunk) == 0
+        data += chunk
+        text += decoder.decode(chunk, final=eof)
+
+        try:
+            header = create_parser(text)["parse_header"](eof)
+
+            # the header is complete when it is followed by a newline
+            if eof or header is None or header["end"] < len(text):
+                return data, header
+        except SyntaxError:
+            if eof:
+                raise
+
+        size *= 2
+
+
+def create_reader(source: Source) -> Read:
+    """
+    Create a function read(size) which returns the next chunk of the source
+    as UTF-8 encoded bytes, or an empty bytes object at the end of the source.
+    """
+    position = 0
+
+    if type(source) is str:
+
+        def read_str(size: int) -> bytes:
+            nonlocal position
+
+            chunk = source[position : position + size]
+            position += size
+
+            return chunk.encode("utf-8")
+
+        return read_str
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap)):
+
+        def read_bytes(size: int) -> bytes:
+            nonlocal position
+
+            chunk = source[position : position + size]
+            position += size
+
+            return chunk if type(chunk) is bytes else bytes(chunk)
+
+        return read_bytes
+
+    def read_file(size: int) -> bytes:
+        chunk = source.read(size)
+
+        return chunk.encode("utf-8") if type(chunk) is str else chunk
+
+    return read_file
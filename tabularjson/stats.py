@@ -0,0 +1,158 @@
+from heapq import heappush, heapreplace
+from math import isnan
+from typing import Any
+
+from tabularjson.parse import create_parser
+from tabularjson.types import Path
+
+DEFAULT_SKETCH_SIZE = 1024
+
+HASH_MASK = (1 << 64) - 1
+
+
+class DistinctSketch:
+    """
+    Estimate the number of distinct values using a bounded K-Minimum-Values sketch:
+    only the k smallest hashes are kept. The count is exact as long as there are
+    less than k distinct values.
+    """
+
+    def __init__(self, size: int = DEFAULT_SKETCH_SIZE):
+        self.size = size
+        # a max-heap (negated hashes) containing the k smallest hashes
+        self.heap: list[int] = []
+        self.hashes: set[int] = set()
+
+    def add(self, value: Any):
+        if type(value) is dict or type(value) is list:
+            value = repr(value)
+
+        h = hash((type(value), value)) & HASH_MASK
+
+        if h in self.hashes:
+            return
+
+        if len(self.hashes) < self.size:
+            self.hashes.add(h)
+            heappush(self.heap, -h)
+        elif h < -self.heap[0]:
+            removed = -heapreplace(self.heap, -h)
+            self.hashes.discard(removed)
+            self.hashes.add(h)
+
+    def estimate(self) -> int:
+        if len(self.hashes) < self.size:
+            return len(self.hashes)
+
+        largest = -self.heap[0]
+
+        return round((self.size - 1) * (HASH_MASK + 1) / (largest + 1))
+
+
+class ColumnStats:
+    """
+    Statistics of a single column of a table. Numbers are ordered before strings
+    when determining min and max. Booleans, nan, objects and arrays are ignored
+    for min and max, and null is not counted as a distinct value.
+    """
+
+    def __init__(self, path: Path, sketch_size: int = DEFAULT_SKETCH_SIZE):
+        self.path = path
+        self.count = 0
+        self.null_count = 0
+        self.missing_count = 0
+        self.max_string_length = 0
+        self.min_number: int | float | None = None
+        self.max_number: int | float | None = None
+        self.min_string: str | None = None
+        self.max_string: str | None = None
+        self.sketch = DistinctSketch(sketch_size)
+
+    def add(self, value: Any, exists: bool = True):
+        if not exists:
+            self.missing_count += 1
+            return
+
+        self.count += 1
+
+        if value is None:
+            self.null_count += 1
+            return
+
+        self.sketch.add(value)
+
+        if type(value) is str:
+            if len(value) > self.max_string_length:
+                self.max_string_length = len(value)
+
+            if self.min_string is None or value < self.min_string:
+                self.min_string = value
+
+            if self.max_string is None or value > self.max_string:
+                self.max_string = value
+        elif (type(value) is int or type(value) is float) and not isnan(value):
+            if self.min_number is None or value < self.min_number:
+                self.min_number = value
+
+            if self.max_number is None or value > self.max_number:
+                self.max_number = value
+
+    @property
+    def min(self) -> Any:
+        return self.min_number if self.min_number is not None else self.min_string
+
+    @property
+    def max(self) -> Any:
+        return self.max_string if self.max_string is not None else self.max_number
+
+    @property
+    def distinct_count(self) -> int:
+        return self.sketch.estimate()
+
+
+class TableStats:
+    """
+    Statistics of the columns of a root table, collected while parsing.
+
+    Example:
+
+        stats = TableStats()
+        data = parse(text, {"stats": stats})
+
+        for column in stats.columns:
+            print(column.path, column.null_count, column.min, column.max)
+    """
+
+    def __init__(self, sketch_size: int = DEFAULT_SKETCH_SIZE):
+        self.sketch_size = sketch_size
+        self.columns: list[ColumnStats] = []
+
+    def start(self, paths: list[Path]) -> list[ColumnStats]:
+        self.columns = [ColumnStats(path, self.sketch_size) for path in paths]
+
+        return self.columns
+
+    def get(self, path: Path) -> ColumnStats | None:
+        return next((column for column in self.columns if column.path == path), None)
+
+    @property
+    def row_count(self) -> int:
+        if len(self.columns) == 0:
+            return 0
+
+        return self.columns[0].count + self.columns[0].missing_count
+
+
+def collect_stats(text: str, sketch_size: int = DEFAULT_SKETCH_SIZE) -> TableStats:
+    """
+    Collect statistics of the columns of a root table, without keeping the parsed
+    rows in memory.
+
+    :param text: A string containing a Tabular-JSON root table
+    :param sketch_size: The number of hashes kept to estimate the distinct values
+    :return: Returns the statistics of the table
+    """
+    stats = TableStats(sketch_size)
+    create_parser(text, {"stats": stats})["scan"]()
+
+    return stats
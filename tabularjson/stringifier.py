@@ -0,0 +1,157 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import IO, Any
+
+from tabularjson.stringify import (
+    DEFAULT_BUFFER_SIZE,
+    create_buffered_write,
+    create_write_chunk,
+    create_write_value,
+    get_fields,
+    resolve_indentation,
+)
+from tabularjson.types import Record, StringifyOptions, TableFieldGetter
+
+DEFAULT_CACHE_SIZE = 128
+
+# The shape of an object: the set with its keys, and the shapes of the nested objects
+type Shape = tuple[frozenset, dict[Any, Shape]]
+
+
+class Stringifier:
+    """
+    Stringify many documents with the same options, like the responses of an API.
+    The fields of every table are cached by the structure of the rows, so tables
+    with the same structure as a previous table do not have to collect their fields
+    again. The cache holds the structures of at most cache_size tables, and drops
+    the least recently used structure when full.
+
+    A table is looked up by the keys of its first row, and its fields are reused
+    after verifying that all rows have the same keys and nested keys. Tables where
+    the rows have different keys are stringified without cache.
+
+    Example:
+
+        stringifier = Stringifier({"indentation": 2})
+
+        for response in responses:
+            text = stringifier.stringify(response)
+
+        print(stringifier.hits, stringifier.misses)
+
+    :param options: A dict with the same options as stringify
+    :param cache_size: The maximum number of table structures in the cache
+    """
+
+    def __init__(
+        self,
+        options: StringifyOptions | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.options = options
+        self.cache_size = cache_size
+        self.cache: OrderedDict[tuple, tuple[Shape, list[TableFieldGetter]]] = (
+            OrderedDict()
+        )
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.do_indent = (
+            resolve_indentation(options.get("indentation") if options else None) != ""
+        )
+
+    def stringify(self, data: Any) -> str:
+        """Stringify data into a string containing Tabular-JSON"""
+        chunks: list[str] = []
+        write_value = create_write_value(
+            chunks.append, self.options, data, self.get_table_fields
+        )
+
+        write_value(data, "", self.do_indent)
+
+        return "".join(chunks)
+
+    def stringify_to(
+        self,
+        data: Any,
+        fp: IO[str] | IO[bytes],
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        """Stringify data into Tabular-JSON, and write it to a file in chunks"""
+        write, flush = create_buffered_write(create_write_chunk(fp), buffer_size)
+        write_value = create_write_value(
+            write, self.options, data, self.get_table_fields
+        )
+
+        write_value(data, "", self.do_indent)
+        flush()
+
+    def get_table_fields(self, array: list[Record]) -> list[TableFieldGetter]:
+        signature = get_signature(array[0])
+
+        with self.lock:
+            entry = self.cache.get(signature)
+            if entry is not None:
+                self.cache.move_to_end(signature)
+
+        if entry is not None:
+            shape, fields = entry
+
+            if all(matches_shape(row, shape) for row in array):
+                self.hits += 1
+                return fields
+
+            self.misses += 1
+            return get_fields(array)
+
+        self.misses += 1
+        fields = get_fields(array)
+        shape = create_shape(array[0])
+
+        if all(matches_shape(row, shape) for row in array):
+            with self.lock:
+                self.cache[signature] = (shape, fields)
+
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        return fields
+
+    def clear(self):
+        """Clear the cache and reset the counters"""
+        with self.lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def get_signature(obj: Record) -> tuple:
+    """The keys of an object in order, and recursively the keys of nested objects"""
+    return tuple(
+        (key, get_signature(value) if type(value) is dict else None)
+        for key, value in obj.items()
+    )
+
+
+def create_shape(obj: Record) -> Shape:
+    return (
+        frozenset(obj.keys()),
+        {key: create_shape(value) for key, value in obj.items() if type(value) is dict},
+    )
+
+
+def matches_shape(obj: Any, shape: Shape) -> bool:
+    """
+    Test whether an object has the same keys and nested keys as the shape.
+    When all rows of a table have the same shape as the first row, the fields
+    of the table only depend on the signature of the first row.
+    """
+    keys, nested = shape
+
+    if type(obj) is not dict or obj.keys() != keys:
+        return False
+
+    if list(map(type, obj.values())).count(dict) != len(nested):
+        return False
+
+    return all(matches_shape(obj[key], nested[key]) for key in nested)
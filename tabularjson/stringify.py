@@ -1,20 +1,58 @@
 import json
+from array import array
+from io import BufferedIOBase, RawIOBase, TextIOBase
+from json.encoder import encode_basestring  # type: ignore
 from math import isnan, inf
 from symtable import Function
-from typing import Any, Callable
-
+from operator import attrgetter
+from typing import IO, Any, Callable, Collection, Iterable, Sequence
+
+from tabularjson.cache import Frozen, StringifyCache
+from tabularjson.classes import (
+    get_class_fields,
+    get_entries,
+    get_list_fields,
+    get_object_entries,
+)
+from tabularjson.columns import Columns
 from tabularjson.objects import get_in
-from tabularjson.table_properties import always
-from tabularjson.tabular import collect_fields, is_tabular
+from tabularjson.table_properties import (
+    always,
+    begin_verification,
+    end_verification,
+    uses_path,
+)
+from tabularjson.tabular import (
+    begin_table_profile,
+    end_table_profile,
+    get_table_profile,
+    is_tabular,
+)
 from tabularjson.types import (
+    ColumnWidths,
     OutputAsTable,
     StringifyOptions,
     Path,
     TableFieldGetter,
-    Record,
     GetValue,
+    GetValues,
+    Record,
+    Symbol,
+    TableFields,
+    Writer,
+    TableFieldsOption,
+    Write,
 )
 
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_SAMPLE_ROWS = 100
+
+# replaces the indexes of lists in the paths used as key of cached output_as_table results
+ANY_INDEX = Symbol("any_index")
+
+# the value of a field which does not exist in a row
+MISSING = Symbol("missing")
+
 
 def stringify(data: Any, options: StringifyOptions | None = None) -> str:
     """
@@ -50,6 +88,183 @@ def stringify(data: Any, options: StringifyOptions | None = None) -> str:
     :return: Returns a string containing Tabular-JSON.
     """
 
+    chunks: list[str] = []
+    write_value = create_write_value(chunks.append, options, data)
+    global_indentation = resolve_indentation(
+        options.get("indentation") if options else None
+    )
+
+    write_value(data, "", global_indentation != "")
+
+    return "".join(chunks)
+
+
+def stringify_to(
+    data: Any,
+    fp: IO[str] | IO[bytes],
+    options: StringifyOptions | None = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+):
+    """
+    Stringify data into Tabular-JSON, and write it to a file. The output is the
+    same as the output of stringify, but it is written in chunks of about
+    buffer_size characters, so the complete output is never held in memory.
+    When the file is opened in binary mode, the chunks are encoded as UTF-8.
+
+    Example:
+
+        with open("friends.tjson", "w", encoding="utf-8") as fp:
+            stringify_to(data, fp, {"indentation": 2})
+
+    :param data: JSON data
+    :param fp: A file opened in text or binary mode, or another object with
+        a write method accepting a string
+    :param options: A dict with indentation and trailing_commas
+    :param buffer_size: The number of characters collected before writing to fp
+    """
+
+    write, flush = create_buffered_write(create_write_chunk(fp), buffer_size)
+    write_value = create_write_value(write, options, data)
+    global_indentation = resolve_indentation(
+        options.get("indentation") if options else None
+    )
+
+    write_value(data, "", global_indentation != "")
+    flush()
+
+
+def stringify_bytes(
+    data: Any,
+    options: StringifyOptions | None = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> memoryview:
+    """
+    Stringify data into Tabular-JSON encoded as UTF-8. The output is encoded in
+    chunks of about buffer_size characters into a single bytearray, so the output
+    is never held in memory as a string and as bytes at the same time.
+
+    Example:
+
+        output = stringify_bytes(data, {"indentation": 2})
+        sock.sendall(output)
+
+    :param data: JSON data
+    :param options: A dict with the same options as stringify
+    :param buffer_size: The number of characters collected before encoding them
+    :return: Returns a memoryview of a bytearray containing the UTF-8 encoded output
+    """
+
+    output = bytearray()
+
+    def write_chunk(text: str):
+        output.extend(text.encode("utf-8"))
+
+    write, flush = create_buffered_write(write_chunk, buffer_size)
+    write_value = create_write_value(write, options, data)
+    global_indentation = resolve_indentation(
+        options.get("indentation") if options else None
+    )
+
+    write_value(data, "", global_indentation != "")
+    flush()
+
+    return memoryview(output)
+
+
+def create_write_chunk(fp: IO[str] | IO[bytes]) -> Write:
+    """
+    Create a function write_chunk(text) which writes text to a file. Text is
+    encoded as UTF-8 when the file is opened in binary mode.
+    """
+    if isinstance(fp, TextIOBase):
+        return fp.write
+
+    if isinstance(fp, (RawIOBase, BufferedIOBase)) or "b" in getattr(fp, "mode", ""):
+        return lambda text: fp.write(text.encode("utf-8"))  # type: ignore
+
+    return fp.write
+
+
+def create_buffered_write(
+    write_chunk: Write, buffer_size: int
+) -> tuple[Write, Callable[[], None]]:
+    """
+    Create a function write(text) which collects text, and passes it to
+    write_chunk as soon as buffer_size characters are collected, and a function
+    flush() to pass the remaining text.
+    """
+    chunks: list[str] = []
+    size = 0
+
+    def write(text: str):
+        nonlocal size
+
+        chunks.append(text)
+        size += len(text)
+
+        if size >= buffer_size:
+            flush()
+
+    def flush():
+        nonlocal size
+
+        if len(chunks) > 0:
+            write_chunk("".join(chunks))
+            chunks.clear()
+            size = 0
+
+    return write, flush
+
+
+def create_stringify_value(
+    options: StringifyOptions | None = None, root: Any = None
+) -> Callable[[Any, str, bool], str]:
+    """
+    Create a function stringify_value(value, indent, do_indent) which stringifies
+    a value using the provided options. The root is used to recognize a root table,
+    which is stringified without parentheses.
+    """
+    chunks: list[str] = []
+    write_value = create_write_value(chunks.append, options, root)
+
+    def stringify_value(value: Any, indent: str, do_indent: bool) -> str:
+        write_value(value, indent, do_indent)
+        text = "".join(chunks)
+        chunks.clear()
+
+        return text
+
+    return stringify_value
+
+
+def create_write_value(
+    write: Write,
+    options: StringifyOptions | None = None,
+    root: Any = None,
+    get_table_fields: Callable[[list[Any]], list[TableFieldGetter]] | None = None,
+) -> Callable[[Any, str, bool], None]:
+    """
+    Create a function write_value(value, indent, do_indent) which stringifies
+    a value using the provided options, and passes the output in pieces to write.
+    The root is used to recognize a root table, which is stringified without
+    parentheses. The fields of a table are determined by get_table_fields,
+    which is get_fields by default.
+    """
+    return create_writer(write, options, root, get_table_fields)["write_value"]
+
+
+def create_writer(
+    write: Write,
+    options: StringifyOptions | None = None,
+    root: Any = None,
+    get_table_fields: Callable[[list[Any]], list[TableFieldGetter]] | None = None,
+) -> Writer:
+    """
+    Create the functions to stringify a value, see create_write_value. Besides
+    write_value, it returns the functions to stringify the rows of a root table
+    separately, used to stringify parts of a table in parallel.
+    """
+
     global_indentation = resolve_indentation(
         options.get("indentation") if options else None
     )
@@ -62,182 +277,649 @@ def stringify(data: Any, options: StringifyOptions | None = None) -> str:
     output_as_table: OutputAsTable[Any] = (
         options.get("output_as_table") if options else always
     ) or always
+    column_widths: ColumnWidths = (
+        options.get("column_widths") if options else None
+    ) or "exact"
+    sample_rows = (
+        options.get("sample_rows") if options else None
+    ) or DEFAULT_SAMPLE_ROWS
+    max_column_width = options.get("max_column_width") if options else None
+    default: Callable[[Any], Any] | None = options.get("default") if options else None
+    slotted_classes = frozenset(
+        (options.get("slotted_classes") if options else None) or ()
+    )
+    cache: StringifyCache | None = options.get("cache") if options else None
+
+    # the output of a cached value depends on the options,
+    # and on the path when a callback uses the path
+    options_key = (
+        tuple(
+            sorted(
+                (key, repr(value)) for key, value in options.items() if key != "cache"
+            )
+        )
+        if cache is not None and options
+        else ()
+    )
+    if type(root) is Frozen:
+        root = root.value
+    table_fields: TableFieldsOption[Any] | None = (
+        options.get("fields") if options else None
+    )
+    strict_fields = (options.get("strict_fields") if options else False) or False
+
+    # fields passed as a list are the fields of the root table, and are created once
+    fixed_fields = (
+        create_table_fields(table_fields) if type(table_fields) is list else None
+    )
+    pass_fields_path = callable(table_fields) and uses_path(table_fields)
 
     path_getters: list[Callable[[], Path]] = []
     get_path = lambda: flatten(map(lambda get: get(), path_getters))
 
-    def stringify_value(value: Any, indent: str, do_indent: bool) -> str:
-        # number
-        if type(value) is int or type(value) is float:
-            if isnan(value):
-                return "nan"
-
-            if value == inf:
-                return "inf"
-
-            if value == -inf:
-                return "-inf"
-
-            return stringify_primitive_value(value)
-
-        # boolean, null, string
-        if type(value) is bool or value is None or type(value) is str:
-            return stringify_primitive_value(value)
+    # the path is only built when the callback uses it
+    pass_path = uses_path(output_as_table)
+    cache_output_as_table = (
+        options.get("cache_output_as_table") if options else False
+    ) or False
+    decisions: dict[tuple, bool] = {}
+
+    def is_output_as_table(value: list[Any]) -> bool:
+        if output_as_table is always:
+            return True
+
+        if not cache_output_as_table:
+            return (
+                output_as_table(value, get_path())
+                if pass_path
+                else output_as_table(value)  # type: ignore
+            )
+
+        path = get_path()
+        pattern = tuple(map(lambda key: ANY_INDEX if type(key) is int else key, path))
+        decision = decisions.get(pattern)
+        if decision is None:
+            decision = bool(
+                output_as_table(value, path) if pass_path else output_as_table(value)  # type: ignore
+            )
+            decisions[pattern] = decision
+
+        return decision
+
+    def resolve_table_fields(
+        array: list[Any], class_fields: list[TableFieldGetter] | None = None
+    ) -> list[TableFieldGetter]:
+        """
+        Get the fields passed via the option fields, or else the class_fields of
+        a list with objects of the same class, or else collect the fields from the
+        rows. With strict_fields, all rows are validated against the passed fields,
+        otherwise the values that are not in a field are left out.
+        """
+        # nested tables collect their own fields, unless passed via a callback
+        fields = fixed_fields if array is root else None
+
+        if fields is None and callable(table_fields):
+            paths = (
+                table_fields(array, get_path())
+                if pass_fields_path
+                else table_fields(array)  # type: ignore
+            )
+            if paths is not None:
+                fields = create_table_fields(paths)
+
+        if fields is None:
+            if class_fields is not None:
+                return class_fields
+
+            return (get_table_fields or get_fields)(array)
+
+        if strict_fields:
+            field_paths, field_prefixes = get_field_paths(fields)
+            keys = set(path[0] for path in field_paths if len(path) == 1)
+
+            for item in array:
+                if class_fields is not None:
+                    item = dict(get_entries(item, class_fields))
+
+                # only rows with nested objects or unknown keys need a full validation
+                if not item.keys() <= keys:
+                    validate_row(item, field_paths, field_prefixes, (), slotted_classes)
+
+        return fields
+
+    def write_value(value: Any, indent: str, do_indent: bool):
+        # number, boolean, null, string
+        formatter = FORMATTERS.get(type(value))
+        if formatter is not None:
+            write(formatter(value))
+            return
 
         # table
-        if is_tabular(value) and output_as_table(value, get_path()):
-            return stringify_table(value, indent)
+        if is_tabular(value) and is_output_as_table(value):
+            write_table(value, indent)
+            return
+
+        # table stored per column
+        if type(value) is Columns:
+            write_columns(value, indent)
+            return
 
         # array
         if type(value) is list:
-            return stringify_array(value, indent, do_indent)
+            # a table with objects of the same class, like dataclasses
+            class_fields = get_list_fields(value, slotted_classes)
+            if class_fields is not None and is_output_as_table(value):
+                write_table(value, indent, class_fields)
+                return
+
+            write_array(value, indent, do_indent)
+            return
 
         # object
         if type(value) is dict:
-            return stringify_object(value, indent, do_indent)
+            write_object(value.items(), indent, do_indent)
+            return
+
+        # value of which the output can be cached
+        if type(value) is Frozen:
+            write_frozen(value, indent, do_indent)
+            return
+
+        # dataclass, namedtuple, or one of the slotted_classes
+        cls = type(value)
+        fields = get_class_fields(cls, cls in slotted_classes)
+        if fields is not None:
+            write_object(get_entries(value, fields), indent, do_indent)
+            return
+
+        if default is not None:
+            write_value(default(value), indent, do_indent)
+            return
 
         raise TypeError("Unknown type of data: " + str(type(value)))
 
-    def stringify_array(array: list[Any], indent: str, do_indent: bool):
+    def write_frozen(frozen: Frozen, indent: str, do_indent: bool):
+        value = frozen.value
+
+        if cache is None:
+            write_value(value, indent, do_indent)
+            return
+
+        key = (
+            id(value),
+            frozen.version,
+            value is root,
+            indent,
+            do_indent,
+            options_key,
+            tuple(get_path()) if pass_path or pass_fields_path else None,
+        )
+        text = cache.get(key)
+        if text is None:
+            text = stringify_value(value, indent, do_indent)
+            cache.set(key, value, text)
+
+        write(text)
+
+    def stringify_value(value: Any, indent: str, do_indent: bool) -> str:
+        """Stringify a value into a separate string instead of writing it"""
+        nonlocal write
+
+        formatter = FORMATTERS.get(type(value))
+        if formatter is not None:
+            return formatter(value)
+
+        parent_write = write
+        chunks: list[str] = []
+        write = chunks.append
+
+        try:
+            write_value(value, indent, do_indent)
+        finally:
+            write = parent_write
+
+        return "".join(chunks)
+
+    def write_array(array: list[Any], indent: str, do_indent: bool):
         nonlocal path_getters
 
         if len(array) == 0:
-            return "[]"
+            write("[]")
+            return
 
         child_indent = (indent + global_indentation) if do_indent else indent
-        text = "[\n" if do_indent else "["
+        write("[\n" if do_indent else "[")
 
         index: int
         path_getters.append(lambda: [index])
 
         for index, item in enumerate(array):
             if do_indent:
-                text += child_indent
+                write(child_indent)
 
             if type(item) is not Function:
-                text += stringify_value(item, child_indent, do_indent)
+                write_value(item, child_indent, do_indent)
 
             if index < len(array) - 1:
-                text += ",\n" if do_indent else ","
+                write(",\n" if do_indent else ",")
             elif trailing_commas:
-                text += ","
+                write(",")
 
-        text += "\n" + indent + "]" if do_indent else "]"
+        write("\n" + indent + "]" if do_indent else "]")
         del path_getters[-1]
 
-        return text
+    def get_table_indent(table: Any, indent: str) -> str:
+        # a root table is written without parentheses and without indentation
+        if global_indentation != "" and table is not root:
+            return indent + global_indentation
+
+        return indent
 
-    def stringify_table(array: list[Any], indent: str):
+    def write_table(
+        array: list[Any],
+        indent: str,
+        class_fields: list[TableFieldGetter] | None = None,
+    ):
         nonlocal path_getters
 
-        is_root = array == data
-        table_do_indent = global_indentation != ""
-        child_indent = (
-            (indent + global_indentation)
-            if (table_do_indent and not is_root)
-            else indent
-        )
-        col_separator = ", " if table_do_indent else ","
+        child_indent = get_table_indent(array, indent)
+        fields = resolve_table_fields(array, class_fields)
+
+        header = list(map(lambda field: field["name"], fields))
+        stringify_row, get_row_path = create_stringify_row(array, fields, child_indent)
 
-        fields = get_fields(array)
+        path_getters.append(get_row_path)
+        write_table_rows(array, indent, header, len(array), stringify_row)
+        del path_getters[-1]
+
+    def create_stringify_row(
+        array: list[Any],
+        fields: list[TableFieldGetter],
+        child_indent: str,
+        start: int = 0,
+    ) -> tuple[Callable[[int], list[str]], Callable[[], Path]]:
+        """
+        Create a function stringify_row(item_index) returning the cells of a row,
+        and a function returning the path of the current cell relative to the table.
+        The start is the index of the first item of the array in the table.
+        """
+        current_path: list = []
+        index = 0
+
+        paths = list(map(lambda field: field["path"], fields))
+        get_values = create_get_values(fields, slotted_classes)
+
+        def stringify_row(item_index: int) -> list[str]:
+            nonlocal index, current_path
+
+            index = start + item_index
+            row = []
+
+            for path, value in zip(paths, get_values(array[item_index])):
+                if value is MISSING:
+                    row.append("")
+                    continue
+
+                formatter = FORMATTERS.get(type(value))
+                if formatter is not None:
+                    row.append(formatter(value))
+                    continue
+
+                # We pass do_indent=False so nested objects/arrays are not formatted over multiple lines.
+                # Nested tables though are always indented (when global_indentation is set).
+                current_path = path
+                row.append(stringify_value(value, child_indent, False))
+
+            return row
+
+        return stringify_row, lambda: [index] + current_path
+
+    def stringify_table_rows(
+        array: list[Any], fields: list[TableFieldGetter], start: int = 0
+    ) -> list[list[str]]:
+        """
+        Stringify the cells of the rows of a root table, where array contains
+        the rows of the table starting at index start.
+        """
+        stringify_row, get_row_path = create_stringify_row(array, fields, "", start)
+
+        path_getters.append(get_row_path)
+        try:
+            return list(map(stringify_row, range(len(array))))
+        finally:
+            del path_getters[-1]
+
+    def write_columns(columns: Columns, indent: str):
+        nonlocal path_getters
+
+        if len(columns) == 0:
+            write("[]")
+            return
+
+        child_indent = get_table_indent(columns, indent)
+        paths = columns.get_paths()
 
         current_path: list = []
         index = 0
         path_getters.append(lambda: [index] + current_path)
 
-        text = "" if is_root else "(\n"
+        header = list(map(stringify_field, paths))
 
-        def stringify_cell(item: Any, field: TableFieldGetter):
-            value, exists = field["get_value"](item)
+        # every column is formatted with the formatter of its type when known,
+        # or else value by value
+        encoders = [
+            (path, *get_column_formatter(column))
+            for path, column in zip(paths, columns.columns.values())
+        ]
 
-            # We pass do_indent=False so nested objects/arrays are not formatted over multiple lines.
-            # Nested tables though are always indented (when global_indentation is set).
-            return stringify_value(value, child_indent, False) if exists else ""
+        def stringify_row(item_index: int) -> list[str]:
+            nonlocal index, current_path
 
-        header = list(map(lambda field: field["name"], fields))
-        rows = []
-        for index, item in enumerate(array):
+            index = item_index
             row = []
 
-            for field in fields:
-                current_path = field["path"]
-                row.append(stringify_cell(item, field))
+            for path, values, column_formatter in encoders:
+                value = values[item_index]
 
-            rows.append(row)
+                if column_formatter is not None:
+                    row.append(column_formatter(value))
+                    continue
 
-        if table_do_indent:
-            widths = calculate_column_widths(header, rows)
+                formatter = FORMATTERS.get(type(value))
+                if formatter is not None:
+                    row.append(formatter(value))
+                    continue
 
-            text += child_indent + format_row(header, widths)
-            for row in rows:
-                text += child_indent + format_row(row, widths)
-        else:
-            text += child_indent + col_separator.join(header) + "\n"
-            for row in rows:
-                text += child_indent + col_separator.join(row) + "\n"
+                current_path = path
+                row.append(stringify_value(value, child_indent, False))
 
-        text += "" if is_root else indent + ")"
-        del path_getters[-1]
+            return row
 
-        return text
+        write_table_rows(columns, indent, header, len(columns), stringify_row)
+        del path_getters[-1]
 
-    def format_row(row: list[str], widths: list[int]):
-        cells = map(
-            lambda entry: (
-                (entry[1] + ",").ljust(widths[entry[0]])
-                if entry[0] < len(widths) - 1
-                else entry[1] + "\n"
-            ),
-            enumerate(row),
-        )
+    def write_table_rows(
+        table: Any,
+        indent: str,
+        header: list[str],
+        count: int,
+        stringify_row: Callable[[int], list[str]],
+    ):
+        """Write the header and the rows of a table, in parentheses when nested"""
+        is_root = table is root
+        child_indent = get_table_indent(table, indent)
+
+        if not is_root:
+            write("(\n")
+
+        if global_indentation != "":
+            sample: list[list[str]] = []
+
+            if type(column_widths) is list:
+                widths = get_fixed_column_widths(header, column_widths)
+            else:
+                if column_widths == "two_pass":
+                    # calculate the exact widths in a first pass, without keeping
+                    # the rows in memory. The rows are stringified again when writing
+                    rows = map(stringify_row, range(count))
+                else:
+                    # keep the stringified rows to write them later
+                    end = (
+                        min(sample_rows, count) if column_widths == "sample" else count
+                    )
+                    sample = list(map(stringify_row, range(end)))
+                    rows = sample
+
+                widths = limit_column_widths(
+                    calculate_column_widths(header, rows), max_column_width
+                )
+
+            write(child_indent + format_row(header, widths))
+            for row in sample:
+                write(child_indent + format_row(row, widths))
+            for item_index in range(len(sample), count):
+                row = stringify_row(item_index)
+                write(child_indent + format_row(row, widths))
+        else:
+            write(child_indent + ",".join(header) + "\n")
+            for item_index in range(count):
+                write(child_indent + ",".join(stringify_row(item_index)) + "\n")
 
-        return "".join(cells)
+        if not is_root:
+            write(indent + ")")
 
-    def stringify_object(obj: Record, indent: str, do_indent: bool):
+    def write_object(
+        entries: Collection[tuple[Any, Any]], indent: str, do_indent: bool
+    ):
         nonlocal path_getters
 
-        entries = obj.items()
-
         if len(entries) == 0:
-            return "{}"
+            write("{}")
+            return
 
         child_indent = indent + global_indentation if do_indent else indent
-        text = "{\n" if do_indent else "{"
+        write("{\n" if do_indent else "{")
         path_getters.append(lambda: [key])
 
         for index, (key, value) in enumerate(entries):
             key_str = stringify_primitive_value(key)
 
-            text += child_indent + key_str + ": " if do_indent else key_str + ":"
-            text += stringify_value(value, child_indent, do_indent)
+            write(child_indent + key_str + ": " if do_indent else key_str + ":")
+            write_value(value, child_indent, do_indent)
 
             if index < len(entries) - 1:
-                text += ",\n" if do_indent else ","
+                write(",\n" if do_indent else ",")
             elif trailing_commas:
-                text += ","
+                write(",")
 
-        text += "\n" + indent + "}" if do_indent else "}"
+        write("\n" + indent + "}" if do_indent else "}")
         del path_getters[-1]
 
-        return text
+    def write_root_value(value: Any, indent: str, do_indent: bool):
+        # the output_as_table callbacks profile the nested lists of every table,
+        # so remember the facts about lists instead of scanning them again
+        previous = begin_table_profile(
+            memoize=output_as_table is not always, slotted_classes=slotted_classes
+        )
+        # sampled predicates verify their outcome while the value is written
+        previous_verification = begin_verification()
+
+        try:
+            write_value(value, indent, do_indent)
+        finally:
+            end_table_profile(previous)
+            end_verification(previous_verification)
 
-    return stringify_value(data, "", global_indentation != "")
+    return {
+        "write_value": write_root_value,
+        "is_output_as_table": is_output_as_table,
+        "resolve_table_fields": resolve_table_fields,
+        "stringify_table_rows": stringify_table_rows,
+    }
 
 
 def get_fields(records: list[Any]) -> list[TableFieldGetter]:
-    nested_paths = collect_fields(records)
+    return create_field_getters(get_table_profile(records, complete=False).fields)
 
-    return list(
+
+def create_table_fields(fields: TableFields) -> list[TableFieldGetter]:
+    """Create the fields of a table from a list with keys and paths"""
+    if len(fields) == 0:
+        raise ValueError("A table must have at least one field")
+
+    return create_field_getters(
+        list(map(lambda field: [field] if type(field) is str else field, fields))
+    )
+
+
+def create_field_getters(paths: list[Path]) -> list[TableFieldGetter]:
+    return [
+        {
+            "name": stringify_field(path),
+            "path": path,
+            "get_value": create_get_value(path),
+        }
+        for path in paths
+    ]
+
+
+def get_field_paths(fields: list[TableFieldGetter]) -> tuple[set[tuple], set[tuple]]:
+    """Get the paths of the fields, and all paths of the objects containing them"""
+    field_paths = set(tuple(field["path"]) for field in fields)
+    field_prefixes = set(
+        tuple(path[:end]) for path in field_paths for end in range(1, len(path))
+    )
+
+    return field_paths, field_prefixes
+
+
+def validate_row(
+    obj: dict[str, Any],
+    field_paths: set[tuple],
+    field_prefixes: set[tuple],
+    parent_path: tuple = (),
+    slotted_classes: Collection[type] = (),
+):
+    """
+    Validate that all values in a row can be stored in one of the fields.
+    Nested objects can be dicts, or objects of a class like a dataclass.
+    """
+    for key, value in obj.items():
+        path = parent_path + (key,)
+
+        if path in field_paths:
+            continue
+
+        entries = (
+            get_object_entries(value, slotted_classes)
+            if path in field_prefixes
+            else None
+        )
+        if entries is None:
+            raise ValueError(
+                f"Field {stringify_field(list(path))} does not exist in the table header"
+            )
+
+        validate_row(dict(entries), field_paths, field_prefixes, path, slotted_classes)
+
+
+def create_get_values(
+    fields: list[TableFieldGetter], slotted_classes: Collection[type] = ()
+) -> GetValues:
+    """
+    Create a function returning the values of all fields of a row, or MISSING
+    when the field does not exist in the row. The nested fields are looked up
+    via a tree of their paths, so a shared prefix like "address" is looked up
+    once per row instead of once per field. For rows and nested objects which
+    are not a dict, like dataclasses, the fields are attributes.
+    """
+    # the keys of the fields that are not nested, and MISSING for nested fields,
+    # which are never found in a row and are filled in by visiting the tree
+    keys = list(
         map(
-            lambda path: {
-                "name": stringify_field(path),
-                "path": path,
-                "get_value": create_get_value(path),
-            },
-            nested_paths,
+            lambda field: field["path"][0] if len(field["path"]) == 1 else MISSING,
+            fields,
         )
     )
 
+    # a node of the tree holds the indices of the fields ending at the node,
+    # and the child nodes by key
+    tree: dict[str | int, tuple[list[int], dict]] = {}
+    for index, field in enumerate(fields):
+        path = field["path"]
+
+        if len(path) > 1:
+            node = tree.setdefault(path[0], ([], {}))
+            for key in path[1:]:
+                node = node[1].setdefault(key, ([], {}))
+            node[0].append(index)
+
+    visitors = [
+        (key, create_visit_node(*node, slotted_classes))
+        for key, node in tree.items()
+        if type(key) is str
+    ]
+
+    # get all attributes of an object like a dataclass at once
+    get_attributes = (
+        attrgetter(*keys)
+        if len(keys) > 1 and all(type(key) is str for key in keys)
+        else None
+    )
+
+    def get_values(item: Record) -> Sequence[Any]:
+        if type(item) is not dict:
+            # an object like a dataclass, where the fields are its attributes.
+            # Unset __slots__ do not exist
+            if get_attributes is not None:
+                try:
+                    return get_attributes(item)
+                except AttributeError:
+                    pass
+
+            values = [
+                getattr(item, key, MISSING) if key is not MISSING else MISSING
+                for key in keys
+            ]
+
+            for key, visit in visitors:
+                value = getattr(item, key, MISSING)
+                if value is not MISSING:
+                    visit(value, values)
+
+            return values
+
+        values = [item.get(key, MISSING) for key in keys]
+
+        for key, visit in visitors:
+            if key in item:
+                visit(item[key], values)
+
+        return values
+
+    return get_values
+
+
+def create_visit_node(
+    indices: list[int], children: dict, slotted_classes: Collection[type] = ()
+) -> Callable[[Any, list[Any]], None]:
+    """
+    Create a function storing a value in the fields ending at a node of the tree,
+    and visiting the nested values of the child nodes. Like get_in, a nested
+    value is looked up in an object by key, and in an array by index. In an
+    object of a class like a dataclass, a nested value is an attribute.
+    """
+    visitors = [
+        (key, create_visit_node(*child, slotted_classes))
+        for key, child in children.items()
+    ]
+    object_visitors = [(key, visit) for key, visit in visitors if type(key) is str]
+
+    def visit(value: Any, values: list[Any]):
+        for index in indices:
+            values[index] = value
+
+        if type(value) is dict:
+            for key, visit_child in object_visitors:
+                if key in value:
+                    visit_child(value[key], values)
+        elif type(value) is list:
+            for key, visit_child in visitors:
+                item_index = int(key)
+
+                if item_index < len(value):
+                    visit_child(value[item_index], values)
+        elif len(object_visitors) > 0:
+            cls = type(value)
+
+            if get_class_fields(cls, cls in slotted_classes) is not None:
+                for key, visit_child in object_visitors:
+                    child = getattr(value, key, MISSING)
+                    if child is not MISSING:
+                        visit_child(child, values)
+
+    return visit
+
 
 def create_get_value(path: Path) -> GetValue:
     if len(path) == 1:
@@ -247,8 +929,71 @@ def create_get_value(path: Path) -> GetValue:
     return lambda item: get_in(item, path)
 
 
+def stringify_float(value: float) -> str:
+    if isnan(value):
+        return "nan"
+
+    if value == inf:
+        return "inf"
+
+    if value == -inf:
+        return "-inf"
+
+    return float.__repr__(value)
+
+
+# Specialized formatters for the primitive types, giving the same output as
+# json.dumps(value, ensure_ascii=False) but without its overhead per call.
+# Strings are escaped by the C implementation of the json encoder, which returns
+# plain strings without escaping work.
+FORMATTERS: dict[type, Callable[[Any], str]] = {
+    int: int.__repr__,
+    float: stringify_float,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda _: "null",
+    str: encode_basestring,
+}
+
+
+# Formatters of the values of NumPy arrays, by the kind of their dtype
+DTYPE_FORMATTERS: dict[str, Callable[[Any], str]] = {
+    "i": int.__repr__,
+    "u": int.__repr__,
+    "f": stringify_float,
+    "b": FORMATTERS[bool],
+    "U": encode_basestring,
+}
+
+
+def get_column_formatter(
+    column: Sequence[Any],
+) -> tuple[Sequence[Any], Callable[[Any], str] | None]:
+    """
+    Get the values of a column, and the formatter for all values when the type of
+    the values is known from the column, like for an array.array or NumPy array.
+    """
+    if type(column) is array:
+        if column.typecode in "fd":
+            return column, stringify_float
+
+        if column.typecode in "uw":
+            return column, encode_basestring
+
+        return column, int.__repr__
+
+    dtype = getattr(column, "dtype", None)
+    if dtype is not None:
+        # convert a NumPy array into a list with Python numbers, strings and
+        # booleans. This copies the column, but is much faster than item by item
+        return column.tolist(), DTYPE_FORMATTERS.get(dtype.kind)  # type: ignore
+
+    return column, None
+
+
 def stringify_primitive_value(value: str | int | float | bool | None) -> str:
-    return json.dumps(value, ensure_ascii=False)
+    formatter = FORMATTERS.get(type(value))
+
+    return formatter(value) if formatter else json.dumps(value, ensure_ascii=False)
 
 
 def stringify_field(path: Path):
@@ -265,7 +1010,7 @@ def resolve_indentation(indentation: int | str | None) -> str:
     return ""
 
 
-def calculate_column_widths(header: list[str], rows: list[list[str]]) -> list[int]:
+def calculate_column_widths(header: list[str], rows: Iterable[list[str]]) -> list[int]:
     widths = list(map(len, header))
 
     for row in rows:
@@ -280,5 +1025,50 @@ def calculate_column_widths(header: list[str], rows: list[list[str]]) -> list[in
     return list(map(lambda width: width + 2, widths))
 
 
+def get_fixed_column_widths(header: list[str], column_widths: list[int]) -> list[int]:
+    """Get the widths of the columns passed via the option column_widths"""
+    return list(
+        map(
+            lambda entry: (
+                max(
+                    len(entry[1]),
+                    column_widths[entry[0]] if entry[0] < len(column_widths) else 0,
+                )
+                + 2
+            ),
+            enumerate(header),
+        )
+    )
+
+
+def limit_column_widths(widths: list[int], max_column_width: int | None) -> list[int]:
+    if max_column_width is None:
+        return widths
+
+    return list(map(lambda width: min(width, max_column_width + 2), widths))
+
+
+def format_row(row: list[str], widths: list[int]):
+    cells = map(
+        lambda entry: (
+            format_cell(entry[1], widths[entry[0]])
+            if entry[0] < len(widths) - 1
+            else entry[1] + "\n"
+        ),
+        enumerate(row),
+    )
+
+    return "".join(cells)
+
+
+def format_cell(cell: str, width: int) -> str:
+    # a cell which is wider than its column is followed by a single space,
+    # moving the next cells to the right
+    if len(cell) + 2 > width and "\n" not in cell:
+        return cell + ", "
+
+    return (cell + ",").ljust(width)
+
+
 def flatten(xss):
     return [x for xs in xss for x in xs]
@@ -1,6 +1,32 @@
-from typing import Any
-from tabularjson.tabular import is_tabular
-from tabularjson.types import Record, TabularData, Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from inspect import Parameter, signature
+from math import ceil, log
+from random import Random
+from threading import local
+from typing import Any, Callable, Literal
+from weakref import WeakKeyDictionary
+
+from tabularjson.tabular import (
+    TableProfile,
+    get_last_table_profile,
+    get_table_profile,
+    get_table_profile_until,
+    profile_table,
+)
+from tabularjson.types import OutputAsTable, TabularData, Path
+
+# A check tells whether the properties of the rows profiled so far satisfy a
+# predicate. Once a check returns False, it returns False for all next rows too,
+# so the profiling can stop at the first row that does not satisfy it.
+type ProfileCheck = Callable[[TableProfile], bool]
+
+DEFAULT_SAMPLE_ROWS = 100
+DEFAULT_CONFIDENCE = 0.99
+DEFAULT_TOLERANCE = 0.01
+
+# The verifications of sampled predicates against all rows during the stringify
+# call in progress: a thread created when needed, and the submitted verifications
+_verification = local()
 
 
 def always[T](_tabular_data: TabularData[T], _path: Path = None) -> bool:
@@ -8,92 +34,343 @@ def always[T](_tabular_data: TabularData[T], _path: Path = None) -> bool:
 
 
 def no_nested_arrays[T](tabular_data: TabularData[T], _path: Path = None) -> bool:
-    def recurse_object(object: Record) -> bool:
-        for value in object.values():
-            if type(value) is list:
-                return False
+    if get_first_row_profile(tabular_data).has_nested_arrays:
+        return False
 
-            if type(value) is dict and not recurse_object(value):
-                return False
+    return not get_table_profile(tabular_data).has_nested_arrays
 
-        return True
 
-    return all(recurse_object(item) for item in tabular_data)
+def no_nested_tables[T](tabular_data: TabularData[T], _path: Path = None) -> bool:
+    if get_first_row_profile(tabular_data).has_nested_tables:
+        return False
 
+    return not get_table_profile(tabular_data).has_nested_tables
 
-def no_nested_tables[T](tabular_data: TabularData[T], _path: Path = None) -> bool:
-    def recurse(value: Any) -> bool:
-        if is_tabular(value):
-            return False
 
-        if type(value) is list:
-            return all(recurse(item) for item in value)
+def is_homogeneous[T](tabular_data: TabularData[T], _path: Path = None) -> bool:
+    return get_table_profile(tabular_data).is_homogeneous
 
-        if type(value) is dict:
-            return all(recurse(item) for item in value.values())
 
-        return True
+def no_long_strings[T](
+    tabular_data: TabularData[T], _path: Path = None, max_length=24
+) -> bool:
+    if get_first_row_profile(tabular_data).max_string_length > max_length:
+        return False
 
-    return all(recurse(item) for item in tabular_data)
+    return get_table_profile(tabular_data).max_string_length <= max_length
+
+
+# The built-in and combined predicates which do not use the path, with their
+# check of the profile, or None when the predicate depends on other predicates
+_profile_checks: WeakKeyDictionary[Callable, ProfileCheck | None] = WeakKeyDictionary()
+_profile_checks[always] = lambda _profile: True
+_profile_checks[no_nested_arrays] = lambda profile: not profile.has_nested_arrays
+_profile_checks[no_nested_tables] = lambda profile: not profile.has_nested_tables
+_profile_checks[is_homogeneous] = lambda profile: profile.is_homogeneous
+_profile_checks[no_long_strings] = lambda profile: profile.max_string_length <= 24
+
+
+def create_no_long_strings[T](max_length: int = 24) -> OutputAsTable[T]:
+    """
+    Create a function for output_as_table which serializes tabular data as a table
+    when the data does not contain strings longer than max_length.
+
+    Example:
+
+        stringify(data, {"output_as_table": create_no_long_strings(40)})
+    """
+    return create_predicate(lambda profile: profile.max_string_length <= max_length)
+
+
+def all_of[T](*predicates: OutputAsTable[T]) -> OutputAsTable[T]:
+    """
+    Create a function for output_as_table which serializes tabular data as a table
+    when all predicates return True. The built-in predicates are checked together
+    in a single pass over the rows, which stops at the first row not satisfying
+    one of them. Other predicates are called afterwards, until one returns False.
 
+    Example:
 
-def is_homogeneous[T](tabular_data: TabularData[T], _path: Path = None) -> bool:
-    first_item = tabular_data[0]
+        output_as_table = all_of(no_nested_tables, create_no_long_strings(40))
+    """
+    return combine_predicates(predicates, "all")
+
+
+def any_of[T](*predicates: OutputAsTable[T]) -> OutputAsTable[T]:
+    """
+    Create a function for output_as_table which serializes tabular data as a table
+    when at least one of the predicates returns True. The built-in predicates are
+    checked together in a single pass over the rows, which stops as soon as none
+    of them can be satisfied anymore.
+    """
+    return combine_predicates(predicates, "any")
+
+
+def none_of[T](*predicates: OutputAsTable[T]) -> OutputAsTable[T]:
+    """
+    Create a function for output_as_table which serializes tabular data as a table
+    when none of the predicates returns True, the opposite of any_of.
+    """
+    return combine_predicates(predicates, "none")
+
+
+def sampled[T](
+    predicate: OutputAsTable[T],
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    confidence: float = DEFAULT_CONFIDENCE,
+    tolerance: float = DEFAULT_TOLERANCE,
+    seed: int | None = 0,
+    on_mismatch: Callable[[TabularData[T], bool], Any] | None = None,
+) -> OutputAsTable[T]:
+    """
+    Create a function for output_as_table which calls the predicate with a sample
+    of the rows instead of all rows, to decide quickly on the layout of huge
+    tables. The sample contains the first and the last sample_rows rows, and
+    randomly chosen rows in between. There are enough random rows to find, with
+    the given confidence, a row not satisfying the predicate when more than a
+    fraction tolerance of the rows does not satisfy it: 459 rows for the default
+    confidence 0.99 and tolerance 0.01. Tables with fewer rows than the sample
+    are checked completely.
+
+    The outcome is approximate: a table may be written as a table while a few
+    rows do not satisfy the predicate, which still gives valid output. By
+    default the random rows are the same for every run, pass seed None to choose
+    different rows every time.
+
+    When on_mismatch is passed, the predicate is also called with all rows in a
+    background thread while the output is written, and on_mismatch(tabular_data,
+    outcome) is called with the outcome of the sample when the outcomes differ.
+    stringify waits for the verification before returning, so the rows are not
+    kept in memory and not changed meanwhile. Outside stringify, the predicate
+    is called with all rows directly.
+
+    Example:
+
+        output_as_table = sampled(all_of(is_homogeneous, no_long_strings))
+
+    :param predicate: A function for output_as_table like is_homogeneous
+    :param sample_rows: The number of rows at the start and the end of the table
+    :param confidence: The probability to find a violation of the predicate
+    :param tolerance: The fraction of the rows which may violate the predicate
+        without being found with the given confidence
+    :param seed: The seed for choosing the random rows
+    :param on_mismatch: A function called when the predicate gives another
+        outcome for all rows than for the sample
+    :return: Returns a function for output_as_table
+    """
+    if not 0 < confidence < 1 or not 0 < tolerance < 1:
+        raise ValueError("confidence and tolerance must be between 0 and 1")
+
+    random_rows = ceil(log(1 - confidence) / log(1 - tolerance))
+    pass_path = uses_path(predicate)
+
+    def call(tabular_data: TabularData[T], path: Path) -> bool:
+        return bool(
+            predicate(tabular_data, path) if pass_path else predicate(tabular_data)  # type: ignore
+        )
 
-    return all(deep_equal_object_keys(item, first_item) for item in tabular_data)
+    def sampled_predicate(tabular_data: TabularData[T], path: Path = None) -> bool:
+        sample = get_sample(tabular_data, sample_rows, random_rows, seed)
+        outcome = call(sample, path)
+
+        if on_mismatch is not None and sample is not tabular_data:
+
+            def verify():
+                if call(tabular_data, path) != outcome:
+                    on_mismatch(tabular_data, outcome)
+
+            verify_in_background(verify)
+
+        return outcome
+
+    if not pass_path:
+        _profile_checks[sampled_predicate] = None
+
+    return sampled_predicate
+
+
+def get_sample[T](
+    tabular_data: TabularData[T], sample_rows: int, random_rows: int, seed: int | None
+) -> TabularData[T]:
+    """
+    Get the first and last sample_rows rows and random_rows random rows in between,
+    in their original order, or all rows when the table is not larger than that.
+    """
+    count = len(tabular_data)
+    if count <= 2 * sample_rows + random_rows:
+        return tabular_data
+
+    indices = sorted(
+        Random(seed).sample(range(sample_rows, count - sample_rows), random_rows)
+    )
+
+    return (
+        tabular_data[:sample_rows]
+        + [tabular_data[index] for index in indices]
+        + tabular_data[count - sample_rows :]
+    )
+
+
+def begin_verification() -> dict | None:
+    """
+    Start collecting the verifications of sampled predicates until end_verification
+    is called. Returns the previous state, to be passed to end_verification.
+    """
+    previous = getattr(_verification, "scope", None)
+    _verification.scope = {"executor": None, "futures": []}
+
+    return previous
+
+
+def end_verification(previous: dict | None):
+    """
+    Wait until the verifications are done, stop the thread, and restore the
+    previous state. Raises the error of a failed verification, if any.
+    """
+    scope = _verification.scope
+    _verification.scope = previous
 
+    executor: ThreadPoolExecutor | None = scope["executor"]
+    if executor is not None:
+        executor.shutdown()
 
-def deep_equal_keys(a: Any, b: Any) -> bool:
-    if type(a) is dict:
-        if not type(b) is dict or not deep_equal_object_keys(a, b):
-            return False
-    elif type(b) is dict:
-        return False
+        for future in scope["futures"]:
+            future.result()
 
-    if type(a) is list:
-        if not type(b) is list or not deep_equal_array_keys(a, b):
-            return False
-    elif type(b) is list:
-        return False
 
-    # primitive values
-    return True
+def verify_in_background(verify: Callable[[], None]) -> Future | None:
+    """
+    Verify in a background thread while stringifying, or else directly.
+    Returns the future of the verification, or None when verified directly.
+    """
+    scope = getattr(_verification, "scope", None)
+    if scope is None:
+        verify()
+        return None
 
+    if scope["executor"] is None:
+        scope["executor"] = ThreadPoolExecutor(
+            1, thread_name_prefix="tabularjson-verify"
+        )
 
-def deep_equal_object_keys(a: dict[str, Any], b: dict[str, Any]) -> bool:
-    a_keys = a.keys()
-    b_keys = b.keys()
+    future = scope["executor"].submit(verify)
+    scope["futures"].append(future)
 
-    if len(a_keys) != len(b_keys) or any(key not in b for key in a_keys):
-        return False
+    return future
 
-    return all(deep_equal_keys(a[key], b[key]) for key in a_keys)
 
+def create_predicate[T](check: ProfileCheck) -> OutputAsTable[T]:
+    """Create a predicate evaluating a check of the profile with an early exit"""
 
-def deep_equal_array_keys(a: list[Any], b: list[Any]) -> bool:
-    if len(a) != len(b):
-        return False
+    def predicate(tabular_data: TabularData[T], _path: Path = None) -> bool:
+        return evaluate_check(tabular_data, check)
 
-    for i in range(len(a)):
-        if not deep_equal_keys(a[i], b[i]):
-            return False
+    _profile_checks[predicate] = check
 
-    return True
+    return predicate
 
 
-def no_long_strings[T](
-    tabular_data: TabularData[T], _path: Path = None, max_length=24
-) -> bool:
-    def recurse(value: Any) -> bool:
-        if type(value) is dict:
-            return all(recurse(item) for item in value.values())
+def combine_predicates[T](
+    predicates: tuple[OutputAsTable[T], ...], mode: Literal["all", "any", "none"]
+) -> OutputAsTable[T]:
+    checks: list[ProfileCheck] = []
+    others: list[tuple[Callable, bool]] = []
+    for predicate in predicates:
+        check = get_profile_check(predicate)
+
+        if check is not None:
+            checks.append(check)
+        else:
+            others.append((predicate, uses_path(predicate)))
+
+    # Like the checks themselves, the combined check of all_of and any_of
+    # returns False for all next rows once it returned False
+    combined_check: ProfileCheck | None = None
+    if len(checks) > 0:
+        combined_check = (
+            (lambda profile: all(check(profile) for check in checks))
+            if mode == "all"
+            else (lambda profile: any(check(profile) for check in checks))
+        )
+
+    def predicate(tabular_data: TabularData[T], path: Path = None) -> bool:
+        def call(other: Callable, pass_path: bool) -> bool:
+            return bool(other(tabular_data, path) if pass_path else other(tabular_data))
+
+        if mode == "all":
+            return (
+                combined_check is None or evaluate_check(tabular_data, combined_check)
+            ) and all(call(other, pass_path) for other, pass_path in others)
+
+        satisfied = (
+            combined_check is not None and evaluate_check(tabular_data, combined_check)
+        ) or any(call(other, pass_path) for other, pass_path in others)
+
+        return satisfied if mode == "any" else not satisfied
 
-        if type(value) is list:
-            return all(recurse(item) for item in value)
+    if not any(pass_path for _, pass_path in others):
+        _profile_checks[predicate] = (
+            combined_check if len(others) == 0 and mode != "none" else None
+        )
 
-        if type(value) is str:
-            return len(value) <= max_length
+    return predicate
+
+
+def evaluate_check[T](tabular_data: TabularData[T], check: ProfileCheck) -> bool:
+    """
+    Evaluate a check of the profile of tabular data, profiling the rows only until
+    the first row for which the check returns False. The complete profile is
+    shared with stringify and the other predicates.
+    """
+    profile = get_table_profile_until(tabular_data, lambda profile: not check(profile))
+
+    return profile is not None and check(profile)
+
+
+def get_profile_check(predicate: Callable) -> ProfileCheck | None:
+    """Get the check of the profile of a built-in or combined predicate, if any"""
+    try:
+        return _profile_checks.get(predicate)
+    except TypeError:
+        return None
+
+
+def uses_path(output_as_table: OutputAsTable[Any]) -> bool:
+    """
+    Test whether a callback output_as_table(tabular_data, path) has a parameter path.
+    The built-in callbacks do not use the path.
+    """
+    if output_as_table in _profile_checks:
+        return False
 
+    try:
+        parameters = signature(output_as_table).parameters.values()
+    except (TypeError, ValueError):
         return True
 
-    return recurse(tabular_data)
+    positional = list(
+        filter(
+            lambda parameter: (
+                parameter.kind
+                in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+            ),
+            parameters,
+        )
+    )
+
+    return len(positional) >= 2 or any(
+        parameter.kind == Parameter.VAR_POSITIONAL for parameter in parameters
+    )
+
+
+def get_first_row_profile[T](tabular_data: TabularData[T]) -> TableProfile:
+    """
+    Profile only the first row, to return early without profiling all rows when
+    the first row already does not satisfy a property. This is not needed when
+    the complete table is already profiled.
+    """
+    profile = get_last_table_profile(tabular_data)
+    if profile is not None and profile.complete:
+        return profile
+
+    return profile_table(tabular_data[:1])
@@ -1,10 +1,23 @@
-from typing import Any
+from threading import local
+from typing import Any, Callable, Collection
 
+from tabularjson.classes import get_class_fields, get_entries
 from tabularjson.types import Path, Record, Symbol
 
 leaf = Symbol("leaf")
 
 
+# A summary of a list: its shape (see get_shape), whether the list or one of its
+# nested lists is tabular, and the length of the longest string in it
+type ListSummary = tuple[Any, bool, int]
+
+# The summaries of the lists in the data that is being stringified, by the id
+# of the list, together with the list itself so the id cannot be reused. The memo
+# is only active while stringifying (see begin_table_profile), since lists can
+# change in between.
+_list_memo = local()
+
+
 def is_tabular(value: Any) -> bool:
     return (
         type(value) is list
@@ -13,12 +26,103 @@ def is_tabular(value: Any) -> bool:
     )
 
 
+def summarize_list(array: list[Any]) -> ListSummary:
+    """Get the summary of a list, calculated once per list while stringifying"""
+    memo = getattr(_list_memo, "entries", None)
+    entry = memo.get(id(array)) if memo is not None else None
+    if entry is not None:
+        return entry[1]
+
+    has_nested_tables = is_tabular(array)
+    max_string_length = 0
+
+    def summarize_value(value: Any) -> Any:
+        nonlocal has_nested_tables, max_string_length
+
+        if type(value) is str:
+            if len(value) > max_string_length:
+                max_string_length = len(value)
+
+            return None
+
+        if type(value) is list:
+            shape, nested_tables, string_length = summarize_list(value)
+            has_nested_tables = has_nested_tables or nested_tables
+            max_string_length = max(max_string_length, string_length)
+
+            return shape
+
+        if type(value) is dict:
+            return frozenset(
+                (key, summarize_value(item)) for key, item in value.items()
+            )
+
+        return None
+
+    summary = (tuple(map(summarize_value, array)), has_nested_tables, max_string_length)
+    if memo is not None:
+        memo[id(array)] = (array, summary)
+
+    return summary
+
+
 def collect_fields(array: list[Any]) -> list[Path]:
     merged = {}
 
+    # For every merged object, the keys of which the values can still change the
+    # fields: keys without value so far, or with only null values or nested objects.
+    # The fields cannot change anymore for a key with a non-null value.
+    pending: dict[int, list[str]] = {}
+
+    def merge_object(obj: Record, merged: Record):
+        if not obj.keys() <= merged.keys():
+            # the object has new keys
+            pending.pop(id(merged), None)
+
+            for key, value in obj.items():
+                if key not in merged:
+                    merged[key] = {}
+
+                value_merged = merged[key]
+
+                if type(value) is dict:
+                    merge_object(value, value_merged)
+                else:
+                    _merge_value(value, value_merged)
+            return
+
+        keys = pending.get(id(merged))
+        if keys is None:
+            keys = [
+                key
+                for key, value in merged.items()
+                if key is not leaf and value.get(leaf) is not True
+            ]
+            pending[id(merged)] = keys
+
+        if len(keys) == 0:
+            return
+
+        for key in keys:
+            if key in obj:
+                value = obj[key]
+                value_merged = merged[key]
+
+                if type(value) is dict:
+                    merge_object(value, value_merged)
+                elif leaf not in value_merged:
+                    value_merged[leaf] = value is not None
+                    pending.pop(id(merged), None)
+
+    merged_keys = merged.keys()
+
     for item in array:
         if type(item) is dict:
-            _merge_object(item, merged)
+            # skip rows without new keys when the fields cannot change anymore
+            if not pending.get(id(merged), True) and item.keys() <= merged_keys:
+                continue
+
+            merge_object(item, merged)
         else:
             _merge_value(item, merged)
 
@@ -28,6 +132,295 @@ def collect_fields(array: list[Any]) -> list[Path]:
     return paths
 
 
+class TableProfile:
+    """
+    The properties of tabular data, collected in a single pass over all rows:
+    the paths of the fields, whether the rows contain nested arrays or nested
+    tables, the length of the longest string, and whether all rows have the
+    same structure. An incomplete profile contains only the fields.
+    """
+
+    def __init__(
+        self,
+        fields: list[Path],
+        complete: bool = False,
+        has_nested_arrays: bool = False,
+        has_nested_tables: bool = False,
+        max_string_length: int = 0,
+        is_homogeneous: bool = False,
+    ):
+        self.fields = fields
+        self.complete = complete
+        self.has_nested_arrays = has_nested_arrays
+        self.has_nested_tables = has_nested_tables
+        self.max_string_length = max_string_length
+        self.is_homogeneous = is_homogeneous
+
+
+def profile_table(array: list[Any], complete: bool = True) -> TableProfile:
+    """
+    Collect the properties of tabular data in a single pass over the rows.
+    When complete is False, only the fields are collected.
+    """
+    if not complete:
+        return TableProfile(collect_fields(array))
+
+    return _profile_rows(array, None)[0]
+
+
+def _profile_rows(
+    array: list[Any], stop: Callable[[TableProfile], bool] | None
+) -> tuple[TableProfile, bool]:
+    """
+    Profile the rows of tabular data. The function stop is called after every
+    row with the properties of the rows so far, and when it returns True, the
+    profiling stops and a tuple (profile without fields, True) is returned.
+    """
+    progress = TableProfile([], True)
+    merged = {}
+    has_nested_arrays = False
+    has_nested_tables = False
+    max_string_length = 0
+    is_homogeneous = True
+
+    # Every object is compared with the object at the same path in the first row
+    # to determine whether the rows are homogeneous. When they differ, first is None
+    def profile_object(obj: Record, merged: Record, first: Record | None):
+        nonlocal has_nested_arrays, max_string_length, is_homogeneous
+
+        if first is not None and obj.keys() != first.keys():
+            is_homogeneous = False
+            first = None
+
+        for key, value in obj.items():
+            if key not in merged:
+                merged[key] = {}
+
+            value_merged = merged[key]
+            first_value = first[key] if first is not None else None
+
+            if type(value) is dict:
+                if first is not None and type(first_value) is not dict:
+                    is_homogeneous = False
+
+                profile_object(
+                    value,
+                    value_merged,
+                    first_value if type(first_value) is dict else None,
+                )
+                continue
+
+            if leaf not in value_merged:
+                _merge_value(value, value_merged)
+
+            if type(value) is str:
+                if len(value) > max_string_length:
+                    max_string_length = len(value)
+            elif type(value) is list:
+                has_nested_arrays = True
+                shape = profile_value(value)
+
+                if first is not None and shape != get_shape(first_value):
+                    is_homogeneous = False
+                continue
+
+            if first is not None and (
+                type(first_value) is dict or type(first_value) is list
+            ):
+                is_homogeneous = False
+
+    def profile_value(value: Any) -> Any:
+        nonlocal has_nested_tables, max_string_length
+
+        if type(value) is str:
+            if len(value) > max_string_length:
+                max_string_length = len(value)
+
+            return None
+
+        if type(value) is list:
+            shape, nested_tables, string_length = summarize_list(value)
+            has_nested_tables = has_nested_tables or nested_tables
+            max_string_length = max(max_string_length, string_length)
+
+            return shape
+
+        if type(value) is dict:
+            return frozenset((key, profile_value(item)) for key, item in value.items())
+
+        return None
+
+    first_row: Record | None = None
+    last_state = None
+
+    for index, item in enumerate(array):
+        if type(item) is not dict:
+            # an object of a class like a dataclass is profiled like a dict
+            item = get_record(item)
+
+        if index == 0 and type(item) is dict:
+            first_row = item
+
+        if type(item) is dict:
+            profile_object(item, merged, first_row if index > 0 else None)
+        else:
+            is_homogeneous = False
+            _merge_value(item, merged)
+            profile_value(item)
+
+        if stop is not None:
+            # the result of stop can only change when one of the properties changed
+            state = (
+                has_nested_arrays,
+                has_nested_tables,
+                max_string_length,
+                is_homogeneous,
+            )
+            if state != last_state:
+                last_state = state
+                (
+                    progress.has_nested_arrays,
+                    progress.has_nested_tables,
+                    progress.max_string_length,
+                    progress.is_homogeneous,
+                ) = state
+
+                if stop(progress):
+                    return progress, True
+
+    fields = []
+    _collect_paths(merged, [], fields)
+
+    profile = TableProfile(
+        fields,
+        True,
+        has_nested_arrays,
+        has_nested_tables,
+        max_string_length,
+        is_homogeneous,
+    )
+
+    return profile, False
+
+
+def get_record(item: Any) -> Any:
+    """
+    Get the keys and values of an object of a class like a dataclass as a dict,
+    or the item itself when it is not such an object. The slotted_classes passed
+    to begin_table_profile are supported too.
+    """
+    cls = type(item)
+    slotted_classes = getattr(_last_profile, "slotted_classes", ())
+    fields = get_class_fields(cls, cls in slotted_classes)
+
+    return dict(get_entries(item, fields)) if fields is not None else item
+
+
+def get_shape(value: Any) -> Any:
+    """
+    Get the shape of a value, describing its keys and nested keys: a frozenset of
+    (key, shape) pairs for an object, a tuple with shapes for an array, and None
+    for a primitive value. Values with equal shapes have the same (nested) keys.
+    """
+    if type(value) is list:
+        return summarize_list(value)[0]
+
+    if type(value) is dict:
+        return frozenset((key, get_shape(item)) for key, item in value.items())
+
+    return None
+
+
+# The most recently profiled table, so the profile can be shared by the
+# output_as_table predicates and stringify when deciding on and writing a table.
+# The profile is only shared while stringifying, since tables can change in between.
+_last_profile = local()
+
+
+def begin_table_profile(
+    memoize: bool = False, slotted_classes: Collection[type] = ()
+) -> tuple:
+    """
+    Start sharing the profile of the most recently profiled table until
+    end_table_profile is called. When memoize is True, the summaries of lists
+    are remembered by their identity too, so nested lists are not scanned again
+    for every level of nesting. Rows which are objects of the slotted_classes
+    are profiled by their slots. Returns the previous state, to be passed to
+    end_table_profile, so stringify can be called from an output_as_table callback.
+    """
+    previous = (
+        getattr(_last_profile, "active", False),
+        getattr(_last_profile, "entry", None),
+        getattr(_last_profile, "slotted_classes", ()),
+        getattr(_list_memo, "entries", None),
+    )
+
+    _last_profile.active = True
+    _last_profile.entry = None
+    _last_profile.slotted_classes = slotted_classes
+    _list_memo.entries = {} if memoize else None
+
+    return previous
+
+
+def end_table_profile(previous: tuple):
+    """Release the shared profile and the lists, and restore the previous state"""
+    (
+        _last_profile.active,
+        _last_profile.entry,
+        _last_profile.slotted_classes,
+        _list_memo.entries,
+    ) = previous
+
+
+def get_table_profile(array: list[Any], complete: bool = True) -> TableProfile:
+    """
+    Get the profile of tabular data, reusing the profile when it is the table
+    which was profiled most recently while stringifying.
+    """
+    last = get_last_table_profile(array)
+    if last is not None and (last.complete or not complete):
+        return last
+
+    profile = profile_table(array, complete)
+    set_last_table_profile(array, profile)
+
+    return profile
+
+
+def get_table_profile_until(
+    array: list[Any], stop: Callable[[TableProfile], bool]
+) -> TableProfile | None:
+    """
+    Get the complete profile of tabular data like get_table_profile, but stop
+    profiling as soon as stop(profile) returns True for the rows profiled so far,
+    and return None in that case.
+    """
+    last = get_last_table_profile(array)
+    if last is not None and last.complete:
+        return last
+
+    profile, stopped = _profile_rows(array, stop)
+    if stopped:
+        return None
+
+    set_last_table_profile(array, profile)
+
+    return profile
+
+
+def get_last_table_profile(array: list[Any]) -> TableProfile | None:
+    """Get the profile of tabular data when it is the table profiled most recently"""
+    last = getattr(_last_profile, "entry", None)
+
+    return last[1] if last is not None and last[0] is array else None
+
+
+def set_last_table_profile(array: list[Any], profile: TableProfile):
+    if getattr(_last_profile, "active", False):
+        _last_profile.entry = (array, profile)
+
+
 def _merge_object(obj: Record, merged: Record):
     for key, value in obj.items():
         if key not in merged:
@@ -59,4 +452,4 @@ def _collect_paths(merged: Record, parent_path: Path, paths: list[Path]):
 
 
 def is_empty(obj: Record) -> bool:
-    return len(list(filter(lambda key: key != leaf, obj.keys()))) == 0
+    return len(obj) == (1 if leaf in obj else 0)
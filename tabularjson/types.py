@@ -1,4 +1,20 @@
-from typing import Generic, TypeVar, TypedDict, NotRequired, Any, Callable, Optional
+from typing import (
+    TYPE_CHECKING,
+    Generic,
+    TypeVar,
+    TypedDict,
+    NotRequired,
+    Any,
+    Callable,
+    Collection,
+    Literal,
+    Optional,
+    Sequence,
+)
+
+if TYPE_CHECKING:
+    from tabularjson.cache import StringifyCache
+    from tabularjson.stats import TableStats
 
 type Path = list[str | int]
 
@@ -8,13 +24,73 @@ type NonEmptyList[T] = list[T]
 
 type TabularData[T] = NonEmptyList[dict[str, T]]
 
-type OutputAsTable[T] = Callable[[TabularData[T], Path], bool]
+type OutputAsTable[T] = (
+    Callable[[TabularData[T], Path], bool] | Callable[[TabularData[T]], bool]
+)
+
+
+# The widths of the columns of an indented table: calculated from all rows ("exact"),
+# calculated from all rows without keeping them in memory ("two_pass"), calculated
+# from the first rows ("sample"), or a list with the width of every column
+type ColumnWidths = Literal["exact", "two_pass", "sample"] | list[int]
+
+
+# The fields of a table: a list with keys like "name" and paths like ["address", "city"]
+type TableFields = list[str | Path]
+
+type TableFieldsOption[T] = (
+    TableFields
+    | Callable[[TabularData[T], Path], TableFields | None]
+    | Callable[[TabularData[T]], TableFields | None]
+)
 
 
 class StringifyOptions(TypedDict, Generic[T]):
     indentation: NotRequired[str | int | None]
     trailing_commas: NotRequired[bool]
     output_as_table: NotRequired[OutputAsTable[T]]
+    column_widths: NotRequired[ColumnWidths]
+    sample_rows: NotRequired[int]
+    max_column_width: NotRequired[int | None]
+    cache_output_as_table: NotRequired[bool]
+    fields: NotRequired[TableFieldsOption[T]]
+    strict_fields: NotRequired[bool]
+    default: NotRequired[Callable[[Any], Any]]
+    slotted_classes: NotRequired[Collection[type]]
+    cache: NotRequired["StringifyCache"]
+
+
+class TableRowError(TypedDict):
+    # index of the row in the table
+    row: int
+    # character position of the start of the row
+    position: int
+    # byte offset of the start of the row in the UTF-8 encoded text
+    offset: int
+    message: str
+    # the text of the invalid row
+    text: str
+
+
+class ParseOptions(TypedDict):
+    stats: NotRequired["TableStats"]
+    on_error: NotRequired[Callable[[TableRowError], None]]
+    max_errors: NotRequired[int | None]
+
+
+type FsyncPolicy = Literal["never", "flush", "close"]
+
+
+class AppendOptions(StringifyOptions[T]):
+    buffer_size: NotRequired[int]
+    fsync: NotRequired[FsyncPolicy]
+
+
+class TableWriterOptions(StringifyOptions[T]):
+    widths: NotRequired[list[int]]
+    nested: NotRequired[bool]
+    indent: NotRequired[str]
+    buffer_size: NotRequired[int]
 
 
 class Symbol(object):
@@ -26,6 +102,13 @@ type Record = dict[str, Any | Record]
 
 type SetValue = Callable[[Record, Any], None]
 type GetValue = Callable[[Record], tuple[Any, bool]]
+type GetValues = Callable[[Record], Sequence[Any]]
+
+type Write = Callable[[str], Any]
+
+
+# Parse result is a tuple (parsed, value)
+type ParseResult = tuple[bool, Any]
 
 
 class TableFieldSetter(TypedDict):
@@ -33,11 +116,47 @@ class TableFieldSetter(TypedDict):
     set_value: SetValue
 
 
+class TableHeader(TypedDict):
+    fields: list[TableFieldSetter]
+    # the start position of every field in the text
+    starts: list[int]
+    # the position right after the last field
+    end: int
+
+
+class ParseNode(TypedDict):
+    # "object", "array", "table", or "row"
+    kind: str
+    start: int
+    end: int
+    # the key or index of the node in its parent, or the path of a table field
+    key: str | int | list[str] | None
+    value: Any
+    children: list["ParseNode"]
+    # for tables: the fields of the header, and the length of the closing ")"
+    fields: NotRequired[list[TableFieldSetter]]
+    closing: NotRequired[int]
+
+
+class Parser(TypedDict):
+    parse: Callable[[], Any]
+    scan: Callable[[], None]
+    parse_header: Callable[[bool], TableHeader | None]
+    parse_nodes: Callable[[], tuple[Any, list[ParseNode]]]
+    parse_element_at: Callable[[int], tuple[ParseResult, ParseNode | None]]
+    parse_table_rows_at: Callable[[int, int, list[TableFieldSetter]], list[ParseNode]]
+
+
 class TableFieldGetter(TypedDict):
     name: str
     path: Path
     get_value: GetValue
 
 
-# Parse result is a tuple (parsed, value)
-type ParseResult = tuple[bool, Any]
+class Writer(TypedDict):
+    write_value: Callable[[Any, str, bool], None]
+    is_output_as_table: Callable[[list[Any]], bool]
+    resolve_table_fields: Callable[[list[Any]], list[TableFieldGetter]]
+    stringify_table_rows: Callable[
+        [list[Any], list[TableFieldGetter], int], list[list[str]]
+    ]
@@ -0,0 +1,134 @@
+from typing import IO, Any, Iterable
+
+from tabularjson.stringify import (
+    DEFAULT_BUFFER_SIZE,
+    MISSING,
+    create_buffered_write,
+    create_get_values,
+    create_stringify_value,
+    create_table_fields,
+    format_row,
+    get_field_paths,
+    resolve_indentation,
+    validate_row,
+)
+from tabularjson.types import Path, TableWriterOptions
+
+
+class TableWriter:
+    """
+    Write a table row by row, for example rows generated from a database cursor.
+    Every row is written as soon as it arrives, so the memory usage does not
+    depend on the number of rows. Since the rows are not known in advance, the
+    fields of the table must be passed, and the rows are validated against them.
+
+    Example:
+
+        with open("friends.tjson", "w", encoding="utf-8") as fp:
+            with TableWriter(fp, ["id", "name", ["address", "city"]]) as writer:
+                writer.write_row({"id": 1, "name": "Joe"})
+                writer.write_rows(rows)
+
+    By default, a root table is written. With the option nested, the table is
+    enclosed in parentheses, so it can be written as a value inside a document
+    that is written to the same file. The option indent is the indentation of the
+    line where the nested table starts.
+
+    :param fp: A file opened in text mode, or any other object with a method write
+    :param fields: The fields of the table. A field is a key, or the path to a
+        nested value like ["address", "city"]
+    :param options: A dict with indentation, widths, nested, indent and buffer_size.
+        When indentation is set, the cells are padded to the width of the column,
+        which is the width of the field name, or the width passed via widths.
+    """
+
+    def __init__(
+        self,
+        fp: IO[str],
+        fields: list[str | Path],
+        options: TableWriterOptions | None = None,
+    ):
+        self.options: TableWriterOptions = options or {}
+        self.fields = create_table_fields(fields)
+        self.field_paths, self.field_prefixes = get_field_paths(self.fields)
+        self.get_values = create_get_values(self.fields)
+        self.nested = self.options.get("nested") or False
+        self.indent = self.options.get("indent") or ""
+
+        indentation = resolve_indentation(self.options.get("indentation"))
+        self.do_indent = indentation != ""
+        self.child_indent = (
+            self.indent + indentation if self.nested and self.do_indent else self.indent
+        )
+
+        header = list(map(lambda field: field["name"], self.fields))
+        widths = self.options.get("widths") or []
+        self.widths = [
+            max(len(name), widths[i] if i < len(widths) else 0) + 2
+            for i, name in enumerate(header)
+        ]
+
+        self.fp = fp
+        self.closed = False
+        self.stringify_value = create_stringify_value(self.options)
+        self.write, self.flush = create_buffered_write(
+            fp.write, self.options.get("buffer_size") or DEFAULT_BUFFER_SIZE
+        )
+
+        if self.nested:
+            self.write("(\n")
+        self.write_line(header)
+
+    def write_row(self, row: dict[str, Any]):
+        """Write a single row to the table"""
+        if self.closed:
+            raise ValueError("Cannot write to a closed TableWriter")
+
+        if type(row) is not dict:
+            raise TypeError("Row must be a dict, got " + str(type(row)))
+
+        validate_row(row, self.field_paths, self.field_prefixes)
+
+        self.write_line(
+            [
+                self.stringify_value(value, self.child_indent, False)
+                if value is not MISSING
+                else ""
+                for value in self.get_values(row)
+            ]
+        )
+
+    def write_rows(self, rows: Iterable[dict[str, Any]]):
+        """Write all rows of an iterable, like a list or a generator, to the table"""
+        for row in rows:
+            self.write_row(row)
+
+    def close(self):
+        """
+        Finish the table and write all buffered output. The file itself is not
+        closed, so more data can be written after a nested table.
+        """
+        if self.closed:
+            return
+
+        if self.nested:
+            self.write(self.indent + ")")
+
+        self.flush()
+        self.closed = True
+
+    def write_line(self, cells: list[str]):
+        self.write(
+            self.child_indent
+            + (
+                format_row(cells, self.widths)
+                if self.do_indent
+                else ",".join(cells) + "\n"
+            )
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+
+from tabularjson import TableAppender, parse, stringify
+
+
+class TableAppenderTestCase(unittest.TestCase):
+    data = [
+        {"id": 1, "name": "Joe", "address": {"city": "Rotterdam"}},
+        {"id": 2, "name": "Sarah", "address": {"city": "New York"}},
+    ]
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.dir.name, "table.tjson")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, text: str):
+        with open(self.file, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self) -> str:
+        with open(self.file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_append_compact(self):
+        self.write(stringify(self.data))
+
+        with TableAppender(self.file) as appender:
+            appender.append({"id": 3, "name": "Alan", "address": {"city": "Paris"}})
+            appender.append_rows([{"id": 4, "name": "Emma"}, {"id": 5}])
+
+        self.assertEqual(
+            self.read(),
+            '"id","name","address"."city"\n'
+            + '1,"Joe","Rotterdam"\n'
+            + '2,"Sarah","New York"\n'
+            + '3,"Alan","Paris"\n'
+            + '4,"Emma",\n'
+            + "5,,\n",
+        )
+
+    def test_append_fixed_width(self):
+        self.write(stringify(self.data, {"indentation": 2}))
+
+        with TableAppender(self.file, {"indentation": 2}) as appender:
+            appender.append({"id": 3, "name": "Alan", "address": {"city": "Paris"}})
+
+        expected = self.data + [{"id": 3, "name": "Alan", "address": {"city": "Paris"}}]
+        self.assertEqual(self.read(), stringify(expected, {"indentation": 2}))
+
+    def test_append_nested_values(self):
+        self.write('"id","details"\n1,{"a":2}\n')
+
+        with TableAppender(self.file) as appender:
+            appender.append({"id": 2, "details": {"scores": [1, 2]}})
+            appender.append({"id": 3, "details": [{"x": 1}]})
+
+        self.assertEqual(
+            parse(self.read()),
+            [
+                {"id": 1, "details": {"a": 2}},
+                {"id": 2, "details": {"scores": [1, 2]}},
+                {"id": 3, "details": [{"x": 1}]},
+            ],
+        )
+
+    def test_append_without_trailing_newline(self):
+        self.write('"id","name"\n1,"Joe"')
+
+        with TableAppender(self.file) as appender:
+            appender.append({"id": 2, "name": "Sarah"})
+
+        self.assertEqual(self.read(), '"id","name"\n1,"Joe"\n2,"Sarah"\n')
+
+    def test_buffering(self):
+        self.write('"id","name"\n')
+
+        appender = TableAppender(self.file, {"buffer_size": 1024})
+        appender.append({"id": 1, "name": "Joe"})
+        self.assertEqual(self.read(), '"id","name"\n')
+
+        appender.flush()
+        self.assertEqual(self.read(), '"id","name"\n1,"Joe"\n')
+
+        appender.append({"id": 2, "name": "Sarah"})
+        appender.close()
+        self.assertEqual(self.read(), '"id","name"\n1,"Joe"\n2,"Sarah"\n')
+
+    def test_validate_rows(self):
+        self.write(stringify(self.data))
+
+        with TableAppender(self.file) as appender:
+            self.assertRaisesRegex(
+                ValueError,
+                'Field "age" does not exist in the table header',
+                lambda: appender.append({"id": 3, "age": 42}),
+            )
+            self.assertRaisesRegex(
+                ValueError,
+                'Field "address"."zip" does not exist in the table header',
+                lambda: appender.append({"id": 3, "address": {"zip": "1234"}}),
+            )
+            self.assertRaisesRegex(
+                ValueError,
+                'Field "address" does not exist in the table header',
+                lambda: appender.append({"id": 3, "address": "Paris"}),
+            )
+            self.assertRaises(TypeError, lambda: appender.append([1, 2]))
+
+        self.assertEqual(self.read(), stringify(self.data))
+
+    def test_no_root_table(self):
+        self.write('{"id":1}')
+
+        self.assertRaisesRegex(
+            ValueError,
+            "File does not contain a root table",
+            lambda: TableAppender(self.file),
+        )
+
+    def test_missing_file(self):
+        self.assertRaises(FileNotFoundError, lambda: TableAppender(self.file))
+        self.assertFalse(os.path.exists(self.file))
+
+    def test_empty_file(self):
+        self.write("")
+
+        self.assertRaisesRegex(
+            ValueError,
+            "File does not contain a root table",
+            lambda: TableAppender(self.file),
+        )
+        self.assertEqual(self.read(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import json
+import math
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from os import path
+
+from benchmarks.__main__ import main
+from benchmarks.cases import create_cases
+from benchmarks.harness import compare_reports
+from benchmarks.memory import MB, check_budgets, run_memory_benchmarks
+from tabularjson import parse
+
+
+class BenchmarksTestCase(unittest.TestCase):
+    def create_report(self, seconds: float, ratio: float):
+        return {
+            "results": [
+                {
+                    "case": "tall_table",
+                    "operation": "parse",
+                    "seconds": seconds,
+                    "median": seconds,
+                    "json_seconds": seconds / ratio,
+                    "ratio": ratio,
+                }
+            ]
+        }
+
+    def test_cases(self):
+        for case in create_cases(0.01):
+            with self.subTest(case=case["name"]):
+                self.assertGreater(len(case["data"]), 0)
+                self.assertEqual(len(case["text"]), len(case["json_text"]))
+
+                # the micro cases of the test-suite contain values like -0.0
+                # and empty nested objects that are not preserved exactly
+                if case["name"].startswith("test_suite"):
+                    continue
+
+                # the Tabular-JSON and the JSON text contain the same data
+                for text, json_text in zip(case["text"], case["json_text"]):
+                    self.assertEqual(
+                        json.dumps(parse(text), sort_keys=True),
+                        json.dumps(json.loads(json_text), sort_keys=True),
+                    )
+
+    def test_compare_reports(self):
+        baseline = self.create_report(1.0, 20)
+
+        self.assertEqual(compare_reports(baseline, self.create_report(1.05, 21)), [])
+
+        regressions = compare_reports(baseline, self.create_report(1.0, 25))
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]["key"], "tall_table.parse")
+        self.assertTrue(math.isclose(regressions[0]["change"], 0.25))
+
+        # a slower machine is no regression when comparing the ratio
+        self.assertEqual(compare_reports(baseline, self.create_report(2.0, 20)), [])
+        self.assertEqual(
+            len(compare_reports(baseline, self.create_report(2.0, 20), 0.1, "seconds")),
+            1,
+        )
+        self.assertEqual(compare_reports(baseline, {"results": []}), [])
+
+    def test_compare_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_file = path.join(directory, "baseline.json")
+            current_file = path.join(directory, "current.json")
+
+            with open(baseline_file, "w", encoding="utf-8") as fp:
+                json.dump(self.create_report(1.0, 20), fp)
+            with open(current_file, "w", encoding="utf-8") as fp:
+                json.dump(self.create_report(1.0, 30), fp)
+
+            with redirect_stdout(StringIO()) as output:
+                self.assertEqual(main(["compare", baseline_file, current_file]), 1)
+                self.assertEqual(
+                    main(
+                        ["compare", baseline_file, baseline_file, "--threshold", "0.2"]
+                    ),
+                    0,
+                )
+
+            self.assertIn("REGRESSION tall_table.parse", output.getvalue())
+
+    def test_memory_benchmarks(self):
+        cases = list(
+            filter(lambda case: case["name"] == "tall_table", create_cases(0.01))
+        )
+        report = run_memory_benchmarks(cases, isolate=False)
+
+        operations = list(map(lambda result: result["operation"], report["results"]))
+        self.assertIn("parse", operations)
+        self.assertIn("stringify_to", operations)
+        self.assertIn("columns", operations)
+        self.assertIn("collect_stats", operations)
+
+        for result in report["results"]:
+            with self.subTest(operation=result["operation"]):
+                self.assertGreater(result["input_bytes"], 0)
+                self.assertGreater(result["peak_bytes"], 0)
+                self.assertTrue(
+                    math.isclose(
+                        result["peak_per_mb"],
+                        result["peak_bytes"] / result["input_bytes"] * MB,
+                    )
+                )
+
+    def test_memory_benchmarks_isolated(self):
+        cases = list(filter(lambda case: case["name"] == "unicode", create_cases(0.01)))
+        report = run_memory_benchmarks(cases)
+
+        self.assertGreater(len(report["results"]), 0)
+        self.assertTrue(all(result["peak_bytes"] > 0 for result in report["results"]))
+
+    def test_check_budgets(self):
+        def create_result(case: str, operation: str, peak_per_mb: float):
+            return {
+                "case": case,
+                "operation": operation,
+                "peak_per_mb": peak_per_mb,
+                "rss_per_mb": None,
+            }
+
+        report = {
+            "results": [
+                create_result("tall_table", "parse", 10 * MB),
+                create_result("tall_table", "stringify", 3 * MB),
+                create_result("nested_table", "parse", 20 * MB),
+                create_result("test_suite_parse", "parse", 200 * MB),
+            ]
+        }
+
+        budgets = {
+            "peak_per_mb": {
+                "*": 2 * MB,
+                "parse": 16 * MB,
+                "nested_table.parse": 24 * MB,
+                "test_suite_parse": None,
+            },
+            "rss_per_mb": {"*": 1 * MB},
+        }
+
+        violations = check_budgets(report, budgets)
+        self.assertEqual(
+            violations,
+            [
+                {
+                    "key": "tall_table.stringify",
+                    "metric": "peak_per_mb",
+                    "value": 3 * MB,
+                    "budget": 2 * MB,
+                }
+            ],
+        )
+
+        budgets["peak_per_mb"]["nested_table.parse"] = 16 * MB
+        self.assertEqual(
+            list(
+                map(lambda violation: violation["key"], check_budgets(report, budgets))
+            ),
+            ["tall_table.stringify", "nested_table.parse"],
+        )
+        self.assertEqual(check_budgets(report, {}), [])
+
+    def test_memory_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            budgets_file = path.join(directory, "budgets.json")
+            output_file = path.join(directory, "memory.json")
+
+            with open(budgets_file, "w", encoding="utf-8") as fp:
+                json.dump({"peak_per_mb": {"stringify": 1}}, fp)
+
+            args = ["memory", "--filter", "tall_table", "--scale", "0.01"]
+            with redirect_stdout(StringIO()) as output:
+                self.assertEqual(
+                    main(args + ["--budgets", budgets_file, "--output", output_file]),
+                    1,
+                )
+                self.assertEqual(main(args + ["--budgets", ""]), 0)
+
+            self.assertIn("OVER BUDGET tall_table.stringify", output.getvalue())
+
+            with open(output_file, "r", encoding="utf-8") as fp:
+                self.assertGreater(len(json.load(fp)["results"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from tabularjson import Frozen, StringifyCache, stringify
+
+catalog = [{"id": i, "name": f"product {i}", "tags": ["a", "b"]} for i in range(10)]
+
+
+class StringifyCacheTestCase(unittest.TestCase):
+    def test_without_cache(self):
+        self.assertEqual(
+            stringify({"catalog": Frozen(catalog)}), stringify({"catalog": catalog})
+        )
+        self.assertEqual(stringify(Frozen(catalog)), stringify(catalog))
+
+    def test_reuse_output(self):
+        cache = StringifyCache()
+
+        for options in [
+            {},
+            {"indentation": 2},
+            {"indentation": 2, "trailing_commas": True},
+        ]:
+            for request in range(3):
+                data = {"request": request, "catalog": Frozen(catalog, 1)}
+                expected = stringify({"request": request, "catalog": catalog}, options)
+
+                self.assertEqual(stringify(data, {**options, "cache": cache}), expected)
+
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 6)
+        self.assertEqual(len(cache.entries), 3)
+
+    def test_root_and_nested(self):
+        cache = StringifyCache()
+        frozen = Frozen(catalog)
+
+        self.assertEqual(stringify(frozen, {"cache": cache}), stringify(catalog))
+        self.assertEqual(
+            stringify([{"catalog": frozen}], {"cache": cache}),
+            stringify([{"catalog": catalog}]),
+        )
+        self.assertEqual(stringify(frozen, {"cache": cache}), stringify(catalog))
+        self.assertEqual(cache.hits, 1)
+
+    def test_version(self):
+        cache = StringifyCache()
+        data = [{"id": 1}]
+
+        self.assertEqual(stringify(Frozen(data, 1), {"cache": cache}), '"id"\n1\n')
+
+        data[0]["id"] = 2
+        self.assertEqual(stringify(Frozen(data, 1), {"cache": cache}), '"id"\n1\n')
+        self.assertEqual(stringify(Frozen(data, 2), {"cache": cache}), '"id"\n2\n')
+
+    def test_path(self):
+        cache = StringifyCache()
+        frozen = Frozen(catalog)
+        data = {"a": frozen, "b": frozen}
+
+        def output_as_table(tabular_data, path):
+            return path == ["a"]
+
+        options = {"output_as_table": output_as_table}
+
+        self.assertEqual(
+            stringify(data, {**options, "cache": cache}),
+            stringify({"a": catalog, "b": catalog}, options),
+        )
+        self.assertEqual(cache.hits, 0)
+
+    def test_eviction(self):
+        cache = StringifyCache(max_size=20)
+
+        stringify(Frozen([1, 2, 3]), {"cache": cache})  # 7 characters
+        stringify(Frozen([4, 5, 6]), {"cache": cache})
+        stringify(Frozen([7, 8, 9]), {"cache": cache})  # drops [1,2,3]
+        stringify(Frozen(list(range(100))), {"cache": cache})  # too large
+
+        self.assertEqual(cache.size, 14)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache.entries), 2)
+
+        cache.clear()
+        self.assertEqual(
+            (cache.size, cache.hits, cache.misses, cache.evictions), (0, 0, 0, 0)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+import unittest
+from dataclasses import dataclass, field
+from datetime import date
+from fractions import Fraction
+from ipaddress import IPv4Address
+from pathlib import PurePosixPath
+from typing import NamedTuple
+from uuid import UUID
+
+from tabularjson import StringifyOptions, parse, stringify
+from tabularjson.classes import get_class_fields
+
+
+@dataclass
+class Address:
+    city: str
+
+
+@dataclass
+class User:
+    id: int
+    name: str
+    address: Address
+    tags: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Location:
+    city: str
+    zip: str
+
+
+@dataclass
+class Person:
+    id: int
+    address: Location
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Slotted:
+    __slots__ = ("id", "name")
+
+    def __init__(self, id, name=None):
+        self.id = id
+        if name is not None:
+            self.name = name
+
+
+class ClassesTestCase(unittest.TestCase):
+    def test_dataclass(self):
+        user = User(1, "Joe", Address("Rotterdam"), ["a"])
+
+        self.assertEqual(
+            stringify(user),
+            stringify(
+                {
+                    "id": 1,
+                    "name": "Joe",
+                    "address": {"city": "Rotterdam"},
+                    "tags": ["a"],
+                }
+            ),
+        )
+
+    def test_namedtuple(self):
+        self.assertEqual(stringify(Point(1, 2)), '{"x":1,"y":2}')
+        self.assertEqual(stringify({"p": Point(1, 2)}), '{"p":{"x":1,"y":2}}')
+
+    def test_slots(self):
+        options: StringifyOptions = {"slotted_classes": [Slotted]}
+        self.assertEqual(stringify(Slotted(1, "Joe"), options), '{"id":1,"name":"Joe"}')
+
+        # unset slots are left out
+        self.assertEqual(stringify(Slotted(2), options), '{"id":2}')
+
+        # the slots are only used for the slotted_classes
+        self.assertRaisesRegex(
+            TypeError, "Unknown type of data", lambda: stringify(Slotted(1))
+        )
+
+    def test_slots_of_standard_classes(self):
+        data = {
+            "id": UUID(int=5),
+            "path": PurePosixPath("/tmp/data.json"),
+            "ratio": Fraction(1, 3),
+            "ip": IPv4Address("1.2.3.4"),
+        }
+
+        self.assertEqual(
+            stringify(data, {"default": str}),
+            '{"id":"00000000-0000-0000-0000-000000000005",'
+            '"path":"/tmp/data.json","ratio":"1/3","ip":"1.2.3.4"}',
+        )
+        self.assertEqual(
+            stringify([UUID(int=5)], {"default": str}),
+            '["00000000-0000-0000-0000-000000000005"]',
+        )
+        self.assertRaisesRegex(
+            TypeError, "Unknown type of data", lambda: stringify({"id": UUID(int=5)})
+        )
+
+    def test_table(self):
+        users = [
+            User(1, "Joe", Address("Rotterdam")),
+            User(2, "Sarah", Address("Utrecht"), ["a", "b"]),
+        ]
+
+        self.assertEqual(
+            stringify(users),
+            '"id","name","address","tags"\n'
+            '1,"Joe",{"city":"Rotterdam"},[]\n'
+            '2,"Sarah",{"city":"Utrecht"},["a","b"]\n',
+        )
+        self.assertEqual(
+            stringify({"points": [Point(1, 2), Point(3, 4)]}, {"indentation": 2}),
+            '{\n  "points": (\n    "x", "y"\n    1,   2\n    3,   4\n  )\n}',
+        )
+        self.assertEqual(
+            parse(
+                stringify(
+                    [Slotted(1, "Joe"), Slotted(2)], {"slotted_classes": [Slotted]}
+                )
+            ),
+            [{"id": 1, "name": "Joe"}, {"id": 2}],
+        )
+
+        # objects of different classes are not a table
+        self.assertEqual(
+            stringify([Point(1, 2), Address("Rotterdam")]),
+            '[{"x":1,"y":2},{"city":"Rotterdam"}]',
+        )
+
+    def test_table_output_as_table(self):
+        points = [Point(1, 2), Point(3, 4)]
+
+        self.assertEqual(
+            stringify(points, {"output_as_table": lambda _tabular_data: False}),
+            '[{"x":1,"y":2},{"x":3,"y":4}]',
+        )
+        self.assertEqual(
+            stringify(
+                {"points": points, "other": [{"x": 5}]},
+                {"output_as_table": lambda _tabular_data, path: path == ["points"]},
+            ),
+            '{"points":(\n"x","y"\n1,2\n3,4\n),"other":[{"x":5}]}',
+        )
+
+    def test_table_fields(self):
+        users = [
+            User(1, "Joe", Address("Rotterdam")),
+            User(2, "Sarah", Address("Utrecht"), ["a", "b"]),
+        ]
+
+        self.assertEqual(
+            stringify(users, {"fields": ["name", "id"]}),
+            '"name","id"\n"Joe",1\n"Sarah",2\n',
+        )
+        self.assertEqual(
+            stringify(
+                [Point(1, {"z": 2}), Point(3, {"z": 4})],
+                {"fields": ["x", ["y", "z"]]},
+            ),
+            '"x","y"."z"\n1,2\n3,4\n',
+        )
+
+        # nested fields in an attribute which is a dataclass
+        self.assertEqual(
+            stringify(users, {"fields": ["id", ["address", "city"]]}),
+            '"id","address"."city"\n1,"Rotterdam"\n2,"Utrecht"\n',
+        )
+        self.assertEqual(
+            stringify(
+                users,
+                {
+                    "fields": ["id", "name", ["address", "city"], "tags"],
+                    "strict_fields": True,
+                },
+            ),
+            '"id","name","address"."city","tags"\n'
+            '1,"Joe","Rotterdam",[]\n'
+            '2,"Sarah","Utrecht",["a","b"]\n',
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            'Field "address"."zip" does not exist in the table header',
+            lambda: stringify(
+                [Person(1, Location("Rotterdam", "1234"))],
+                {"fields": ["id", ["address", "city"]], "strict_fields": True},
+            ),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            'Field "address" does not exist in the table header',
+            lambda: stringify(
+                users, {"fields": ["id", "name", "tags"], "strict_fields": True}
+            ),
+        )
+        self.assertEqual(
+            stringify(
+                [Point(1, 2)], {"fields": ["x", "y", "z"], "strict_fields": True}
+            ),
+            '"x","y","z"\n1,2,\n',
+        )
+
+    def test_fields_cached(self):
+        self.assertIs(get_class_fields(User), get_class_fields(User))
+        self.assertIsNone(get_class_fields(date))
+        self.assertIsNone(get_class_fields(tuple))
+        self.assertIsNone(get_class_fields(Slotted))
+        self.assertIsNone(get_class_fields(UUID))
+        self.assertEqual(len(get_class_fields(Slotted, slots=True) or []), 2)
+
+    def test_default(self):
+        data = {"date": date(2026, 1, 31)}
+
+        self.assertRaisesRegex(
+            TypeError, "Unknown type of data", lambda: stringify(data)
+        )
+        self.assertEqual(
+            stringify(data, {"default": lambda value: value.isoformat()}),
+            '{"date":"2026-01-31"}',
+        )
+        self.assertEqual(
+            stringify([{"date": date(2026, 1, 31)}], {"default": str}),
+            '"date"\n"2026-01-31"\n',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
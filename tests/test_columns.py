@@ -0,0 +1,115 @@
+import io
+import unittest
+from array import array
+
+from tabularjson import Columns, parse, stringify, stringify_to
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnsTestCase(unittest.TestCase):
+    columns = {
+        "id": array("i", [1, 2, 3]),
+        "score": array("d", [0.5, float("nan"), -2.0]),
+        "name": ["Joe", "Sarah", None],
+        ("address", "city"): ["Rotterdam", "Utrecht", "Amsterdam"],
+        "tags": [["a"], [], {"b": True}],
+    }
+    rows = [
+        {
+            "id": 1,
+            "score": 0.5,
+            "name": "Joe",
+            "address": {"city": "Rotterdam"},
+            "tags": ["a"],
+        },
+        {
+            "id": 2,
+            "score": float("nan"),
+            "name": "Sarah",
+            "address": {"city": "Utrecht"},
+            "tags": [],
+        },
+        {
+            "id": 3,
+            "score": -2.0,
+            "name": None,
+            "address": {"city": "Amsterdam"},
+            "tags": {"b": True},
+        },
+    ]
+
+    def test_stringify_columns(self):
+        for options in [None, {"indentation": 2}, {"column_widths": [10]}]:
+            self.assertEqual(
+                stringify(Columns(self.columns), options), stringify(self.rows, options)
+            )
+
+    def test_nested_columns(self):
+        data = {"friends": Columns(self.columns)}
+
+        self.assertEqual(stringify(data), stringify({"friends": self.rows}))
+        self.assertEqual(
+            stringify(data, {"indentation": 2}),
+            stringify({"friends": self.rows}, {"indentation": 2}),
+        )
+
+    def test_stringify_to(self):
+        fp = io.StringIO()
+        stringify_to(Columns(self.columns), fp, buffer_size=8)
+
+        self.assertEqual(fp.getvalue(), stringify(self.rows))
+
+    def test_array_types(self):
+        columns = Columns(
+            {
+                "b": array("b", [-1, 2]),
+                "Q": array("Q", [2**64 - 1, 0]),
+                "f": array("f", [0.5, 1.0]),
+            }
+        )
+
+        self.assertEqual(
+            parse(stringify(columns)),
+            [
+                {"b": -1, "Q": 2**64 - 1, "f": 0.5},
+                {"b": 2, "Q": 0, "f": 1.0},
+            ],
+        )
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        columns = Columns(
+            {
+                "i": numpy.array([1, 2], dtype=numpy.int64),
+                "f": numpy.array([0.5, numpy.inf]),
+                "b": numpy.array([True, False]),
+                "s": numpy.array(["Joe", "Sarah"]),
+            }
+        )
+
+        self.assertEqual(
+            stringify(columns),
+            '"i","f","b","s"\n1,0.5,true,"Joe"\n2,inf,false,"Sarah"\n',
+        )
+
+    def test_empty_columns(self):
+        self.assertEqual(stringify(Columns({"id": []})), "[]")
+        self.assertEqual(stringify({"a": Columns({"id": []})}), '{"a":[]}')
+
+    def test_invalid_columns(self):
+        self.assertRaisesRegex(
+            ValueError, "A table must have at least one field", lambda: Columns({})
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            "All columns must have the same length",
+            lambda: Columns({"id": [1, 2], "name": ["Joe"]}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import re
+import unittest
+
+from tabularjson import parse, parse_incremental, reparse, stringify
+
+
+class IncrementalTestCase(unittest.TestCase):
+    data = [
+        {"id": 1, "name": "Joe", "scores": [1, 2, 3]},
+        {"id": 2, "name": "Sarah", "friends": [{"id": 1}, {"id": 3}]},
+        {"id": 3, "name": "Emma", "address": {"city": "Rotterdam"}},
+    ]
+
+    def assert_edit(self, text, offset, removed_length, inserted_text):
+        state = parse_incremental(text)
+        reparse(state, offset, removed_length, inserted_text)
+        new_text = text[:offset] + inserted_text + text[offset + removed_length :]
+
+        self.assertEqual(state.text, new_text)
+        self.assertEqual(state.value, parse(new_text))
+
+        return state
+
+    def test_parse_incremental(self):
+        text = stringify(self.data, {"indentation": 2})
+        state = parse_incremental(text)
+
+        self.assertEqual(state.text, text)
+        self.assertEqual(state.value, self.data)
+
+    def test_edit_value(self):
+        state = parse_incremental('{"id":1,"scores":[1,2,3]}')
+        reparse(state, 20, 1, "5")
+
+        self.assertEqual(state.value, {"id": 1, "scores": [1, 5, 3]})
+
+    def test_edit_table_row(self):
+        text = stringify(self.data)
+
+        self.assert_edit(text, text.index("Sarah"), 5, "Sarah Smith")
+        self.assert_edit(text, text.index("Rotterdam"), 0, "New ")
+        self.assert_edit(text, text.index("[1,2,3]") + 1, 1, "10")
+
+    def test_insert_and_remove_table_rows(self):
+        text = stringify(self.data)
+        start = text.index("\n2,")
+
+        self.assert_edit(text, start, 0, '\n4,"Ann",,,')
+        self.assert_edit(text, start, text.index("\n3,") - start, "")
+        self.assert_edit(text, len(text), 0, '4,"Ann",,,\n')
+
+    def test_edit_nested_table(self):
+        text = stringify(self.data, {"indentation": 2})
+
+        self.assert_edit(text, text.index("(\n") + 1, 0, "\n")
+        self.assert_edit(text, text.index('"id"\n  1') + 8, 0, "\n  2")
+
+    def test_clear_table_row(self):
+        # a row that becomes a blank line is skipped, like in parse
+        text = '{"tags":(\n"name"\n"a"\n"b"\n"c"\n)}'
+        state = self.assert_edit(text, text.index('"b"'), 3, "")
+        self.assertEqual(state.value, {"tags": [{"name": "a"}, {"name": "c"}]})
+
+        self.assert_edit(text, text.index('"c"'), 3, "")
+        self.assert_edit(text, text.index('"b"'), 3, "\n")
+
+        root_table = '"id","name"\n1,"a"\n2,"b"\n3,"c"\n'
+        self.assert_edit(root_table, root_table.index('2,"b"'), 5, "")
+        self.assert_edit(root_table, root_table.index('3,"c"'), 5, "")
+
+    def test_edit_header(self):
+        text = stringify(self.data)
+
+        self.assert_edit(text, 1, 2, "key")
+
+    def test_reuse_unaffected_values(self):
+        text = stringify(self.data)
+        state = parse_incremental(text)
+        rows = list(state.value)
+        reparse(state, text.index("Emma"), 4, "Anna")
+
+        self.assertIs(state.value[0], rows[0])
+        self.assertIs(state.value[1], rows[1])
+        self.assertEqual(state.value[2]["name"], "Anna")
+
+    def test_many_edits(self):
+        text = stringify([{"id": i, "values": [i, i + 1]} for i in range(1000)])
+        state = parse_incremental(text)
+
+        for i in range(0, 1000, 100):
+            offset = state.text.index(f"[{i},") + 1
+            reparse(state, offset, len(str(i)), "-1")
+
+        self.assertEqual(state.value, parse(state.text))
+
+    def test_invalid_edit(self):
+        text = stringify(self.data)
+        state = parse_incremental(text)
+
+        self.assertRaisesRegex(
+            SyntaxError,
+            re.escape("Comma ',' expected"),
+            lambda: reparse(state, text.index("Sarah"), 0, '"'),
+        )
+        self.assertEqual(state.text, text)
+        self.assertEqual(state.value, self.data)
+        self.assertRaises(ValueError, lambda: reparse(state, len(text), 1, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
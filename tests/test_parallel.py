@@ -0,0 +1,96 @@
+import io
+import unittest
+from unittest import mock
+
+from tabularjson import parallel, stringify, stringify_parallel, stringify_parallel_to
+from tabularjson.table_properties import no_nested_arrays
+
+rows = [
+    {
+        "id": i,
+        "name": "item " * (i % 4),
+        "address": {"city": "Rotterdam"} if i % 3 else {},
+        "scores": [{"a": i}, {"a": -i}] if i % 5 == 0 else None,
+    }
+    for i in range(50)
+]
+
+
+class StringifyParallelTestCase(unittest.TestCase):
+    def assert_same_output(self, data, options=None):
+        expected = stringify(rows, options)
+
+        for processes in [1, 2]:
+            for chunk_size in [1, 7, 100]:
+                self.assertEqual(
+                    stringify_parallel(data, options, processes, chunk_size), expected
+                )
+
+    def test_stringify_parallel(self):
+        self.assert_same_output(rows)
+        self.assert_same_output(rows, {"indentation": 2})
+        self.assert_same_output(rows, {"indentation": 2, "max_column_width": 6})
+        self.assert_same_output(
+            rows, {"indentation": 2, "column_widths": "sample", "sample_rows": 3}
+        )
+        self.assert_same_output(rows, {"indentation": 2, "column_widths": [4, 4]})
+        self.assert_same_output(rows, {"fields": ["name", "id"]})
+
+    def test_rows_sent_to_processes(self):
+        # without fork as default start method, the rows are sent with every task
+        with (
+            mock.patch.object(parallel, "get_start_method", return_value="spawn"),
+            mock.patch.object(
+                parallel, "create_executor", return_value=parallel.InlineExecutor()
+            ),
+            mock.patch.object(
+                parallel, "stringify_chunk", wraps=parallel.stringify_chunk
+            ) as stringify_chunk,
+        ):
+            self.assertEqual(stringify_parallel(rows, None, 2, 20), stringify(rows))
+
+        tasks = list(map(lambda call: call.args[0], stringify_chunk.call_args_list))
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(tasks[1][0], rows[20:40])
+
+    def test_chunks(self):
+        def generate_chunks(options=None):
+            for start in range(0, len(rows), 8):
+                yield rows[start : start + 8]
+
+        for options in [
+            None,
+            {"indentation": 2},
+            {"fields": ["id", "name", ["address", "city"], "scores"]},
+            {
+                "fields": ["id", "name", ["address", "city"], "scores"],
+                "indentation": 2,
+                "column_widths": [2, 10],
+            },
+        ]:
+            self.assertEqual(
+                stringify_parallel(generate_chunks(), options, 2),
+                stringify(rows, options),
+            )
+
+    def test_stringify_parallel_to(self):
+        fp = io.StringIO()
+        stringify_parallel_to(rows, fp, {"indentation": 2}, 2, 10)
+
+        self.assertEqual(fp.getvalue(), stringify(rows, {"indentation": 2}))
+
+    def test_not_a_table(self):
+        for data in [[], [1, 2, 3], {"rows": rows}]:
+            self.assertEqual(stringify_parallel(data, None, 2), stringify(data))
+
+        self.assertEqual(
+            stringify_parallel(rows, {"output_as_table": no_nested_arrays}, 2),
+            stringify(rows, {"output_as_table": no_nested_arrays}),
+        )
+        self.assertEqual(
+            stringify_parallel(iter([[], []]), {"fields": ["id"]}, 2), "[]"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
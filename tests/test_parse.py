@@ -4,7 +4,7 @@ import re
 import unittest
 from os import path
 
-from tabularjson import parse
+from tabularjson import TableStats, parse
 
 
 class ParseTestCase(unittest.TestCase):
@@ -52,6 +52,92 @@ class ParseTestCase(unittest.TestCase):
                                 lambda: print("output: ", parse(test["input"])),
                             )
 
+    def test_skip_invalid_rows(self):
+        text = '"id","name"\n1,"Joe"\n2,"Sa"rah"\n3\n4,"Café"\n5,"x",6\n6,"Emma"'
+        errors = []
+        data = parse(text, {"on_error": errors.append})
+
+        self.assertEqual(
+            data,
+            [
+                {"id": 1, "name": "Joe"},
+                {"id": 4, "name": "Café"},
+                {"id": 6, "name": "Emma"},
+            ],
+        )
+        self.assertEqual(
+            list(map(lambda error: error["row"], errors)),
+            [1, 2, 4],
+        )
+        self.assertEqual(
+            list(map(lambda error: error["text"], errors)),
+            ['2,"Sa"rah"', "3", '5,"x",6'],
+        )
+        self.assertEqual(
+            errors[1]["message"],
+            "Comma ',' expected after value but got '\n' at position 32",
+        )
+        self.assertEqual(errors[1]["position"], 31)
+        self.assertEqual(errors[2]["position"], text.index('5,"x",6'))
+        self.assertEqual(
+            errors[2]["offset"], len(text[: errors[2]["position"]].encode("utf-8"))
+        )
+
+    def test_skip_invalid_rows_max_errors(self):
+        text = '"id","name"\n1,"Joe"\n2\n3\n4,"Emma"\n'
+        errors = []
+
+        self.assertEqual(
+            parse(text, {"on_error": errors.append, "max_errors": 2}),
+            [{"id": 1, "name": "Joe"}, {"id": 4, "name": "Emma"}],
+        )
+        self.assertRaisesRegex(
+            SyntaxError,
+            re.escape("Maximum number of errors (1) exceeded: Comma ',' expected"),
+            lambda: parse(text, {"on_error": errors.append, "max_errors": 1}),
+        )
+        self.assertRaisesRegex(SyntaxError, "Comma ',' expected", lambda: parse(text))
+
+    def test_skip_invalid_rows_with_stats(self):
+        stats = TableStats()
+        parse(
+            '"id"  , "name"\n1,"Joe"\n2,"x",3\n',
+            {"stats": stats, "on_error": lambda _: None},
+        )
+
+        self.assertEqual(stats.row_count, 1)
+        self.assertEqual(stats.get(["id"]).max, 1)
+
+    def test_nested_fields(self):
+        text = (
+            '"id","address"."city","geo"."pos"."lat","address"."zip","geo"."pos"."lon"\n'
+            '1,"Rotterdam",1.5,"1234",2.5\n'
+            '2,,,"5678",3\n'
+        )
+        rows = parse(text)
+
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "id": 1,
+                    "address": {"city": "Rotterdam", "zip": "1234"},
+                    "geo": {"pos": {"lat": 1.5, "lon": 2.5}},
+                },
+                {"id": 2, "address": {"zip": "5678"}, "geo": {"pos": {"lon": 3}}},
+            ],
+        )
+        self.assertEqual(list(rows[0]["address"].keys()), ["city", "zip"])
+        self.assertIsNot(rows[0]["address"], rows[1]["address"])
+        self.assertIsNot(rows[0]["geo"]["pos"], rows[1]["geo"]["pos"])
+
+    def test_nested_fields_replaced(self):
+        # the field "a" replaces the object of the nested fields before it
+        self.assertEqual(
+            parse('"id","a"."x","a","a"."y"\n1,1,{},3\n2,1,,3\n'),
+            [{"id": 1, "a": {"y": 3}}, {"id": 2, "a": {"x": 1, "y": 3}}],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+import io
+import mmap
+import os
+import tempfile
+import unittest
+
+from tabularjson import count_rows, parse, read_header, stringify
+
+
+class ScanTestCase(unittest.TestCase):
+    data = [
+        {"id": 1, "name": "Joe", "address": {"city": "Rotterdam"}},
+        {"id": 2, "name": "Sarah (2)", "scores": [1, 2, 3]},
+        {"id": 3, "friends": [{"id": 1}, {"id": 2}], "comment": "a // b /* c"},
+        {"id": 4, "name": '"quoted" \\ (text)'},
+    ]
+
+    def test_read_header(self):
+        text = stringify(self.data)
+        expected = [
+            ["id"],
+            ["name"],
+            ["address", "city"],
+            ["scores"],
+            ["friends"],
+            ["comment"],
+        ]
+
+        self.assertEqual(read_header(text), expected)
+        self.assertEqual(read_header(text.encode("utf-8")), expected)
+        self.assertEqual(read_header(io.StringIO(text)), expected)
+        self.assertEqual(read_header(io.BytesIO(text.encode("utf-8"))), expected)
+        self.assertEqual(read_header('/* comment */ "a" , "b"\n1,2\n'), [["a"], ["b"]])
+        self.assertEqual(read_header('"a","b"'), [["a"], ["b"]])
+
+    def test_read_header_long(self):
+        fields = [f"field{i}" for i in range(2000)]
+        text = stringify([{field: 1 for field in fields}])
+
+        self.assertEqual(read_header(text), [[field] for field in fields])
+
+    def test_read_header_no_table(self):
+        self.assertEqual(read_header('{"a":1}'), None)
+        self.assertEqual(read_header("[1,2,3]"), None)
+        self.assertEqual(read_header('"text"'), None)
+        self.assertRaisesRegex(
+            SyntaxError, "Table field expected", lambda: read_header('"a",\n1\n')
+        )
+
+    def test_count_rows(self):
+        for indentation in [None, 2]:
+            text = stringify(self.data, {"indentation": indentation})
+
+            with self.subTest(indentation=indentation):
+                self.assertEqual(count_rows(text), 4)
+                self.assertEqual(count_rows(text, chunk_size=5), 4)
+                self.assertEqual(count_rows(text.encode("utf-8"), chunk_size=5), 4)
+                self.assertEqual(count_rows(io.StringIO(text)), 4)
+
+    def test_count_rows_whitespace_and_comments(self):
+        text = (
+            "// header\n"
+            + '"a","b"\n'
+            + "\n"
+            + "1,2 // comment\n"
+            + "   \n"
+            + "/* multi\n"
+            + "line */\n"
+            + "3,{\n"
+            + '  "nested": [1,\n'
+            + "    2]\n"
+            + "}\n"
+            + "\n"
+            + "5,6"
+        )
+
+        self.assertEqual(count_rows(text), len(parse(text)))
+        self.assertEqual(count_rows(text, chunk_size=3), len(parse(text)))
+
+    def test_count_rows_nested_tables(self):
+        text = '"a","b"\n(\n"x"\n1\n2\n),2\n3,(\n"y"\n(\n"z"\n1\n)\n)\n'
+        self.assertEqual(count_rows(text), 2)
+
+        deprecated = '"a","b"\n---\n"x"\n1\n---,2\n3,---\n"x"\n1\n2\n---\n'
+        self.assertEqual(count_rows(deprecated), len(parse(deprecated)))
+
+    def test_count_rows_no_table(self):
+        self.assertEqual(count_rows('{"a":1}'), None)
+        self.assertEqual(count_rows('"a","b"\n'), 0)
+
+    def test_count_rows_mmap(self):
+        rows = [{"id": i, "name": f"name {i}"} for i in range(10_000)]
+        text = stringify(rows, {"indentation": 2})
+
+        with tempfile.TemporaryDirectory() as dir:
+            file = os.path.join(dir, "table.tjson")
+            with open(file, "w", encoding="utf-8") as f:
+                f.write(text)
+
+            with open(file, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    self.assertEqual(read_header(m), [["id"], ["name"]])
+                    self.assertEqual(count_rows(m, chunk_size=1000), 10_000)
+
+            with open(file, "rb") as f:
+                self.assertEqual(count_rows(f, chunk_size=1000), 10_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
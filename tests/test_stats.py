@@ -0,0 +1,77 @@
+import unittest
+
+from tabularjson import TableStats, collect_stats, parse
+from tabularjson.stats import DistinctSketch
+
+
+class StatsTestCase(unittest.TestCase):
+    text = (
+        '"id","name","address"."city"\n'
+        + '1,"Joe","Rotterdam"\n'
+        + '2,null,"New York"\n'
+        + '3,"Sarah",\n'
+        + '4,"Joe","Rotterdam"\n'
+    )
+
+    def test_parse_with_stats(self):
+        stats = TableStats()
+        data = parse(self.text, {"stats": stats})
+
+        self.assertEqual(data, parse(self.text))
+        self.assertEqual(stats.row_count, 4)
+        self.assertEqual(
+            list(map(lambda column: column.path, stats.columns)),
+            [["id"], ["name"], ["address", "city"]],
+        )
+
+        id = stats.get(["id"])
+        self.assertEqual(id.count, 4)
+        self.assertEqual(id.min, 1)
+        self.assertEqual(id.max, 4)
+        self.assertEqual(id.distinct_count, 4)
+
+        name = stats.get(["name"])
+        self.assertEqual(name.null_count, 1)
+        self.assertEqual(name.min, "Joe")
+        self.assertEqual(name.max, "Sarah")
+        self.assertEqual(name.max_string_length, 5)
+        self.assertEqual(name.distinct_count, 2)
+
+        city = stats.get(["address", "city"])
+        self.assertEqual(city.count, 3)
+        self.assertEqual(city.missing_count, 1)
+        self.assertEqual(city.max_string_length, 9)
+
+    def test_collect_stats(self):
+        stats = collect_stats(self.text)
+
+        self.assertEqual(stats.row_count, 4)
+        self.assertEqual(stats.get(["name"]).distinct_count, 2)
+
+    def test_no_root_table(self):
+        stats = collect_stats('{"id":1}')
+
+        self.assertEqual(stats.row_count, 0)
+        self.assertEqual(stats.columns, [])
+
+    def test_mixed_values(self):
+        stats = collect_stats('"value","other"\n2,0\n"a",0\ntrue,0\nnan,0\n-1,0\n')
+        value = stats.get(["value"])
+
+        self.assertEqual(value.min, -1)
+        self.assertEqual(value.max, "a")
+        self.assertEqual(value.distinct_count, 5)
+
+    def test_distinct_sketch(self):
+        sketch = DistinctSketch(256)
+        for i in range(100_000):
+            sketch.add(i % 20_000)
+
+        estimate = sketch.estimate()
+        self.assertGreater(estimate, 20_000 * 0.8)
+        self.assertLess(estimate, 20_000 * 1.2)
+        self.assertEqual(len(sketch.hashes), 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
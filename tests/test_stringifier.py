@@ -0,0 +1,106 @@
+import io
+import unittest
+
+from tabularjson import Stringifier, parse, stringify
+
+
+def create_response(count: int):
+    return {
+        "total": count,
+        "items": [
+            {"id": i, "name": f"item {i}", "address": {"city": "Rotterdam"}}
+            for i in range(count)
+        ],
+    }
+
+
+class StringifierTestCase(unittest.TestCase):
+    def test_same_output_as_stringify(self):
+        documents = [
+            create_response(3),
+            [{"id": 1, "name": "Joe"}, {"id": 2}],
+            [{"a": {"b": None}}, {"a": {"b": 2}}],
+            [{"a": {}}, {"a": {}}],
+            {"nested": [[{"id": 1}], [{"id": 2}]]},
+        ]
+
+        for options in [None, {"indentation": 2}]:
+            stringifier = Stringifier(options)
+            for _ in range(2):
+                for document in documents:
+                    self.assertEqual(
+                        stringifier.stringify(document), stringify(document, options)
+                    )
+
+    def test_cache_hits(self):
+        stringifier = Stringifier()
+
+        for count in [3, 5, 2]:
+            text = stringifier.stringify(create_response(count))
+            self.assertEqual(parse(text), create_response(count))
+
+        self.assertEqual(stringifier.misses, 1)
+        self.assertEqual(stringifier.hits, 2)
+
+        stringifier.clear()
+        self.assertEqual((stringifier.hits, stringifier.misses), (0, 0))
+        self.assertEqual(len(stringifier.cache), 0)
+
+    def test_different_shapes(self):
+        stringifier = Stringifier()
+        stringifier.stringify([{"id": 1, "name": "Joe"}])
+
+        # same first row, but another row has an extra key
+        data = [{"id": 1, "name": "Joe"}, {"id": 2, "name": "Sarah", "age": 42}]
+        self.assertEqual(stringifier.stringify(data), stringify(data))
+
+        # same keys in a different order
+        data = [{"name": "Joe", "id": 1}]
+        self.assertEqual(stringifier.stringify(data), stringify(data))
+
+        # a nested object instead of a value
+        data = [{"id": {"value": 1}, "name": "Joe"}]
+        self.assertEqual(stringifier.stringify(data), stringify(data))
+
+        self.assertEqual(stringifier.hits, 0)
+        self.assertEqual(stringifier.misses, 4)
+
+    def test_non_uniform_table_not_cached(self):
+        stringifier = Stringifier()
+        data = [{"id": 1}, {"id": 2, "name": "Sarah"}]
+
+        stringifier.stringify(data)
+        stringifier.stringify(data)
+
+        self.assertEqual(len(stringifier.cache), 0)
+        self.assertEqual(stringifier.misses, 2)
+
+    def test_least_recently_used(self):
+        stringifier = Stringifier(cache_size=2)
+
+        stringifier.stringify([{"a": 1}])
+        stringifier.stringify([{"b": 1}])
+        stringifier.stringify([{"a": 2}])
+        stringifier.stringify([{"c": 1}])  # drops the shape of b
+
+        self.assertEqual(len(stringifier.cache), 2)
+        self.assertEqual(stringifier.hits, 1)
+
+        stringifier.stringify([{"a": 3}])
+        stringifier.stringify([{"b": 2}])
+
+        self.assertEqual(stringifier.hits, 2)
+        self.assertEqual(stringifier.misses, 4)
+
+    def test_stringify_to(self):
+        stringifier = Stringifier({"indentation": 2})
+        data = create_response(10)
+
+        fp = io.StringIO()
+        stringifier.stringify_to(data, fp, 16)
+
+        self.assertEqual(fp.getvalue(), stringify(data, {"indentation": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,17 @@
+import io
 import json
 import math
+import sys
 import unittest
 from os import path
 
-from tabularjson import stringify, StringifyOptions
-from tabularjson.table_properties import no_nested_arrays, no_nested_tables
+from tabularjson import stringify, stringify_bytes, stringify_to, StringifyOptions
+from tabularjson.table_properties import (
+    is_homogeneous,
+    no_long_strings,
+    no_nested_arrays,
+    no_nested_tables,
+)
 
 
 class StringifyTestCase(unittest.TestCase):
@@ -133,6 +140,343 @@ class StringifyTestCase(unittest.TestCase):
             log_paths(self.data), [["scores"], ["data"], ["data", 0, "measurements"]]
         )
 
+    def test_stringify_to(self):
+        for options in [None, {"indentation": 2}, {"trailing_commas": True}]:
+            with self.subTest(options=options):
+                fp = io.StringIO()
+                stringify_to(self.data, fp, options)
+
+                self.assertEqual(fp.getvalue(), stringify(self.data, options))
+
+    def test_stringify_to_chunks(self):
+        data = [
+            {"id": i, "name": f"item {i}", "values": [i, i + 1]} for i in range(1000)
+        ]
+        chunks = []
+
+        class Writer:
+            def write(self, chunk):
+                chunks.append(chunk)
+
+        stringify_to(data, Writer(), {"indentation": 2}, buffer_size=100)
+
+        self.assertEqual("".join(chunks), stringify(data, {"indentation": 2}))
+        self.assertGreater(len(chunks), 100)
+        self.assertTrue(all(len(chunk) < 200 for chunk in chunks))
+
+    def test_stringify_bytes(self):
+        data = [{"id": i, "name": f"naïve € {i} 😀"} for i in range(100)]
+
+        for options in [None, {"indentation": 2}]:
+            output = stringify_bytes(data, options, buffer_size=10)
+
+            self.assertIsInstance(output, memoryview)
+            self.assertEqual(output, stringify(data, options).encode("utf-8"))
+
+    def test_stringify_to_binary(self):
+        data = {"name": "naïve € 😀", "rows": [{"id": 1}, {"id": 2}]}
+
+        fp = io.BytesIO()
+        stringify_to(data, fp, {"indentation": 2}, buffer_size=4)
+
+        self.assertEqual(
+            fp.getvalue(), stringify(data, {"indentation": 2}).encode("utf-8")
+        )
+
+        fp = io.BufferedWriter(io.BytesIO())
+        stringify_to(data, fp)
+        fp.flush()
+
+        self.assertEqual(fp.raw.getvalue(), stringify(data).encode("utf-8"))
+
+    def test_output_as_table_without_path(self):
+        tables = []
+
+        def output_as_table(table):
+            tables.append(table)
+            return len(table) > 1
+
+        self.assertEqual(
+            stringify(self.data, {"output_as_table": output_as_table}),
+            '{"scores":(\n"values"\n[1,2,3]\n[5,6,7]\n),'
+            + '"data":[{"measurements":(\n"x","y"\n1,3\n2,4\n)}]}',
+        )
+        self.assertEqual(len(tables), 3)
+
+    def test_cache_output_as_table(self):
+        data = {
+            "rows": [
+                {"id": i, "items": [{"a": i}], "more": [{"b": i}]} for i in range(100)
+            ]
+        }
+        paths = []
+
+        def output_as_table(_table, path):
+            paths.append(path)
+            return path[-1] != "items"
+
+        options: StringifyOptions = {
+            "output_as_table": output_as_table,
+            "cache_output_as_table": True,
+        }
+        text = stringify(data, options)
+
+        self.assertEqual(paths, [["rows"], ["rows", 0, "items"], ["rows", 0, "more"]])
+        self.assertEqual(
+            text,
+            stringify(data, {"output_as_table": output_as_table}),
+        )
+        self.assertIn('\n0,[{"a":0}],(\n"b"\n0\n)\n', text)
+
+    def test_column_widths(self):
+        data = [
+            {"id": 1, "name": "Joe"},
+            {"id": 22, "name": "Sarah"},
+            {"id": 333, "name": "Christopher"},
+        ]
+
+        def stringify_with(options):
+            return stringify(data, {"indentation": 2, **options})
+
+        self.assertEqual(
+            stringify_with({}),
+            '"id", "name"\n1,    "Joe"\n22,   "Sarah"\n333,  "Christopher"\n',
+        )
+        self.assertEqual(
+            stringify_with({"column_widths": "two_pass"}), stringify_with({})
+        )
+        self.assertEqual(
+            stringify_with({"column_widths": "sample", "sample_rows": 1}),
+            '"id", "name"\n1,    "Joe"\n22,   "Sarah"\n333,  "Christopher"\n',
+        )
+        self.assertEqual(
+            stringify_with({"column_widths": [1]}),
+            '"id", "name"\n1,    "Joe"\n22,   "Sarah"\n333,  "Christopher"\n',
+        )
+        self.assertEqual(
+            stringify_with({"column_widths": [6]}),
+            '"id",   "name"\n1,      "Joe"\n22,     "Sarah"\n333,    "Christopher"\n',
+        )
+        self.assertEqual(
+            stringify(
+                [{"name": "Christopher", "id": 1}, {"name": "Joe", "id": 2}],
+                {"indentation": 2, "max_column_width": 6},
+            ),
+            '"name", "id"\n"Christopher", 1\n"Joe",  2\n',
+        )
+
+    def test_column_widths_nested_table(self):
+        data = {
+            "rows": [
+                {"id": 1, "items": [{"a": 1}, {"a": 22}]},
+                {"id": 22, "items": [{"a": 333}]},
+            ]
+        }
+
+        for column_widths in ["two_pass", "sample"]:
+            with self.subTest(column_widths=column_widths):
+                self.assertEqual(
+                    stringify(
+                        data,
+                        {
+                            "indentation": 2,
+                            "column_widths": column_widths,
+                            "sample_rows": 1,
+                        },
+                    ),
+                    stringify(data, {"indentation": 2}),
+                )
+
+    def test_primitive_formatters(self):
+        values = [
+            0,
+            -42,
+            10**30,
+            0.1,
+            -0.0,
+            1e300,
+            1.5e-10,
+            True,
+            False,
+            None,
+            "",
+            "plain",
+            'quote " and backslash \\',
+            "control \n\t\x00\x1f",
+            "unicode é 😀 \u2028",
+        ]
+
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    stringify(value), json.dumps(value, ensure_ascii=False)
+                )
+                self.assertEqual(
+                    stringify([{"a": value}]),
+                    '"a"\n' + json.dumps(value, ensure_ascii=False) + "\n",
+                )
+
+    def test_fields(self):
+        rows = [
+            {"id": 1, "name": "Joe", "address": {"city": "Rotterdam", "zip": "1234"}},
+            {"id": 2, "name": "Sarah", "age": 42},
+        ]
+
+        # projection and order of the columns
+        self.assertEqual(
+            stringify(rows, {"fields": ["name", ["address", "city"], "id"]}),
+            '"name","address"."city","id"\n"Joe","Rotterdam",1\n"Sarah",,2\n',
+        )
+
+        # the same output as without fields when passing all fields
+        fields = ["id", "name", ["address", "city"], ["address", "zip"], "age"]
+        self.assertEqual(
+            stringify(rows, {"fields": fields, "indentation": 2}),
+            stringify(rows, {"indentation": 2}),
+        )
+
+        self.assertRaisesRegex(
+            ValueError,
+            "A table must have at least one field",
+            lambda: stringify(rows, {"fields": []}),
+        )
+
+    def test_fields_root_table_only(self):
+        # nested tables collect their own fields
+        self.assertEqual(
+            stringify(
+                [{"id": 1, "friends": [{"name": "x"}]}], {"fields": ["id", "friends"]}
+            ),
+            '"id","friends"\n1,(\n"name"\n"x"\n)\n',
+        )
+
+        data = {"a": [{"x": 1}], "b": [{"y": 2}]}
+        self.assertEqual(stringify(data, {"fields": ["x"]}), stringify(data))
+        self.assertEqual(
+            stringify(data, {"fields": ["x"], "strict_fields": True}), stringify(data)
+        )
+
+    def test_fields_per_path(self):
+        data = {
+            "friends": [{"id": 1, "name": "Joe"}],
+            "scores": [{"id": 1, "score": 7}],
+        }
+
+        def fields(tabular_data, path):
+            return ["name"] if path == ["friends"] else None
+
+        self.assertEqual(
+            stringify(data, {"fields": fields}),
+            '{"friends":(\n"name"\n"Joe"\n),"scores":(\n"id","score"\n1,7\n)}',
+        )
+        self.assertEqual(
+            stringify(data, {"fields": lambda tabular_data: ["id"]}),
+            '{"friends":(\n"id"\n1\n),"scores":(\n"id"\n1\n)}',
+        )
+
+    def test_nested_fields(self):
+        rows = [
+            {
+                "id": 1,
+                "address": {"city": "Rotterdam", "geo": {"lat": 1.5}},
+                "tags": ["a", "b"],
+            },
+            {"id": 2, "address": "unknown", "tags": ["c"]},
+            {"id": 3, "address": {"geo": {"lat": 2, "lon": 3}}},
+        ]
+        fields = [
+            "id",
+            ["address", "city"],
+            ["address", "geo", "lat"],
+            ["tags", "1"],
+            ["address", "geo", "lon"],
+        ]
+
+        self.assertEqual(
+            stringify(rows, {"fields": fields}),
+            '"id","address"."city","address"."geo"."lat","tags"."1","address"."geo"."lon"\n'
+            '1,"Rotterdam",1.5,"b",\n'
+            "2,,,,\n"
+            "3,,2,,3\n",
+        )
+
+    def test_strict_fields(self):
+        rows = [
+            {"id": 1, "address": {"city": "Rotterdam"}},
+            {"id": 2, "address": {"city": "Utrecht", "zip": "1234"}},
+        ]
+
+        self.assertEqual(
+            stringify(
+                rows[:1], {"fields": ["id", ["address", "city"]], "strict_fields": True}
+            ),
+            stringify(rows[:1]),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            'Field "address"."zip" does not exist in the table header',
+            lambda: stringify(
+                rows, {"fields": ["id", ["address", "city"]], "strict_fields": True}
+            ),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            'Field "address" does not exist in the table header',
+            lambda: stringify(rows, {"fields": ["id"], "strict_fields": True}),
+        )
+
+    def test_stringify_after_predicate_and_mutation(self):
+        rows = [{"a": 1}, {"a": 2}]
+        self.assertEqual(is_homogeneous(rows), True)
+
+        rows[0]["b"] = "added"
+        self.assertEqual(stringify(rows), '"a","b"\n1,"added"\n2,\n')
+        self.assertEqual(
+            stringify(rows, {"output_as_table": is_homogeneous}),
+            '[{"a":1,"b":"added"},{"a":2}]',
+        )
+
+    def test_output_as_table_nested_tables_linear(self):
+        def create_nested_tables(depth):
+            data = [{"id": 0, "name": "leaf"}]
+            for _ in range(depth):
+                data = [{"id": i, "children": data if i == 0 else []} for i in range(5)]
+            return data
+
+        def count_calls(data, options):
+            count = 0
+
+            def profile(frame, event, arg):
+                nonlocal count
+                if event == "call":
+                    count += 1
+
+            sys.setprofile(profile)
+            try:
+                stringify(data, options)
+            finally:
+                sys.setprofile(None)
+            return count
+
+        shallow = create_nested_tables(25)
+        deep = create_nested_tables(50)
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, 10000))
+        try:
+            for output_as_table in [
+                no_nested_tables,
+                no_nested_arrays,
+                is_homogeneous,
+                no_long_strings,
+            ]:
+                options: StringifyOptions = {"output_as_table": output_as_table}
+
+                # twice the depth must take about twice the work, not four times
+                ratio = count_calls(deep, options) / count_calls(shallow, options)
+                self.assertLess(ratio, 2.5, output_as_table.__name__)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
 
 if __name__ == "__main__":
     unittest.main()
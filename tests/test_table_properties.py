@@ -1,14 +1,45 @@
+import threading
 import unittest
+from dataclasses import dataclass
+from typing import NamedTuple
+from unittest import mock
 
+from tabularjson import stringify, tabular
 from tabularjson.table_properties import (
+    all_of,
     always,
+    any_of,
+    create_no_long_strings,
     is_homogeneous,
     no_long_strings,
     no_nested_arrays,
     no_nested_tables,
+    none_of,
+    sampled,
+    get_sample,
+    uses_path,
 )
 
 
+@dataclass
+class Item:
+    id: int
+    value: object
+
+
+class Pair(NamedTuple):
+    id: int
+    value: object
+
+
+class Slotted:
+    __slots__ = ("id", "value")
+
+    def __init__(self, id, value):
+        self.id = id
+        self.value = value
+
+
 class TablePropertiesTestCase(unittest.TestCase):
     def test_no_nested_arrays(self):
         self.assertEqual(no_nested_arrays([{}]), True)
@@ -23,6 +54,16 @@ class TablePropertiesTestCase(unittest.TestCase):
         )
         self.assertEqual(no_nested_arrays([{}, {"nested": {"scores": [2, 3]}}]), False)
 
+    def test_predicates_after_mutation(self):
+        rows = [{"a": 1}, {"a": 2}]
+        self.assertEqual(no_nested_arrays(rows), True)
+        self.assertEqual(is_homogeneous(rows), True)
+
+        rows[1]["a"] = [1]
+        rows[1]["b"] = 2
+        self.assertEqual(no_nested_arrays(rows), False)
+        self.assertEqual(is_homogeneous(rows), False)
+
     def test_no_nested_tables(self):
         self.assertEqual(no_nested_tables([{}]), True)
         self.assertEqual(no_nested_tables([{"x": 3}]), True)
@@ -92,3 +133,206 @@ class TablePropertiesTestCase(unittest.TestCase):
 
     def test_always(self):
         self.assertEqual(always([]), True)
+
+    def test_create_no_long_strings(self):
+        no_long_strings_4 = create_no_long_strings(4)
+
+        self.assertEqual(no_long_strings_4([{"comment": "1234"}]), True)
+        self.assertEqual(no_long_strings_4([{"comment": "12345"}]), False)
+        self.assertEqual(no_long_strings_4([{}, {"nested": {"a": "12345"}}]), False)
+        self.assertEqual(create_no_long_strings()([{"comment": "hello world"}]), True)
+
+    def test_all_of(self):
+        predicate = all_of(no_nested_arrays, create_no_long_strings(4))
+
+        self.assertEqual(predicate([{"a": 1}, {"a": "1234"}]), True)
+        self.assertEqual(predicate([{"a": 1}, {"a": [1]}]), False)
+        self.assertEqual(predicate([{"a": 1}, {"a": "12345"}]), False)
+        self.assertEqual(all_of()([{"a": 1}]), True)
+
+        # other functions are called after the built-in predicates
+        calls = []
+        predicate = all_of(no_nested_arrays, lambda data: calls.append(data) or True)
+        self.assertEqual(predicate([{"a": [1]}]), False)
+        self.assertEqual(predicate([{"a": 1}]), True)
+        self.assertEqual(calls, [[{"a": 1}]])
+
+    def test_any_of(self):
+        predicate = any_of(no_nested_tables, is_homogeneous)
+
+        self.assertEqual(predicate([{"a": [{"b": 1}]}, {"a": [{"b": 2}]}]), True)
+        self.assertEqual(predicate([{"a": 1}, {"b": 2}]), True)
+        self.assertEqual(predicate([{"a": [{"b": 1}]}, {"b": 2}]), False)
+        self.assertEqual(any_of(no_nested_tables, always)([{"a": [{"b": 1}]}]), True)
+        self.assertEqual(any_of()([{"a": 1}]), False)
+
+    def test_none_of(self):
+        predicate = none_of(no_nested_arrays, lambda data: len(data) > 2)
+
+        self.assertEqual(predicate([{"a": [1]}, {"a": [2]}]), True)
+        self.assertEqual(predicate([{"a": 1}]), False)
+        self.assertEqual(predicate([{"a": [1]}, {"a": [2]}, {"a": [3]}]), False)
+
+    def test_nested_combinations(self):
+        predicate = all_of(
+            any_of(no_nested_tables, is_homogeneous), create_no_long_strings(4)
+        )
+
+        self.assertEqual(predicate([{"a": [{"b": 1}]}, {"a": [{"b": 2}]}]), True)
+        self.assertEqual(predicate([{"a": [{"b": 1}]}, {"b": 2}]), False)
+        self.assertEqual(predicate([{"a": "12345"}]), False)
+        self.assertEqual(none_of(none_of(is_homogeneous))([{"a": 1}, {"b": 1}]), False)
+
+    def test_combination_stops_at_first_row(self):
+        rows = [{"id": i, "name": "x" * 30 if i == 0 else "x"} for i in range(1000)]
+        predicate = all_of(no_nested_arrays, create_no_long_strings())
+
+        with mock.patch.object(
+            tabular, "_merge_value", wraps=tabular._merge_value
+        ) as merge_value:
+            self.assertEqual(predicate(rows), False)
+
+        # only the values of the first row are profiled
+        self.assertEqual(merge_value.call_count, 2)
+
+    def test_combination_path(self):
+        data = {"a": [{"id": 1}], "b": [{"id": 2}]}
+        predicate = all_of(no_nested_arrays, lambda _data, path: path != ["b"])
+
+        self.assertEqual(uses_path(predicate), True)
+        self.assertEqual(uses_path(all_of(no_nested_arrays, lambda _data: True)), False)
+        self.assertEqual(
+            stringify(data, {"output_as_table": predicate}),
+            '{"a":(\n"id"\n1\n),"b":[{"id":2}]}',
+        )
+
+    def test_sampled(self):
+        rows = [{"id": i, "name": "x"} for i in range(10000)]
+        sample = get_sample(rows, 100, 459, 0)
+        sampled_ids = set(map(lambda row: row["id"], sample))
+
+        self.assertEqual(len(sample), 659)
+        self.assertEqual(sample[:100], rows[:100])
+        self.assertEqual(sample[-100:], rows[-100:])
+        self.assertEqual(get_sample(rows[:659], 100, 459, 0), rows[:659])
+
+        # a row which is not in the sample is not checked
+        index = next(i for i in range(10000) if i not in sampled_ids)
+        rows[index] = {
+            "id": index,
+            "name": "a long name that is more than 24 characters",
+        }
+        self.assertEqual(no_long_strings(rows), False)
+        self.assertEqual(sampled(no_long_strings)(rows), True)
+
+        # the first and last rows are always checked
+        rows[-1] = {"id": 9999, "other": 1}
+        self.assertEqual(sampled(is_homogeneous)(rows), False)
+
+        # a property violated by many rows is found
+        rows = [{"id": i, "tags": [1] if i % 5 == 0 else None} for i in range(10000)]
+        rows[0]["tags"] = None
+        rows[-1]["tags"] = None
+        self.assertEqual(sampled(no_nested_arrays, sample_rows=0)(rows), False)
+
+        # small tables are checked completely
+        self.assertEqual(sampled(is_homogeneous)([{"a": 1}, {"b": 2}]), False)
+
+        self.assertRaises(ValueError, lambda: sampled(is_homogeneous, confidence=1))
+        self.assertRaises(ValueError, lambda: sampled(is_homogeneous, tolerance=0))
+
+    def test_sampled_on_mismatch(self):
+        rows = [{"id": i, "name": "x"} for i in range(10000)]
+        sampled_ids = set(map(lambda row: row["id"], get_sample(rows, 100, 459, 0)))
+        index = next(i for i in range(10000) if i not in sampled_ids)
+        rows[index] = {"id": index}
+
+        mismatches = []
+
+        def on_mismatch(data, outcome):
+            mismatches.append((data, outcome, threading.current_thread()))
+
+        # stringify waits for the verification in the background
+        predicate = sampled(is_homogeneous, on_mismatch=on_mismatch)
+        self.assertEqual(
+            stringify(rows, {"output_as_table": predicate}), stringify(rows)
+        )
+        self.assertEqual(len(mismatches), 1)
+        self.assertIs(mismatches[0][0], rows)
+        self.assertEqual(mismatches[0][1], True)
+        self.assertIsNot(mismatches[0][2], threading.current_thread())
+        self.assertFalse(mismatches[0][2].is_alive())
+
+        # outside stringify, the predicate verifies directly
+        self.assertEqual(predicate(rows), True)
+        self.assertEqual(len(mismatches), 2)
+        self.assertIs(mismatches[1][2], threading.current_thread())
+
+        # an error of the verification is raised by stringify
+        def raise_error(_data, _outcome):
+            raise RuntimeError("mismatch")
+
+        predicate = sampled(is_homogeneous, on_mismatch=raise_error)
+        self.assertRaisesRegex(
+            RuntimeError,
+            "mismatch",
+            lambda: stringify(rows, {"output_as_table": predicate}),
+        )
+
+    def test_sampled_path(self):
+        predicate = sampled(lambda _data, path: path != ["b"])
+
+        self.assertEqual(uses_path(predicate), True)
+        self.assertEqual(uses_path(sampled(is_homogeneous)), False)
+        self.assertEqual(
+            stringify(
+                {"a": [{"id": 1}], "b": [{"id": 2}]}, {"output_as_table": predicate}
+            ),
+            '{"a":(\n"id"\n1\n),"b":[{"id":2}]}',
+        )
+
+    def test_class_objects(self):
+        for cls in (Item, Pair):
+            flat = [cls(1, "a"), cls(2, "b")]
+            arrays = [cls(1, [1]), cls(2, [2])]
+            tables = [cls(1, [{"a": 1}]), cls(2, None)]
+            long_strings = [cls(1, "a"), cls(2, "x" * 50)]
+
+            self.assertEqual(is_homogeneous(flat), True)
+            self.assertEqual(is_homogeneous(arrays), True)
+            self.assertEqual(is_homogeneous([cls(1, "a"), {"id": 2}]), False)
+            self.assertEqual(no_nested_arrays(flat), True)
+            self.assertEqual(no_nested_arrays(arrays), False)
+            self.assertEqual(no_nested_tables(arrays), True)
+            self.assertEqual(no_nested_tables(tables), False)
+            self.assertEqual(no_long_strings(flat), True)
+            self.assertEqual(no_long_strings(long_strings), False)
+
+            self.assertEqual(all_of(is_homogeneous, no_nested_arrays)(flat), True)
+            self.assertEqual(all_of(is_homogeneous, no_nested_arrays)(arrays), False)
+            self.assertEqual(any_of(no_nested_arrays, no_long_strings)(arrays), True)
+            self.assertEqual(none_of(no_long_strings)(long_strings), True)
+            self.assertEqual(none_of(no_long_strings)(flat), False)
+
+            rows = [cls(i, "x") for i in range(10000)]
+            self.assertEqual(sampled(is_homogeneous)(rows), True)
+            rows[-1] = cls(9999, [1])
+            self.assertEqual(sampled(no_nested_arrays)(rows), False)
+
+            self.assertEqual(
+                stringify(arrays, {"output_as_table": is_homogeneous}),
+                '"id","value"\n1,[1]\n2,[2]\n',
+            )
+            self.assertEqual(
+                stringify(arrays, {"output_as_table": no_nested_arrays}),
+                '[{"id":1,"value":[1]},{"id":2,"value":[2]}]',
+            )
+
+        # slotted classes are profiled by their slots only when they are opted in
+        rows = [Slotted(1, "a"), Slotted(2, "x" * 50)]
+        options = {"output_as_table": no_long_strings, "slotted_classes": [Slotted]}
+        self.assertEqual(
+            stringify(rows, options),
+            '[{"id":1,"value":"a"},{"id":2,"value":"' + "x" * 50 + '"}]',
+        )
+        self.assertEqual(no_long_strings(rows), True)
@@ -2,7 +2,14 @@ import json
 import unittest
 from os import path
 
-from tabularjson.tabular import collect_fields, is_tabular
+from tabularjson.tabular import (
+    begin_table_profile,
+    collect_fields,
+    end_table_profile,
+    get_table_profile,
+    is_tabular,
+    profile_table,
+)
 
 
 class TabularTestCase(unittest.TestCase):
@@ -31,7 +38,78 @@ class TabularTestCase(unittest.TestCase):
                                 self.assertEqual(
                                     collect_fields(test["input"]), test["output"]
                                 )
+                                self.assertEqual(
+                                    profile_table(test["input"]).fields,
+                                    test["output"],
+                                )
                             case _:
                                 raise TypeError(
                                     f'Unknown function "{group["function"]}"'
                                 )
+
+    def test_collect_fields_uniform_rows(self):
+        rows = [{"id": i, "address": {"city": "Rotterdam"}} for i in range(100)]
+
+        # the fields can change after many rows without new keys
+        self.assertEqual(
+            collect_fields(rows + [{"id": 100, "address": {"zip": "1234"}}]),
+            [["id"], ["address", "city"], ["address", "zip"]],
+        )
+        self.assertEqual(
+            collect_fields([{"a": None}] * 100 + [{"a": {"b": 1}}]), [["a", "b"]]
+        )
+        self.assertEqual(
+            collect_fields([{"a": {}}] * 100 + [{"a": 1}, {"a": {"b": 1}}]), [["a"]]
+        )
+        self.assertEqual(
+            collect_fields([{"a": 1, "b": 2}] * 100 + [{"b": 3, "c": 4}]),
+            [["a"], ["b"], ["c"]],
+        )
+
+    def test_profile_table(self):
+        profile = profile_table(
+            [
+                {"id": 1, "name": "Joe", "address": {"city": "Rotterdam"}},
+                {"id": 2, "name": "Sarah", "scores": [1, 2]},
+            ]
+        )
+
+        self.assertEqual(
+            profile.fields, [["id"], ["name"], ["address", "city"], ["scores"]]
+        )
+        self.assertEqual(profile.complete, True)
+        self.assertEqual(profile.has_nested_arrays, True)
+        self.assertEqual(profile.has_nested_tables, False)
+        self.assertEqual(profile.max_string_length, 9)
+        self.assertEqual(profile.is_homogeneous, False)
+
+        profile = profile_table(
+            [
+                {"id": 1, "friends": [{"id": 2}], "address": {"city": "A"}},
+                {"friends": [{"id": 3}], "address": {"city": "B"}, "id": 2},
+            ]
+        )
+        self.assertEqual(profile.has_nested_tables, True)
+        self.assertEqual(profile.is_homogeneous, True)
+
+        self.assertEqual(profile_table([{"id": 1}], complete=False).complete, False)
+
+    def test_get_table_profile(self):
+        table = [{"id": 1}, {"id": 2}]
+
+        previous = begin_table_profile()
+        try:
+            profile = get_table_profile(table)
+
+            self.assertIs(get_table_profile(table), profile)
+            self.assertIs(get_table_profile(table, complete=False), profile)
+            self.assertIsNot(get_table_profile([{"id": 1}, {"id": 2}]), profile)
+        finally:
+            end_table_profile(previous)
+
+        # the profile is not shared outside of stringify, since the table can change
+        self.assertIsNot(get_table_profile(table), get_table_profile(table))
+
+
+if __name__ == "__main__":
+    unittest.main()
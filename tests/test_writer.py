@@ -0,0 +1,112 @@
+import io
+import unittest
+
+from tabularjson import TableWriter, parse, stringify
+
+
+class TableWriterTestCase(unittest.TestCase):
+    rows = [
+        {"id": 1, "name": "Joe", "address": {"city": "Rotterdam"}},
+        {"id": 2, "name": "Sarah", "scores": [1, 2, 3]},
+        {"id": 3, "friends": [{"id": 1}, {"id": 2}]},
+    ]
+    fields = ["id", "name", ["address", "city"], "scores", "friends"]
+
+    def test_write_root_table(self):
+        fp = io.StringIO()
+        with TableWriter(fp, self.fields) as writer:
+            writer.write_row(self.rows[0])
+            writer.write_rows(row for row in self.rows[1:])
+
+        self.assertEqual(fp.getvalue(), stringify(self.rows))
+
+    def test_write_root_table_indentation(self):
+        fp = io.StringIO()
+        with TableWriter(fp, ["id", "name"], {"indentation": 2}) as writer:
+            writer.write_rows([{"id": 1, "name": "Joe"}, {"id": 22, "name": "Sarah"}])
+
+        self.assertEqual(
+            fp.getvalue(),
+            '"id", "name"\n1,    "Joe"\n22,   "Sarah"\n',
+        )
+
+        fp = io.StringIO()
+        with TableWriter(
+            fp, ["id", "name"], {"indentation": 2, "widths": [6]}
+        ) as writer:
+            writer.write_row({"id": 123456, "name": "Joe"})
+            writer.write_row({"id": 1234567, "name": "Sarah"})
+
+        self.assertEqual(
+            fp.getvalue(), '"id",   "name"\n123456, "Joe"\n1234567, "Sarah"\n'
+        )
+
+    def test_write_nested_table(self):
+        fp = io.StringIO()
+        fp.write('{"friends":')
+        with TableWriter(fp, self.fields, {"nested": True}) as writer:
+            writer.write_rows(self.rows)
+        fp.write("}")
+
+        self.assertEqual(fp.getvalue(), stringify({"friends": self.rows}))
+
+        fp = io.StringIO()
+        fp.write('{\n  "friends": ')
+        with TableWriter(
+            fp, self.fields, {"nested": True, "indentation": 2, "indent": "  "}
+        ) as writer:
+            writer.write_rows(self.rows)
+        fp.write("\n}")
+
+        self.assertEqual(parse(fp.getvalue()), {"friends": self.rows})
+        self.assertIn('\n    "id", "name"', fp.getvalue())
+        self.assertTrue(fp.getvalue().endswith("\n  )\n}"))
+
+    def test_write_empty_table(self):
+        fp = io.StringIO()
+        TableWriter(fp, ["id"], {"nested": True}).close()
+
+        self.assertEqual(parse(fp.getvalue()), [])
+
+    def test_write_rows_lazily(self):
+        chunks = []
+
+        class Writer:
+            def write(self, chunk):
+                chunks.append(chunk)
+
+        def generate_rows():
+            for i in range(1000):
+                yield {"id": i, "name": f"item {i}"}
+
+                # the output is written while the rows are generated
+                if i == 999:
+                    self.assertGreater(len(chunks), 5)
+
+        with TableWriter(Writer(), ["id", "name"], {"buffer_size": 1024}) as writer:
+            writer.write_rows(generate_rows())
+
+        self.assertEqual(len(parse("".join(chunks))), 1000)
+
+    def test_invalid_rows(self):
+        writer = TableWriter(io.StringIO(), self.fields)
+
+        self.assertRaisesRegex(
+            ValueError,
+            'Field "age" does not exist in the table header',
+            lambda: writer.write_row({"id": 1, "age": 42}),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            'Field "address"."zip" does not exist in the table header',
+            lambda: writer.write_row({"address": {"zip": "1234"}}),
+        )
+        self.assertRaises(TypeError, lambda: writer.write_row([1, 2]))
+        self.assertRaises(ValueError, lambda: TableWriter(io.StringIO(), []))
+
+        writer.close()
+        self.assertRaises(ValueError, lambda: writer.write_row({"id": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()